@@ -15,7 +15,7 @@ import random
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
-from PySide6.QtCore import QObject, Signal, QTimer, Qt
+from PySide6.QtCore import QObject, Signal, QTimer, Qt, QFileSystemWatcher
 from PySide6.QtWidgets import QApplication, QMessageBox
 from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
 from resona_desktop_pet.config import ConfigManager
@@ -32,6 +32,7 @@ from resona_desktop_pet.web_server import WebServerThread, session_manager, Clie
 from memory.memory_manager import MemoryManager
 from memory.startup_processor import StartupProcessor
 from resona_desktop_pet.utils.logger import setup_logging
+from resona_desktop_pet.utils.timer_store import TimerStore
 
 def exception_hook(exctype, value, tb):
     traceback.print_exception(exctype, value, tb)
@@ -73,6 +74,13 @@ class AudioPlayer(QObject):
             logger.warning(f"[AudioPlayer] Failed to refresh audio device: {e}")
             return False
 
+PRESYNTH_INITIAL_ESTIMATE = 5.0
+PRESYNTH_ESTIMATE_ALPHA = 0.3
+PRESYNTH_ESTIMATE_MARGIN = 1.5
+PRESYNTH_RETRY_BASE_SEC = 2.0
+TIMER_BROADCAST_LEAD_SEC = 10.0
+
+
 class TimerScheduler(QObject):
     def __init__(self, controller):
         super().__init__(controller)
@@ -81,20 +89,27 @@ class TimerScheduler(QObject):
         self.project_root = controller.project_root
         self.enabled = self.config.timer_enabled
         self.poll_interval = max(0.1, float(self.config.timer_poll_interval))
-        self.inbox_path = self._resolve_path(self.config.timer_inbox_file)
-        self.tasks_path = self._resolve_path(self.config.timer_tasks_file)
         self.pre_synthesize = self.config.timer_pre_synthesize
         self.tts_idle_sec = max(0.0, float(self.config.timer_tts_idle_sec))
         self.trigger_delay = max(0.0, float(self.config.timer_trigger_delay))
-        self._synth_inflight_id = None
-        self._synth_inflight_started_at = None
-        self._synth_inflight_last_log_at = None
+        self.presynth_concurrency = max(1, int(self.config.timer_presynth_concurrency))
+        self.presynth_lead_sec = max(0.0, float(self.config.timer_presynth_lead_sec))
+        self.presynth_max_retries = max(0, int(self.config.timer_presynth_max_retries))
+        self._synth_inflight = {}
+        self._synth_last_log_at = {}
+        self._synth_avg_sec = PRESYNTH_INITIAL_ESTIMATE
         self._last_busy = False
         self._busy_released_at = None
+        self.store = None
+        self._store_version = None
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_store_changed)
         self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
         self._timer.timeout.connect(self._tick)
+        self._open_store(self._resolve_path(self.config.timer_store_file))
         if self.enabled:
-            self._timer.start(int(self.poll_interval * 1000))
+            self._wake()
 
     def refresh_config(self):
         self.enabled = self.config.timer_enabled
@@ -102,22 +117,25 @@ class TimerScheduler(QObject):
         self.pre_synthesize = self.config.timer_pre_synthesize
         self.tts_idle_sec = max(0.0, float(self.config.timer_tts_idle_sec))
         self.trigger_delay = max(0.0, float(self.config.timer_trigger_delay))
-        self.inbox_path = self._resolve_path(self.config.timer_inbox_file)
-        self.tasks_path = self._resolve_path(self.config.timer_tasks_file)
+        self.presynth_concurrency = max(1, int(self.config.timer_presynth_concurrency))
+        self.presynth_lead_sec = max(0.0, float(self.config.timer_presynth_lead_sec))
+        self.presynth_max_retries = max(0, int(self.config.timer_presynth_max_retries))
+        store_path = self._resolve_path(self.config.timer_store_file)
+        if self.store is None or store_path != self.store.path:
+            self._open_store(store_path)
         if self.enabled:
-            if not self._timer.isActive():
-                self._timer.start(int(self.poll_interval * 1000))
+            self._wake()
         else:
             self._timer.stop()
 
     def reset(self):
-        self._synth_inflight_id = None
-        self._synth_inflight_started_at = None
-        self._synth_inflight_last_log_at = None
+        self._synth_inflight.clear()
+        self._synth_last_log_at.clear()
         self._last_busy = False
         self._busy_released_at = None
-        self._write_json(self.inbox_path, [])
-        self._write_json(self.tasks_path, [])
+        if self.store:
+            self.store.clear()
+        self._timer.stop()
 
     def _resolve_path(self, value: str) -> Path:
         path = Path(value)
@@ -125,26 +143,49 @@ class TimerScheduler(QObject):
             path = self.project_root / path
         return path
 
-    def _load_json(self, path: Path) -> list:
-        if not path.exists():
-            return []
+    def _open_store(self, path: Path):
+        if self._watcher.files():
+            self._watcher.removePaths(self._watcher.files())
+        if self.store:
+            self.store.close()
+            self.store = None
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            if isinstance(data, list):
-                return data
+            self.store = TimerStore(path)
+            self._import_legacy_tasks()
+            self._store_version = self.store.data_version()
+            self._watcher.addPath(str(path))
+            logger.info(f"[Timer] Task store opened. path={path}")
         except Exception as e:
-            logger.warning(f"[Timer] Failed to read {path}: {e}")
-        return []
+            logger.error(f"[Timer] Failed to open task store {path}: {e}")
 
-    def _write_json(self, path: Path, data: list):
-        try:
-            if path.parent and not path.parent.exists():
-                path.parent.mkdir(parents=True, exist_ok=True)
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.warning(f"[Timer] Failed to write {path}: {e}")
+    def _import_legacy_tasks(self):
+        # Scheduled tasks and unread MCP entries from the JSON files used before the SQLite store
+        now = time.time()
+        for key, default in (("tasks_file", "TEMP/timer_tasks.json"), ("inbox_file", "TEMP/timer_inbox.json")):
+            legacy_path = self._resolve_path(self.config.get("Timer", key, default))
+            count = self.store.import_json(legacy_path, lambda entry: self._normalize_task(entry, now))
+            if count:
+                logger.info(f"[Timer] Imported {count} task(s) from {legacy_path}")
+
+    def _on_store_changed(self, path: str):
+        # Some platforms drop the watch when the file is replaced
+        if path not in self._watcher.files() and Path(path).exists():
+            self._watcher.addPath(path)
+        if not self.enabled or self.store is None:
+            return
+        version = self.store.data_version()
+        if version == self._store_version:
+            return
+        self._store_version = version
+        self._wake()
+
+    def _wake(self, delay_sec: float = 0.0):
+        if not self.enabled:
+            return
+        delay_ms = max(0, int(delay_sec * 1000))
+        if self._timer.isActive() and self._timer.remainingTime() <= delay_ms:
+            return
+        self._timer.start(delay_ms)
 
     def _normalize_task(self, entry: dict, now: float) -> dict:
         task_id = entry.get("id") or f"timer_{int(now * 1000)}_{random.randint(1000, 9999)}"
@@ -161,7 +202,8 @@ class TimerScheduler(QObject):
         except (TypeError, ValueError):
             due_at = now
         active_pack_id = getattr(self.config.pack_manager, "active_pack_id", "") or "default"
-        return {
+        normalized = dict(entry)
+        normalized.update({
             "id": task_id,
             "created_at": float(entry.get("created_at", now)),
             "due_at": due_at,
@@ -171,18 +213,86 @@ class TimerScheduler(QObject):
             "audio_path": entry.get("audio_path", ""),
             "status": entry.get("status", "pending"),
             "pack_id": entry.get("pack_id") or active_pack_id
-        }
+        })
+        return normalized
 
     def _tts_idle(self, now: float) -> bool:
         return (now - self.controller._tts_activity_at) >= self.tts_idle_sec
 
+    def _task_pack_id(self, task: dict) -> str:
+        return task.get("pack_id") or getattr(self.config.pack_manager, "active_pack_id", "") or "default"
+
+    def _synth_eligible(self, task: dict) -> bool:
+        if task.get("status") not in ["pending", "ready"] or task.get("audio_path") or task.get("synth_failed"):
+            return False
+        if task.get("id") in self._synth_inflight:
+            return False
+        return self._task_pack_id(task) == getattr(self.config.pack_manager, "active_pack_id", "")
+
+    def _needs_synth(self, task: dict, now: float) -> bool:
+        return self._synth_eligible(task) and float(task.get("retry_at", 0.0)) <= now
+
+    def _synth_deadline(self, task: dict, now: float) -> float:
+        try:
+            due_at = float(task.get("due_at", now))
+        except (TypeError, ValueError):
+            due_at = now
+        return due_at - self.presynth_lead_sec - self._synth_avg_sec * PRESYNTH_ESTIMATE_MARGIN
+
+    def _plan_presynth(self, tasks: list, now: float, busy: bool):
+        slots = self.presynth_concurrency - len(self._synth_inflight)
+        if slots <= 0:
+            return
+        idle = not busy and self._tts_idle(now)
+        candidates = sorted(
+            (t for t in tasks if self._needs_synth(t, now)),
+            key=lambda t: self._synth_deadline(t, now)
+        )
+        for task in candidates:
+            if slots <= 0:
+                break
+            # Opportunistic work waits for an idle TTS; tasks at their deadline start regardless
+            if not idle and self._synth_deadline(task, now) > now:
+                break
+            logger.info(f"[Timer] Pre-synthesize queued. id={task.get('id')} due_at={task.get('due_at')} "
+                        f"inflight={len(self._synth_inflight)}")
+            self._start_synthesize(task)
+            slots -= 1
+
+    def _next_wake(self, tasks: list, now: float, busy: bool) -> Optional[float]:
+        wake_at = []
+        for task in tasks:
+            due_at = float(task.get("due_at", now))
+            if due_at <= now:
+                # Due but held back by busy state, cooldown or a pending synth
+                wake_at.append(now + self.poll_interval)
+                continue
+            wake_at.append(due_at)
+            if not task.get("broadcasted"):
+                wake_at.append(due_at - TIMER_BROADCAST_LEAD_SEC)
+            if not self.pre_synthesize or not self._synth_eligible(task):
+                continue
+            if float(task.get("retry_at", 0.0)) > now:
+                wake_at.append(float(task["retry_at"]))
+                continue
+            # A passed deadline with every slot taken is retried on the poll interval, not immediately
+            wake_at.append(max(self._synth_deadline(task, now), now + self.poll_interval))
+            if len(self._synth_inflight) < self.presynth_concurrency:
+                if busy:
+                    wake_at.append(now + self.poll_interval)
+                else:
+                    # An idle time already in the past must not turn into a 0 ms wake loop
+                    wake_at.append(max(self.controller._tts_activity_at + self.tts_idle_sec,
+                                       now + self.poll_interval))
+        return min(wake_at) if wake_at else None
+
     def _ready_to_trigger(self, now: float) -> bool:
         if self._busy_released_at is None:
             return True
         return now >= self._busy_released_at + self.trigger_delay
 
     def _tick(self):
-        if not self.enabled:
+        if not self.enabled or self.store is None:
             return
         now = time.time()
         busy = self.controller.main_window.is_busy
@@ -190,38 +300,30 @@ class TimerScheduler(QObject):
             self._busy_released_at = now
         self._last_busy = busy
 
-        tasks = self._load_json(self.tasks_path)
-        inbox = self._load_json(self.inbox_path)
-        if inbox:
-            for entry in inbox:
-                if isinstance(entry, dict):
-                    tasks.append(self._normalize_task(entry, now))
-            self._write_json(self.inbox_path, [])
-
-        if self.pre_synthesize and not busy and self._tts_idle(now) and self._synth_inflight_id is None:
-            for task in tasks:
-                if task.get("status") in ["pending", "ready"] and not task.get("audio_path"):
-                    task_pack_id = task.get("pack_id") or getattr(self.config.pack_manager, "active_pack_id", "") or "default"
-                    if task_pack_id != getattr(self.config.pack_manager, "active_pack_id", ""):
-                        continue
-                    logger.info(f"[Timer] Pre-synthesize queued. id={task.get('id')} due_at={task.get('due_at')}")
-                    self._start_synthesize(task)
-                    break
+        # Taken before reading so a commit landing mid-tick still wakes us through the watcher
+        self._store_version = self.store.data_version()
+        self.store.purge_inactive()
+        tasks = []
+        for task in self.store.active():
+            if not task.get("pack_id"):
+                # Fresh entry from the MCP tool; bind it to the pack that is active when it arrives
+                task = self._normalize_task(task, now)
+                self.store.upsert(task)
+            tasks.append(task)
+
+        if self.pre_synthesize:
+            self._plan_presynth(tasks, now, busy)
 
-        updated = False
         kept = []
         for task in tasks:
             status = task.get("status", "pending")
-            if status in ["done", "failed"]:
-                updated = True
-                continue
             due_at = task.get("due_at", now)
             try:
                 due_at = float(due_at)
             except (TypeError, ValueError):
                 due_at = now
 
-            if not task.get("broadcasted") and due_at - now <= 10.0:
+            if not task.get("broadcasted") and due_at - now <= TIMER_BROADCAST_LEAD_SEC:
                 task_copy = task.copy()
                 task_pack_id = task_copy.get("pack_id") or getattr(self.config.pack_manager, "active_pack_id", "") or "default"
                 if task_copy.get("audio_path"):
@@ -253,29 +355,33 @@ class TimerScheduler(QObject):
                     self.controller._loop
                 )
                 task["broadcasted"] = True
-                updated = True
+                self.store.upsert(task)
 
             if now >= due_at:
-                logger.info(f"[Timer] Task due. id={task.get('id')} status={status} audio={bool(task.get('audio_path'))} busy={busy}")
+                if status != "ready":
+                    logger.info(f"[Timer] Task due. id={task.get('id')} status={status} audio={bool(task.get('audio_path'))} busy={busy}")
                 if busy or not self._ready_to_trigger(now):
-                    logger.info(f"[Timer] Task delayed (busy or cooldown). id={task.get('id')}")
-                    task["status"] = "ready"
-                    task.setdefault("ready_since", now)
+                    if status != "ready":
+                        logger.info(f"[Timer] Task delayed (busy or cooldown). id={task.get('id')}")
+                        task["status"] = "ready"
+                        task.setdefault("ready_since", now)
+                        self.store.upsert(task)
                     kept.append(task)
-                    updated = True
                     continue
                 if self._trigger_task(task):
                     logger.info(f"[Timer] Task triggered and removed. id={task.get('id')}")
-                    updated = True
+                    self.store.remove(task.get("id"))
                     continue
-                task["status"] = "ready"
+                if status != "ready":
+                    task["status"] = "ready"
+                    self.store.upsert(task)
                 kept.append(task)
-                updated = True
                 continue
             kept.append(task)
 
-        if inbox or updated:
-            self._write_json(self.tasks_path, kept)
+        wake_at = self._next_wake(kept, time.time(), busy)
+        if wake_at is not None:
+            self._wake(max(0.0, wake_at - time.time()))
 
     def _trigger_task(self, task: dict) -> bool:
         task_pack_id = task.get("pack_id") or getattr(self.config.pack_manager, "active_pack_id", "") or "default"
@@ -294,33 +400,27 @@ class TimerScheduler(QObject):
                 self.controller._trigger_voice_response(text, emotion, voice_file=str(path), is_behavior=False)
                 return True
             logger.info(f"[Timer] Audio path missing. id={task_id} path={path}")
-        timed_out = False
-        if self.pre_synthesize:
-            if self._synth_inflight_id is not None:
-                if task_id and self._synth_inflight_id == task_id:
-                    now = time.time()
-                    started_at = self._synth_inflight_started_at or now
-                    timeout_sec = max(5.0, float(self.config.sovits_timeout) + 5.0)
-                    elapsed = now - started_at
-                    if elapsed >= timeout_sec:
-                        logger.info(f"[Timer] Synth timeout, falling back to text. id={task_id} waited={elapsed:.1f}s")
-                        self._synth_inflight_id = None
-                        self._synth_inflight_started_at = None
-                        self._synth_inflight_last_log_at = None
-                        timed_out = True
-                    else:
-                        last_log_at = self._synth_inflight_last_log_at or 0.0
-                        if now - last_log_at >= 5.0:
-                            logger.info(f"[Timer] Awaiting synth result. id={task_id} waited={elapsed:.1f}s")
-                            self._synth_inflight_last_log_at = now
-                        return False
-                if self._synth_inflight_id is not None:
-                    logger.info(f"[Timer] Synth busy with another task. id={task_id} inflight={self._synth_inflight_id}")
+        if self.pre_synthesize and not task.get("synth_failed"):
+            started_at = self._synth_inflight.get(task_id)
+            if started_at is not None:
+                now = time.time()
+                timeout_sec = max(5.0, float(self.config.sovits_timeout) + 5.0)
+                elapsed = now - started_at
+                if elapsed < timeout_sec:
+                    if now - self._synth_last_log_at.get(task_id, 0.0) >= 5.0:
+                        logger.info(f"[Timer] Awaiting synth result. id={task_id} waited={elapsed:.1f}s")
+                        self._synth_last_log_at[task_id] = now
                     return False
-            if not timed_out and self._tts_idle(time.time()) and not self.controller.main_window.is_busy:
+                logger.info(f"[Timer] Synth timeout, falling back to text. id={task_id} waited={elapsed:.1f}s")
+                self._synth_inflight.pop(task_id, None)
+                self._synth_last_log_at.pop(task_id, None)
+            elif len(self._synth_inflight) < self.presynth_concurrency and float(task.get("retry_at", 0.0)) <= time.time():
                 logger.info(f"[Timer] Trigger requests synth. id={task_id}")
                 self._start_synthesize(task)
                 return False
+            else:
+                logger.info(f"[Timer] Synth slots busy or retry pending. id={task_id} inflight={len(self._synth_inflight)}")
+                return False
         self.controller.main_window.show_behavior_response_with_timeout(text, emotion)
         logger.info(f"[Timer] Trigger fell back to text. id={task_id}")
         return True
@@ -330,16 +430,16 @@ class TimerScheduler(QObject):
         text = task.get("text_tts") or task.get("text_display") or ""
         emotion = task.get("emotion", "<E:smile>")
         pack_id = task.get("pack_id") or getattr(self.config.pack_manager, "active_pack_id", "") or "default"
-        result = await self.controller.tts_backend.synthesize(text, emotion, pack_id=pack_id)
+        result = await self.controller.tts_backend.synthesize(text, emotion, pack_id=pack_id, priority="presynth")
         return result
 
     def _start_synthesize(self, task: dict):
         task_id = task.get("id")
         if not task_id:
             return
-        self._synth_inflight_id = task_id
-        self._synth_inflight_started_at = time.time()
-        self._synth_inflight_last_log_at = self._synth_inflight_started_at
+        started_at = time.time()
+        self._synth_inflight[task_id] = started_at
+        self._synth_last_log_at[task_id] = started_at
         logger.info(f"[Timer] Synth start. id={task_id} text_tts_len={len(task.get('text_tts') or '')}")
         self.controller._mark_tts_activity()
         future = asyncio.run_coroutine_threadsafe(self._synthesize_task(task), self.controller._loop)
@@ -348,39 +448,47 @@ class TimerScheduler(QObject):
         future.add_done_callback(_done)
 
     def _on_synthesize_done(self, task_id: str, future):
-        self._synth_inflight_id = None
-        self._synth_inflight_started_at = None
-        self._synth_inflight_last_log_at = None
+        started_at = self._synth_inflight.pop(task_id, None)
+        self._synth_last_log_at.pop(task_id, None)
         error = None
         result = None
         try:
             result = future.result()
         except Exception as e:
             error = str(e)
-        tasks = self._load_json(self.tasks_path)
-        updated = False
-        for task in tasks:
-            if task.get("id") != task_id:
-                continue
+        task = self.store.get(task_id) if self.store else None
+        if task is not None:
             if result and getattr(result, "audio_path", None):
                 task["audio_path"] = result.audio_path
                 if getattr(result, "duration", None):
                     task["audio_duration"] = float(result.duration)
                     task["duration"] = float(result.duration)
                 task["status"] = task.get("status", "pending")
+                task.pop("retry_at", None)
+                if started_at is not None:
+                    elapsed = time.time() - started_at
+                    self._synth_avg_sec += (elapsed - self._synth_avg_sec) * PRESYNTH_ESTIMATE_ALPHA
                 logger.info(f"[Timer] Synth done. id={task_id} path={result.audio_path}")
             else:
-                task["status"] = "failed"
+                attempts = int(task.get("synth_attempts", 0)) + 1
+                task["synth_attempts"] = attempts
                 task["error"] = error or getattr(result, "error", "unknown_error")
-                logger.error(f"[Timer] Synth failed. id={task_id} error={task.get('error')}")
-            updated = True
-            break
-        if updated:
-            self._write_json(self.tasks_path, tasks)
+                if attempts > self.presynth_max_retries:
+                    task["synth_failed"] = True
+                    logger.error(f"[Timer] Synth failed, will fall back to text. id={task_id} attempts={attempts} error={task.get('error')}")
+                else:
+                    backoff = PRESYNTH_RETRY_BASE_SEC * (2 ** (attempts - 1))
+                    task["retry_at"] = time.time() + backoff
+                    logger.warning(f"[Timer] Synth failed, retrying in {backoff:.0f}s. id={task_id} attempts={attempts} error={task.get('error')}")
+            self.store.upsert(task)
+        # A finished job frees a slot and may have made a due task playable
+        self._wake()
+
 class ApplicationController(QObject):
     llm_response_ready = Signal(object)
     tts_ready = Signal(object)
     stt_result_ready = Signal(object)
+    stt_partial_ready = Signal(str)
     request_stt_start = Signal()
     request_global_show = Signal()
     pack_switch_ready = Signal()
@@ -555,6 +663,10 @@ class ApplicationController(QObject):
                 from resona_desktop_pet.ui.debug_panel import DebugPanel
                 self.debug_panel = DebugPanel(self.config.pack_manager, self.config)
                 self.debug_panel.request_manual_response.connect(self.handle_manual_debug_response)
+                self.debug_panel.add_metrics_source(
+                    "Physics",
+                    lambda: self.main_window.physics_bridge.frame_stats() if self.main_window.physics_bridge else {}
+                )
                 QTimer.singleShot(1000, lambda: self._add_debug_to_tray())
             except Exception as e:
                 logger.warning(f"[Main] Failed to initialize DebugPanel: {e}")
@@ -568,7 +680,11 @@ class ApplicationController(QObject):
             self.behavior_monitor.fullscreen_status_changed.connect(self._handle_fullscreen_status)
             self.behavior_monitor.trigger_matched.connect(self._handle_behavior_trigger)
             self.main_window.file_dropped.connect(self.behavior_monitor.on_file_dropped)
+            self.main_window.visibility_changed.connect(self.behavior_monitor.on_window_visibility)
+            self.behavior_monitor.on_window_visibility(self.main_window.isVisible())
             self.behavior_monitor.start()
+            if self.debug_panel:
+                self.debug_panel.add_metrics_source("Plugins", self.behavior_monitor.plugin_metrics)
         else:
             self.behavior_monitor = None
             logger.info("[Main] BehaviorMonitor disabled on non-Windows platform")
@@ -590,6 +706,7 @@ class ApplicationController(QObject):
         self.llm_response_ready.connect(self._handle_llm_response)
         self.tts_ready.connect(self._handle_tts_ready)
         self.stt_result_ready.connect(self._handle_stt_result)
+        self.stt_partial_ready.connect(self._handle_stt_partial)
         self.request_stt_start.connect(self._handle_stt_request)
         self.request_global_show.connect(self.main_window.manual_show)
         self._trigger_check_timer = QTimer()
@@ -999,9 +1116,9 @@ class ApplicationController(QObject):
         else:
             self.main_window.set_listening(True)
 
-    async def handle_web_audio(self, file_path: str, session: ClientSession):
+    async def handle_web_audio(self, samples, session: ClientSession):
         session.touch()
-        logger.info(f"[Web] handle_web_audio start path={file_path}")
+        logger.info(f"[Web] handle_web_audio start duration={len(samples) / 16000:.2f}s")
         
         if threading.current_thread() != threading.main_thread():
             QTimer.singleShot(0, lambda: self.main_window.set_listening(False))
@@ -1018,7 +1135,7 @@ class ApplicationController(QObject):
         try:
             if self.stt_backend:
                 res = await asyncio.wait_for(
-                    asyncio.to_thread(self.stt_backend.recognize_file, file_path),
+                    self.stt_backend.recognize(samples),
                     timeout=timeout_sec
                 )
             else:
@@ -1029,10 +1146,6 @@ class ApplicationController(QObject):
             logger.info(f"[Web] handle_web_audio stt timeout after {timeout_sec}s")
         if res:
             logger.debug(f"[Web] handle_web_audio stt done error={res.error} text_len={len(res.text) if res and res.text else 0}")
-        
-        try:
-            os.remove(file_path)
-        except: pass
 
         if not res:
              await session.websocket.send_json({"type": "error", "message": "STT timeout"})
@@ -1445,6 +1558,7 @@ class ApplicationController(QObject):
                 engine.accel_x += dx * magnitude
                 engine.accel_y += dy * magnitude
                 engine.accel_enabled = True
+                mw.physics_bridge.wake()
         elif atype == "physics_disable_temporarily":
             if mw.physics_bridge:
                 try:
@@ -1472,11 +1586,13 @@ class ApplicationController(QObject):
                 engine.gravity *= multiplier
                 engine.accel_x *= multiplier
                 engine.accel_y *= multiplier
+                mw.physics_bridge.wake()
                 def restore():
                     if getattr(mw, "_physics_force_token", 0) == token and mw.physics_bridge:
                         restore_vals = getattr(mw, "_physics_force_restore", None)
                         if restore_vals:
                             engine.gravity, engine.accel_x, engine.accel_y = restore_vals
+                            mw.physics_bridge.wake()
                 QTimer.singleShot(int(sec * 1000), restore)
         elif atype == "exit_app":
             logger.info("[Main] Exit action triggered.")
@@ -1649,7 +1765,15 @@ class ApplicationController(QObject):
         logger.info("[STT] Recording started...")
         self.main_window.set_input_locked(True)
         self.main_window.set_listening(True, username=self.config.username)
-        asyncio.run_coroutine_threadsafe(self.stt_backend.start_recording(on_complete=lambda r: self.stt_result_ready.emit(r)), self._loop)
+        asyncio.run_coroutine_threadsafe(self.stt_backend.start_recording(
+            on_complete=lambda r: self.stt_result_ready.emit(r),
+            on_partial=lambda text: self.stt_partial_ready.emit(text)
+        ), self._loop)
+    def _handle_stt_partial(self, text):
+        if not self.stt_backend or not self.stt_backend.is_recording():
+            return
+        logger.info(f"[STT] Partial: '{text}'")
+        self.main_window.io.show_status(text)
     def _handle_stt_result(self, result):
         if result.error:
             logger.error(f"[STT] Error: {result.error}")
@@ -1,4 +1,3 @@
-import json
 import random
 import sys
 import time as time_module
@@ -9,51 +8,34 @@ root_dir = Path(__file__).resolve().parents[1]
 if str(root_dir) not in sys.path:
     sys.path.insert(0, str(root_dir))
 
-from resona_desktop_pet.config.config_manager import ConfigManager
+from resona_desktop_pet.config.config_snapshot import get_config_snapshot
+from resona_desktop_pet.utils.timer_store import TimerStore
 
 mcp = FastMCP("TimerInbox")
 
-def _resolve_inbox_path() -> Path:
-    root = root_dir
-    config_path = root / "config.cfg"
-    inbox_path = root / "TEMP" / "timer_inbox.json"
-    try:
-        cfg = ConfigManager(str(config_path))
-        cfg_path = Path(cfg.timer_inbox_file)
-        if not cfg_path.is_absolute():
-            cfg_path = root / cfg_path
-        inbox_path = cfg_path
-    except Exception:
-        pass
-    return inbox_path
+_store = None
 
-def _load_items(path: Path) -> list:
-    if not path.exists():
-        return []
+def _resolve_store_path() -> Path:
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if isinstance(data, list):
-            return data
+        cfg = get_config_snapshot(str(root_dir / "config.cfg"))
+        return cfg.resolve_path(cfg.timer_store_file)
     except Exception:
-        return []
-    return []
+        return root_dir / "TEMP" / "timer_tasks.db"
 
-def _write_items(path: Path, items: list) -> bool:
-    try:
-        if path.parent and not path.parent.exists():
-            path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(items, f, ensure_ascii=False, indent=2)
-        return True
-    except Exception:
-        return False
+def _get_store() -> TimerStore:
+    global _store
+    path = _resolve_store_path()
+    if _store is None or _store.path != path:
+        if _store is not None:
+            _store.close()
+        _store = TimerStore(path)
+    return _store
 
 @mcp.tool()
 def schedule_timer_event(emotion: str = "<E:smile>", text_display: str = "", text_tts: str = "", time: float = 0.0) -> dict:
     """LLM Instruction: Use this tool ONLY when you need to schedule a future event or reminder.
     
-    This tool writes a task to the inbox, which the main program polls and triggers after the specified delay.
+    This tool stores a task that the main program triggers after the specified delay.
     
     Args:
         emotion: The emotion tag. MUST be chosen from the allowed list in your system prompt (e.g., <E:smile>, <E:serious>, etc.).
@@ -72,19 +54,23 @@ def schedule_timer_event(emotion: str = "<E:smile>", text_display: str = "", tex
         "created_at": now,
         "time": delay,
         "due_at": now + delay,
+        "status": "pending",
         "emotion": emotion,
         "text_display": text_display,
         "text_tts": text_tts
     }
-    path = _resolve_inbox_path()
-    items = _load_items(path)
-    items.append(entry)
-    ok = _write_items(path, items)
+    try:
+        store = _get_store()
+        ok = store.upsert(entry)
+        path = store.path
+    except Exception:
+        ok = False
+        path = _resolve_store_path()
     return {
         "ok": ok,
         "task_id": entry["id"],
         "due_at": entry["due_at"],
-        "inbox_path": str(path)
+        "store_path": str(path)
     }
 
 if __name__ == "__main__":
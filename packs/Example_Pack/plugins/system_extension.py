@@ -10,6 +10,8 @@ logger = logging.getLogger("Plugin")
 INFO = {
     "id": "sys_ext_v1",
     "name": "系统扩展插件",
+    # 可选：check_status 单次调用的超时秒数，超时后沿用上一次结果
+    "poll_timeout": 2.0,
     "triggers": [
         {
             "type": "plugin_status", 
@@ -28,7 +30,8 @@ INFO = {
 
 def check_status():
     """
-    由主控 BehaviorMonitor 每轮自动调用。
+    由主控 BehaviorMonitor 定期在后台线程池中调用，不会阻塞触发器判断；
+    若耗时超过 poll_timeout，主控会继续使用上一次的返回值。
     返回值必须是: (bool, str, float/int)
     """
     try:
@@ -0,0 +1,94 @@
+import struct
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+AUDIO_TRANSPORT_BINARY = "binary"
+AUDIO_TRANSPORT_BASE64 = "base64"
+SUPPORTED_AUDIO_TRANSPORTS = [AUDIO_TRANSPORT_BINARY, AUDIO_TRANSPORT_BASE64]
+DEFAULT_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 512 * 1024
+
+# Binary frame layout: !H request_id length, request_id (utf-8), !I sequence number, payload
+_ID_LEN = struct.Struct("!H")
+_SEQ = struct.Struct("!I")
+
+
+def negotiate_transport(offered) -> str:
+    if not isinstance(offered, list):
+        return AUDIO_TRANSPORT_BASE64
+    for transport in offered:
+        if transport in SUPPORTED_AUDIO_TRANSPORTS:
+            return transport
+    return AUDIO_TRANSPORT_BASE64
+
+
+def clamp_chunk_size(value) -> int:
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_CHUNK_SIZE
+    if size <= 0:
+        return DEFAULT_CHUNK_SIZE
+    return min(size, MAX_CHUNK_SIZE)
+
+
+def pack_audio_frame(request_id: str, seq: int, payload: bytes) -> bytes:
+    rid = request_id.encode("utf-8")
+    return _ID_LEN.pack(len(rid)) + rid + _SEQ.pack(seq) + payload
+
+
+def unpack_audio_frame(frame: bytes) -> Tuple[str, int, bytes]:
+    if len(frame) < _ID_LEN.size:
+        raise ValueError("Audio frame too short")
+    (rid_len,) = _ID_LEN.unpack_from(frame, 0)
+    offset = _ID_LEN.size + rid_len
+    if len(frame) < offset + _SEQ.size:
+        raise ValueError("Audio frame truncated")
+    request_id = frame[_ID_LEN.size:offset].decode("utf-8")
+    (seq,) = _SEQ.unpack_from(frame, offset)
+    return request_id, seq, frame[offset + _SEQ.size:]
+
+
+def iter_chunks(data: bytes, chunk_size: int) -> Iterator[bytes]:
+    view = memoryview(data)
+    for start in range(0, len(view), chunk_size):
+        yield bytes(view[start:start + chunk_size])
+
+
+def audio_start_message(request_id: str, fmt: str = "wav", total_bytes: Optional[int] = None, streaming: bool = False) -> dict:
+    return {
+        "type": "audio_start",
+        "request_id": request_id,
+        "format": fmt,
+        "total_bytes": total_bytes,
+        "streaming": streaming,
+    }
+
+
+# Streamed WAVs are sent with placeholder sizes; patch RIFF/data lengths once the file is complete.
+def fix_wav_header(path: Path) -> bool:
+    try:
+        with open(path, "r+b") as f:
+            header = f.read(12)
+            if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+                return False
+            f.seek(0, 2)
+            file_size = f.tell()
+            pos = 12
+            while pos + 8 <= file_size:
+                f.seek(pos)
+                chunk_id = f.read(4)
+                (chunk_size,) = struct.unpack("<I", f.read(4))
+                if chunk_id == b"data":
+                    data_size = file_size - pos - 8
+                    if data_size == chunk_size:
+                        return True
+                    f.seek(pos + 4)
+                    f.write(struct.pack("<I", data_size))
+                    f.seek(4)
+                    f.write(struct.pack("<I", file_size - 8))
+                    return True
+                pos += 8 + chunk_size + (chunk_size & 1)
+    except Exception:
+        return False
+    return False
@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Set
+
+from .sovits_manager import SoVITSManager
+from .sovits_supervisor import SoVITSSupervisor
+
+logger = logging.getLogger("SoVITS-Server")
+
+# Rough per-process cost of the runtime plus BERT/HuBERT, on top of the pack's own weights
+DEFAULT_WORKER_OVERHEAD_MB = 2048.0
+
+
+@dataclass
+class ResidentWorker:
+    port: int
+    manager: SoVITSManager
+    supervisor: SoVITSSupervisor
+    pack_id: Optional[str] = None
+    busy: int = 0
+    last_used: float = 0.0
+
+    @property
+    def api_url(self) -> str:
+        return self.manager.api_url
+
+
+# Budget 0 keeps a single worker that switches weights per request. A positive budget lets
+# extra workers on consecutive API ports keep other packs hot; when it is exhausted the least
+# recently used idle worker is repurposed for the new pack.
+class ModelResidency:
+    def __init__(self, project_root: Path, base_port: int, device: str, packs_index: dict,
+                 memory_budget_mb: float = 0.0, worker_overhead_mb: float = DEFAULT_WORKER_OVERHEAD_MB,
+                 startup_timeout: float = 120.0):
+        self.project_root = project_root
+        self.base_port = base_port
+        self.device = device
+        self.packs_index = packs_index
+        self.memory_budget_mb = max(0.0, float(memory_budget_mb))
+        self.worker_overhead_mb = max(0.0, float(worker_overhead_mb))
+        self.startup_timeout = startup_timeout
+        self.workers: List[ResidentWorker] = []
+        self._cond = asyncio.Condition()
+        self._preloading: Set[str] = set()
+        self._tasks = set()
+        self._swaps = 0
+
+    def _pack_mb(self, pack_id: Optional[str]) -> float:
+        weights = self.packs_index.get(pack_id) if pack_id else None
+        return self.worker_overhead_mb + (getattr(weights, "size_mb", 0.0) if weights else 0.0)
+
+    def used_mb(self) -> float:
+        return sum(self._pack_mb(w.pack_id) for w in self.workers)
+
+    def _can_spawn(self, pack_id: str) -> bool:
+        if not self.workers:
+            return True
+        if self.memory_budget_mb <= 0:
+            return False
+        return self.used_mb() + self._pack_mb(pack_id) <= self.memory_budget_mb
+
+    def _find(self, pack_id: str) -> Optional[ResidentWorker]:
+        hosts = [w for w in self.workers if w.pack_id == pack_id]
+        return min(hosts, key=lambda w: w.busy) if hosts else None
+
+    def is_resident(self, pack_id: str) -> bool:
+        return any(w.pack_id == pack_id for w in self.workers)
+
+    def can_serve(self, pack_id: str, running_packs: Iterable[str]) -> bool:
+        if self.is_resident(pack_id):
+            return True
+        needed = len(set(running_packs) | {pack_id})
+        return needed <= len(self.workers) + (1 if self._can_spawn(pack_id) else 0)
+
+    def _next_port(self) -> int:
+        used = {w.port for w in self.workers}
+        port = self.base_port
+        while port in used:
+            port += 1
+        return port
+
+    async def _new_worker(self, pack_id: str) -> ResidentWorker:
+        port = self._next_port()
+        weights = self.packs_index.get(pack_id)
+        manager = await asyncio.to_thread(
+            SoVITSManager,
+            self.project_root,
+            port=port,
+            device=self.device,
+            model_version=getattr(weights, "version", "v2")
+        )
+        supervisor = SoVITSSupervisor(manager, startup_timeout=self.startup_timeout)
+        return ResidentWorker(port=port, manager=manager, supervisor=supervisor, pack_id=pack_id)
+
+    async def acquire(self, pack_id: str) -> Optional[ResidentWorker]:
+        async with self._cond:
+            while True:
+                worker = self._find(pack_id)
+                if worker:
+                    break
+                if self._can_spawn(pack_id):
+                    worker = await self._new_worker(pack_id)
+                    self.workers.append(worker)
+                    logger.info(f"Spawning SoVITS worker on port {worker.port} for pack {pack_id} "
+                                f"(resident {self.used_mb():.0f}/{self.memory_budget_mb:.0f} MB)")
+                    break
+                idle = [w for w in self.workers if w.busy == 0]
+                if idle:
+                    worker = min(idle, key=lambda w: w.last_used)
+                    logger.info(f"Evicting pack {worker.pack_id} from worker {worker.port} for {pack_id}")
+                    worker.pack_id = pack_id
+                    worker.supervisor.pack_id = pack_id
+                    self._swaps += 1
+                    break
+                await self._cond.wait()
+            worker.busy += 1
+
+        if await worker.supervisor.start(pack_id, kill_existing=True):
+            return worker
+        await self.release(worker)
+        if not worker.manager.is_alive():
+            async with self._cond:
+                if worker in self.workers and worker.busy == 0:
+                    self.workers.remove(worker)
+                    self._cond.notify_all()
+        return None
+
+    async def release(self, worker: ResidentWorker):
+        async with self._cond:
+            worker.busy = max(0, worker.busy - 1)
+            worker.last_used = time.monotonic()
+            self._cond.notify_all()
+
+    def preload(self, pack_ids: Iterable[str]):
+        if self.memory_budget_mb <= 0 or not self.workers:
+            return
+        for pack_id in pack_ids:
+            if pack_id in self._preloading or self.is_resident(pack_id) or not self._can_spawn(pack_id):
+                continue
+            self._preloading.add(pack_id)
+            task = asyncio.create_task(self._preload(pack_id))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _preload(self, pack_id: str):
+        try:
+            logger.info(f"Preloading weights for queued pack {pack_id}")
+            worker = await self.acquire(pack_id)
+            if worker:
+                await self.release(worker)
+        except Exception as e:
+            logger.warning(f"Preload failed for pack {pack_id}: {e}")
+        finally:
+            self._preloading.discard(pack_id)
+
+    def stats(self) -> dict:
+        return {
+            "memory_budget_mb": self.memory_budget_mb,
+            "resident_mb": round(self.used_mb(), 1),
+            "weight_swaps": self._swaps,
+            "workers": [
+                {"port": w.port, "pack_id": w.pack_id, "busy": w.busy, "ready": w.supervisor.ready}
+                for w in self.workers
+            ],
+        }
+
+    async def stop(self):
+        for worker in self.workers:
+            await worker.supervisor.stop()
@@ -5,7 +5,6 @@ import subprocess
 import time
 import requests
 import threading
-import re
 from pathlib import Path
 from typing import Optional
 import signal
@@ -15,6 +14,10 @@ import logging
 
 logger = logging.getLogger("SoVITS")
 
+PROBE_INITIAL_DELAY = 0.25
+PROBE_MAX_DELAY = 4.0
+SUPPRESS_DURATION = 55  # 前55秒内不打印is_running异常
+
 _sovits_logger = None
 
 def set_sovits_logger(logger_func):
@@ -62,11 +65,18 @@ class SoVITSManager:
             return False
     
     def start(self, timeout: int = 60, kill_existing: bool = False, pack_id: str = None) -> bool:
-        if self.is_running():
+        if not self.launch(kill_existing=kill_existing, pack_id=pack_id):
+            return False
+        return self.wait_until_ready(timeout)
+
+    def launch(self, kill_existing: bool = False, pack_id: str = None) -> bool:
+        if self.is_running(timeout=1.0, suppress_exception=True):
             if kill_existing:
+                self.stop()
                 self._kill_process_on_port(self.port)
-                time.sleep(2)
             else: return True
+        elif self.is_alive():
+            self.stop()
         self._start_time = time.time()
         
         if sys.platform == "win32":
@@ -86,7 +96,6 @@ class SoVITSManager:
         if not self.config_file.exists():
             logger.warning(f"[SoVITS] Error: Config file not found at {self.config_file}")
             return False
-        actual_config_file = self.config_file
         if pack_id is None:
             pack_id = "Resona_Default"
             try:
@@ -96,77 +105,8 @@ class SoVITSManager:
                 pack_id = cfg.get("General", "active_pack", fallback="Resona_Default")
             except: pass
         
-        pack_dir = self.project_root / "packs" / pack_id
-        if not pack_dir.exists():
-            found = False
-            for subdir in (self.project_root / "packs").iterdir():
-                if subdir.is_dir():
-                    pack_json = subdir / "pack.json"
-                    if pack_json.exists():
-                        try:
-                            import json
-                            with open(pack_json, "r", encoding="utf-8") as f:
-                                data = json.load(f)
-                                info = data.get("pack_info", {})
-                                if info.get("id") == pack_id or data.get("id") == pack_id:
-                                    pack_dir = subdir
-                                    found = True
-                                    break
-                        except: pass
-            if not found:
-                logger.warning(f"[SoVITS] Warning: Pack ID '{pack_id}' not found in any directory.")
-                
-        pack_model_dir = pack_dir / "models" / "sovits"
         log_sovits(f"[SoVITS] Starting with device={self.device}, model_version={self.model_version}")
-        try:
-            override_path = self.project_root / "TEMP" / f"tts_infer_override_{pack_id}.yaml"
-            override_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.config_file, "r", encoding="utf-8") as f: content = f.read()
-            log_sovits(f"[SoVITS] Config file read from {self.config_file}, applying device={self.device} override")
-            orig_device_match = re.search(r'device:\s*(\w+)', content)
-            orig_is_half_match = re.search(r'is_half:\s*(\w+)', content)
-            if orig_device_match:
-                log_sovits(f"[SoVITS] Original config device: {orig_device_match.group(1)}")
-            if orig_is_half_match:
-                log_sovits(f"[SoVITS] Original config is_half: {orig_is_half_match.group(1)}")
-            if self.device == "cuda":
-                content = re.sub(r'device\s*:\s*cpu', 'device: cuda', content, flags=re.IGNORECASE)
-                content = re.sub(r'is_half\s*:\s*false', 'is_half: true', content, flags=re.IGNORECASE)
-            else:
-                content = re.sub(r'device\s*:\s*cuda', 'device: cpu', content, flags=re.IGNORECASE)
-                content = re.sub(r'is_half\s*:\s*true', 'is_half: false', content, flags=re.IGNORECASE)
-            bert_abs = (self.gpt_sovits_dir / "GPT_SoVITS" / "pretrained_models" / "chinese-roberta-wwm-ext-large").absolute().as_posix()
-            hubert_abs = (self.gpt_sovits_dir / "GPT_SoVITS" / "pretrained_models" / "chinese-hubert-base").absolute().as_posix()
-            content = re.sub(r'bert_base_path:.*', f'bert_base_path: {bert_abs}', content)
-            content = re.sub(r'cnhuhbert_base_path:.*', f'cnhuhbert_base_path: {hubert_abs}', content)
-            content = re.sub(r'cnhubert_base_path:.*', f'cnhubert_base_path: {hubert_abs}', content)
-            ckpt_files = list(pack_model_dir.glob("*.ckpt"))
-            pth_files = list(pack_model_dir.glob("*.pth"))
-            if not (ckpt_files and pth_files):
-                model_dir = self.project_root / "models" / "sovits"
-                ckpt_files = list(model_dir.glob("*.ckpt"))
-                pth_files = list(model_dir.glob("*.pth"))
-            if ckpt_files and pth_files:
-                ckpt_file, pth_file = sorted(ckpt_files)[0], sorted(pth_files)[0]
-                abs_ckpt = ckpt_file.absolute().as_posix()
-                abs_pth = pth_file.absolute().as_posix()
-                content = re.sub(r't2s_weights_path:.*', f't2s_weights_path: "{abs_ckpt}"', content)
-                content = re.sub(r'vits_weights_path:.*', f'vits_weights_path: "{abs_pth}"', content)
-                content = re.sub(r'version:.*', f'version: {self.model_version}', content)
-            with open(override_path, "w", encoding="utf-8") as f: f.write(content)
-            actual_config_file = override_path
-            log_sovits(f"[SoVITS] Applied {self.device.upper()} config override: {actual_config_file}")
-            with open(override_path, "r", encoding="utf-8") as f: verify_content = f.read()
-            verify_device_match = re.search(r'device:\s*(\w+)', verify_content)
-            verify_is_half_match = re.search(r'is_half:\s*(\w+)', verify_content)
-            if verify_device_match:
-                log_sovits(f"[SoVITS] Verified written config device: {verify_device_match.group(1)}")
-            if verify_is_half_match:
-                log_sovits(f"[SoVITS] Verified written config is_half: {verify_is_half_match.group(1)}")
-        except Exception as e:
-            import traceback
-            log_sovits(f"[SoVITS] Warning: Failed to apply config override: {e}")
-            log_sovits(f"[SoVITS] Traceback: {traceback.format_exc()}")
+        actual_config_file = self._write_config_override(pack_id, self._find_pack_dir(pack_id))
         python_exec = sys.executable
         embedded_python = self.gpt_sovits_dir / "runtime" / "python.exe"
         if sys.platform == "win32" and embedded_python.exists(): python_exec = str(embedded_python)
@@ -224,33 +164,137 @@ class SoVITSManager:
             threading.Thread(target=stream_output, args=(self.process.stderr, "[SoVITS]"), daemon=True).start()
             
             logger.info(f"[SoVITS] Process started (PID: {self.process.pid}). Waiting for API to be ready...")
-            start_time = time.time()
-            SUPPRESS_DURATION = 55  # 前55秒内不打印is_running异常
-            while time.time() - start_time < timeout:
-                elapsed = time.time() - self._start_time if self._start_time else float('inf')
-                suppress = elapsed < SUPPRESS_DURATION
-                if self.is_running(suppress_exception=suppress):
-                    logger.info(f"[SoVITS] API is ready after {time.time() - start_time:.2f}s")
-                    return True
-                if self.process.poll() is not None:
-                    exit_code = self.process.poll()
-                    logger.error(f"[SoVITS] Error: Process exited unexpectedly with code {exit_code}")
-                    return False
-                time.sleep(0.5)
-            
-            logger.error(f"[SoVITS] Error: Startup timed out after {timeout}s")
-            self.stop()
-            return False
+            return True
         except Exception as e:
             logger.error(f"[SoVITS] Exception during startup: {e}")
             return False
-    
-    def _kill_process_on_port(self, port: int):
+
+    def wait_until_ready(self, timeout: float = 60) -> bool:
+        start_time = time.time()
+        delay = PROBE_INITIAL_DELAY
+        while time.time() - start_time < timeout:
+            elapsed = time.time() - self._start_time if self._start_time else float('inf')
+            suppress = elapsed < SUPPRESS_DURATION
+            if self.is_running(timeout=1.0, suppress_exception=suppress):
+                logger.info(f"[SoVITS] API is ready after {time.time() - start_time:.2f}s")
+                return True
+            exit_code = self.exit_code()
+            if exit_code is not None:
+                logger.error(f"[SoVITS] Error: Process exited unexpectedly with code {exit_code}")
+                return False
+            time.sleep(delay)
+            delay = min(delay * 2, PROBE_MAX_DELAY)
+        
+        logger.error(f"[SoVITS] Error: Startup timed out after {timeout}s")
+        self.stop()
+        return False
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def exit_code(self) -> Optional[int]:
+        if self.process is None:
+            return None
+        return self.process.poll()
+
+    def _find_pack_dir(self, pack_id: str) -> Path:
+        pack_dir = self.project_root / "packs" / pack_id
+        if pack_dir.exists():
+            return pack_dir
+        for subdir in (self.project_root / "packs").iterdir():
+            if subdir.is_dir():
+                pack_json = subdir / "pack.json"
+                if pack_json.exists():
+                    try:
+                        import json
+                        with open(pack_json, "r", encoding="utf-8") as f:
+                            data = json.load(f)
+                            info = data.get("pack_info", {})
+                            if info.get("id") == pack_id or data.get("id") == pack_id:
+                                return subdir
+                    except: pass
+        logger.warning(f"[SoVITS] Warning: Pack ID '{pack_id}' not found in any directory.")
+        return pack_dir
+
+    def _write_config_override(self, pack_id: str, pack_dir: Path) -> Path:
+        try:
+            import yaml
+            override_path = self.project_root / "TEMP" / f"tts_infer_override_{pack_id}.yaml"
+            override_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.config_file, "r", encoding="utf-8") as f: data = yaml.safe_load(f) or {}
+            log_sovits(f"[SoVITS] Config file read from {self.config_file}, applying device={self.device} override")
+
+            pack_model_dir = pack_dir / "models" / "sovits"
+            ckpt_files = list(pack_model_dir.glob("*.ckpt"))
+            pth_files = list(pack_model_dir.glob("*.pth"))
+            if not (ckpt_files and pth_files):
+                model_dir = self.project_root / "models" / "sovits"
+                ckpt_files = list(model_dir.glob("*.ckpt"))
+                pth_files = list(model_dir.glob("*.pth"))
+            weights = None
+            if ckpt_files and pth_files:
+                weights = (sorted(ckpt_files)[0].absolute().as_posix(), sorted(pth_files)[0].absolute().as_posix())
+
+            bert_abs = (self.gpt_sovits_dir / "GPT_SoVITS" / "pretrained_models" / "chinese-roberta-wwm-ext-large").absolute().as_posix()
+            hubert_abs = (self.gpt_sovits_dir / "GPT_SoVITS" / "pretrained_models" / "chinese-hubert-base").absolute().as_posix()
+            is_half = self.device == "cuda"
+            for name, section in data.items():
+                if not isinstance(section, dict):
+                    continue
+                if "device" in section:
+                    log_sovits(f"[SoVITS] Original config [{name}] device: {section['device']}, is_half: {section.get('is_half')}")
+                    section["device"] = self.device
+                if "is_half" in section:
+                    section["is_half"] = is_half
+                if "bert_base_path" in section:
+                    section["bert_base_path"] = bert_abs
+                for key in ("cnhuhbert_base_path", "cnhubert_base_path"):
+                    if key in section:
+                        section[key] = hubert_abs
+                if weights:
+                    if "t2s_weights_path" in section:
+                        section["t2s_weights_path"] = weights[0]
+                    if "vits_weights_path" in section:
+                        section["vits_weights_path"] = weights[1]
+                    if "version" in section:
+                        section["version"] = self.model_version
+            with open(override_path, "w", encoding="utf-8") as f:
+                yaml.safe_dump(data, f, allow_unicode=True, sort_keys=False)
+            log_sovits(f"[SoVITS] Applied {self.device.upper()} config override: {override_path}")
+            return override_path
+        except Exception as e:
+            import traceback
+            log_sovits(f"[SoVITS] Warning: Failed to apply config override: {e}")
+            log_sovits(f"[SoVITS] Traceback: {traceback.format_exc()}")
+            return self.config_file
+
+    def _find_port_owners(self, port: int) -> list:
+        try:
+            pids = {conn.pid for conn in psutil.net_connections(kind='inet')
+                    if conn.laddr and conn.laddr.port == port and conn.pid}
+            return [psutil.Process(pid) for pid in pids if pid != os.getpid()]
+        except psutil.AccessDenied:
+            pass
+        owners = []
         for proc in psutil.process_iter(['pid', 'name']):
             try:
                 for conn in proc.connections(kind='inet'):
-                    if conn.laddr.port == port: proc.kill()
+                    if conn.laddr.port == port:
+                        owners.append(proc)
+                        break
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess): pass
+        return owners
+    
+    def _kill_process_on_port(self, port: int, timeout: float = 5.0):
+        owners = []
+        for proc in self._find_port_owners(port):
+            try:
+                log_sovits(f"[SoVITS] Killing PID {proc.pid} holding port {port}")
+                proc.kill()
+                owners.append(proc)
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess): pass
+        if owners:
+            psutil.wait_procs(owners, timeout=timeout)
 
     def stop(self) -> None:
         if self.process is None: return
@@ -274,8 +318,8 @@ class SoVITSManager:
         except Exception: pass
         finally: self.process = None
     
-    def restart(self, timeout: int = 60) -> bool:
-        self.stop(); time.sleep(2); return self.start(timeout)
+    def restart(self, timeout: int = 60, pack_id: str = None) -> bool:
+        self.stop(); return self.start(timeout, kill_existing=True, pack_id=pack_id)
     
     def __del__(self):
         self.stop()
@@ -10,7 +10,13 @@ from dataclasses import dataclass
 
 import websockets
 
-from .sovits_manager import SoVITSManager, set_sovits_logger
+from .sovits_manager import set_sovits_logger
+from .model_residency import DEFAULT_WORKER_OVERHEAD_MB, ModelResidency
+from .audio_framing import (
+    AUDIO_TRANSPORT_BASE64, AUDIO_TRANSPORT_BINARY, DEFAULT_CHUNK_SIZE, SUPPORTED_AUDIO_TRANSPORTS,
+    audio_start_message, clamp_chunk_size, iter_chunks, negotiate_transport, pack_audio_frame
+)
+from .synthesis_scheduler import PRIORITY_NAMES, SynthesisJob, SynthesisScheduler, parse_priority
 
 BROADCAST_PORT = 19876
 BROADCAST_INTERVAL = 5.0
@@ -41,6 +47,7 @@ class PackWeights:
     sovits_path: Optional[str] = None
     version: str = "v2"
     valid: bool = False
+    size_mb: float = 0.0
 
 
 @dataclass
@@ -48,29 +55,37 @@ class ClientSession:
     websocket: any
     pack_id: Optional[str] = None
     client_id: str = ""
+    audio_transport: str = AUDIO_TRANSPORT_BASE64
+    chunk_size: int = DEFAULT_CHUNK_SIZE
 
 
 class SoVITSServer:
     def __init__(self, project_root: Path, port: int = 9876, device: str = "cuda", 
                  broadcast_enabled: bool = True, sovits_api_port: int = 9880,
-                 default_pack: str = None):
+                 default_pack: str = None, pack_concurrency: int = 1, memory_budget_mb: float = 0.0,
+                 worker_overhead_mb: float = DEFAULT_WORKER_OVERHEAD_MB):
         self.project_root = project_root
         self.port = port
         self.device = device
         self.broadcast_enabled = broadcast_enabled
         self.sovits_api_port = sovits_api_port
         self.default_pack = default_pack
-        self.sovits_manager: Optional[SoVITSManager] = None
         self.packs_index: Dict[str, PackWeights] = {}
         self.clients: Dict[str, ClientSession] = {}
-        self._current_loaded_pack: Optional[str] = None
-        self._lock = asyncio.Lock()
-        self._request_queue: asyncio.Queue = asyncio.Queue()
-        self._processing = False
+        self.residency = ModelResidency(
+            project_root, sovits_api_port, device, self.packs_index,
+            memory_budget_mb=memory_budget_mb, worker_overhead_mb=worker_overhead_mb
+        )
+        self._scheduler = SynthesisScheduler(
+            self._run_job,
+            pack_concurrency=pack_concurrency,
+            pack_gate=self.residency.can_serve,
+            is_resident=self.residency.is_resident,
+            on_backlog=self.residency.preload
+        )
         self._broadcast_socket: Optional[socket.socket] = None
         self._broadcast_running = False
         self._local_ip = self._get_local_ip()
-        self._sovits_starting = False
 
     def _get_local_ip(self) -> str:
         try:
@@ -165,6 +180,8 @@ class SoVITSServer:
             if pth_files:
                 weights.sovits_path = str(sorted(pth_files)[0].absolute())
             weights.valid = bool(weights.gpt_path and weights.sovits_path)
+            if weights.valid:
+                weights.size_mb = (Path(weights.gpt_path).stat().st_size + Path(weights.sovits_path).stat().st_size) / (1024 * 1024)
 
             index[pack_id] = weights
             status = "valid" if weights.valid else "no weights"
@@ -172,79 +189,34 @@ class SoVITSServer:
 
         return index
 
-    async def start_sovits(self, pack_id: str) -> bool:
-        if self.sovits_manager:
-            is_running = self.sovits_manager.is_running()
-            logger.info(f"start_sovits check: sovits_manager exists, is_running={is_running}")
-            if is_running:
-                return True
-        else:
-            logger.info(f"start_sovits check: sovits_manager is None")
-
-        if self._sovits_starting:
-            logger.info(f"start_sovits check: SoVITS is already starting, waiting...")
-            import time
-            for _ in range(60):  
-                if self.sovits_manager and self.sovits_manager.is_running():
-                    logger.info(f"start_sovits check: SoVITS is now ready")
-                    return True
-                time.sleep(0.5)
-            logger.info(f"start_sovits check: Timeout waiting for SoVITS to start")
-            return False
-
+    def _check_pack(self, pack_id: str) -> bool:
         if pack_id not in self.packs_index:
             logger.info(f"Pack not found: {pack_id}")
             return False
-
-        weights = self.packs_index[pack_id]
-        if not weights.valid:
+        if not self.packs_index[pack_id].valid:
             logger.info(f"Pack has no valid weights: {pack_id}")
             return False
+        return True
 
-        self._sovits_starting = True
-        try:
-            self.sovits_manager = SoVITSManager(
-                self.project_root,
-                port=self.sovits_api_port,
-                device=self.device,
-                model_version=weights.version
-            )
-
-            def _start_sync():
-                return self.sovits_manager.start(timeout=120, kill_existing=True, pack_id=pack_id)
-
-            loop = asyncio.get_event_loop()
-            success = await loop.run_in_executor(None, _start_sync)
-
-            if success:
-                self._current_loaded_pack = pack_id
-                logger.info(f"SoVITS process started with pack: {pack_id}")
-                logger.info(f"Waiting for SoVITS API to be fully ready...")
-                import time
-                for attempt in range(30):  
-                    if self.sovits_manager.is_running(timeout=1.0):
-                        logger.info(f"SoVITS API is ready after {attempt + 1} checks")
-                        return True
-                    time.sleep(0.5)
-                logger.info(f"Warning: SoVITS API may not be fully ready yet")
-            else:
-                logger.error(f"Failed to start SoVITS for pack: {pack_id}")
-
-            return success
-        finally:
-            self._sovits_starting = False
-
-    async def synthesize(self, pack_id: str, text: str, emotion_config: dict, params: dict) -> Optional[bytes]:
-        if not await self.start_sovits(pack_id):
-            return None
+    async def start_sovits(self, pack_id: str) -> bool:
+        if not self._check_pack(pack_id):
+            return False
+        worker = await self.residency.acquire(pack_id)
+        if worker is None:
+            logger.error(f"Failed to start SoVITS for pack: {pack_id}")
+            return False
+        await self.residency.release(worker)
+        logger.info(f"SoVITS worker on port {worker.port} ready with pack: {pack_id}")
+        return True
 
+    def _build_payload(self, pack_id: str, text: str, emotion_config: dict, params: dict, streaming: bool = False) -> Optional[dict]:
         ref_wav_path = emotion_config.get("ref_wav_path")
         if not ref_wav_path:
             logger.info("Missing ref_wav_path in emotion_config")
             return None
 
         weights = self.packs_index.get(pack_id)
-        
+
         payload = {
             "text": text,
             "text_lang": params.get("text_lang", "ja"),
@@ -256,7 +228,7 @@ class SoVITSServer:
             "temperature": params.get("temperature", 1.0),
             "speed_factor": params.get("speed", 1.0),
             "media_type": "wav",
-            "streaming_mode": False,
+            "streaming_mode": streaming,
             "text_split_method": params.get("text_split_method", "cut5"),
             "fragment_interval": params.get("fragment_interval", 0.25),
             "repetition_penalty": 1.35
@@ -268,14 +240,23 @@ class SoVITSServer:
             payload["sovits_method"] = "set_sovits_weights"
             payload["sovits_path"] = weights.sovits_path.replace("\\", "/")
             logger.info(f"Dynamic model switch: gpt={payload['gpt_path']}, sovits={payload['sovits_path']}")
+        return payload
+
+    async def synthesize(self, pack_id: str, text: str, emotion_config: dict, params: dict) -> Optional[bytes]:
+        payload = self._build_payload(pack_id, text, emotion_config, params)
+        if payload is None or not self._check_pack(pack_id):
+            return None
+
+        worker = await self.residency.acquire(pack_id)
+        if worker is None:
+            return None
 
         import aiohttp
-        api_url = f"http://127.0.0.1:{self.sovits_api_port}"
         timeout = aiohttp.ClientTimeout(total=params.get("timeout", 120))
 
         try:
             async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(f"{api_url}/tts", json=payload) as response:
+                async with session.post(f"{worker.api_url}/tts", json=payload) as response:
                     if response.status == 200:
                         return await response.read()
                     else:
@@ -285,6 +266,34 @@ class SoVITSServer:
         except Exception as e:
             logger.error(f"TTS request failed: {e}")
             return None
+        finally:
+            await self.residency.release(worker)
+
+    async def synthesize_stream(self, pack_id: str, text: str, emotion_config: dict, params: dict, chunk_size: int):
+        payload = self._build_payload(pack_id, text, emotion_config, params, streaming=True)
+        if payload is None:
+            raise RuntimeError("Missing ref_wav_path in emotion_config")
+        if not self._check_pack(pack_id):
+            raise RuntimeError(f"Pack '{pack_id}' not available")
+
+        worker = await self.residency.acquire(pack_id)
+        if worker is None:
+            raise RuntimeError("SoVITS not available")
+
+        import aiohttp
+        timeout = aiohttp.ClientTimeout(total=params.get("timeout", 120))
+
+        try:
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                async with session.post(f"{worker.api_url}/tts", json=payload) as response:
+                    if response.status != 200:
+                        error_text = await response.text()
+                        raise RuntimeError(f"TTS API error: {response.status} - {error_text}")
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        if chunk:
+                            yield chunk
+        finally:
+            await self.residency.release(worker)
 
     async def handle_client(self, websocket, path=""):
         client_id = f"{websocket.remote_address[0]}:{websocket.remote_address[1]}"
@@ -294,6 +303,9 @@ class SoVITSServer:
 
         try:
             async for message in websocket:
+                if isinstance(message, bytes):
+                    await websocket.send(json.dumps({"type": "error", "message": "Unexpected binary frame"}))
+                    continue
                 try:
                     data = json.loads(message)
                     await self.handle_message(session, data)
@@ -304,6 +316,7 @@ class SoVITSServer:
             pass
         finally:
             del self.clients[client_id]
+            self._scheduler.remove_client(client_id)
             logger.info(f"Client disconnected: {client_id}")
 
     async def handle_message(self, session: ClientSession, data: dict):
@@ -313,6 +326,8 @@ class SoVITSServer:
         if msg_type == "handshake":
             pack_id = data.get("pack_id", "")
             session.pack_id = pack_id
+            session.audio_transport = negotiate_transport(data.get("audio_transports"))
+            session.chunk_size = clamp_chunk_size(data.get("chunk_size", DEFAULT_CHUNK_SIZE))
 
             available_packs = [p for p, w in self.packs_index.items() if w.valid]
             pack_valid = pack_id in self.packs_index and self.packs_index[pack_id].valid
@@ -321,10 +336,13 @@ class SoVITSServer:
                 "type": "handshake_ack",
                 "available_packs": available_packs,
                 "requested_pack_valid": pack_valid,
-                "requested_pack_id": pack_id
+                "requested_pack_id": pack_id,
+                "audio_transport": session.audio_transport,
+                "audio_transports": SUPPORTED_AUDIO_TRANSPORTS,
+                "chunk_size": session.chunk_size
             }
             await session.websocket.send(json.dumps(response))
-            logger.info(f"Handshake from {session.client_id}: pack={pack_id}, valid={pack_valid}")
+            logger.info(f"Handshake from {session.client_id}: pack={pack_id}, valid={pack_valid}, transport={session.audio_transport}")
 
         elif msg_type == "synthesize":
             await self._queue_synthesize(session, data)
@@ -339,6 +357,13 @@ class SoVITSServer:
                 "packs": available_packs
             }))
 
+        elif msg_type == "queue_stats":
+            await session.websocket.send(json.dumps({
+                "type": "queue_stats",
+                **self._scheduler.stats(),
+                "residency": self.residency.stats()
+            }))
+
     async def _queue_synthesize(self, session: ClientSession, data: dict):
         pack_id = data.get("pack_id") or session.pack_id
         logger.info(f"Queueing synthesize request: pack_id={pack_id}, session_pack={session.pack_id}")
@@ -358,52 +383,135 @@ class SoVITSServer:
             }))
             return
 
-        await self._request_queue.put((session, data, pack_id))
-        logger.info(f"Queued synthesize request from {session.client_id} for pack {pack_id}")
-
-        if not self._processing:
-            asyncio.create_task(self._process_queue())
-
-    async def _process_queue(self):
-        if self._processing:
+        request_id = data.get("request_id", "")
+        params = data.get("params", {})
+        priority = parse_priority(data.get("priority", params.get("priority")))
+        streaming = session.audio_transport == AUDIO_TRANSPORT_BINARY and bool(params.get("stream"))
+        coalesced = self._scheduler.submit(
+            session, request_id, pack_id, data.get("text", ""), data.get("emotion_config", {}),
+            params, priority, streaming=streaming
+        )
+        if not coalesced:
+            logger.info(f"Queued synthesize request {request_id} from {session.client_id} for pack {pack_id} "
+                        f"(priority={PRIORITY_NAMES[priority]})")
+
+    async def _run_job(self, job: SynthesisJob):
+        waited = job.started_at - job.enqueued_at
+        logger.info(f"Processing synthesize: pack={job.pack_id}, priority={PRIORITY_NAMES[job.priority]}, "
+                    f"waiters={len(job.waiters)}, text_len={len(job.text)}, waited={waited:.2f}s")
+
+        if job.streaming:
+            await self._stream_job(job)
             return
 
-        self._processing = True
-        try:
-            while not self._request_queue.empty():
-                session, data, pack_id = await self._request_queue.get()
-
-                request_id = data.get("request_id", "")
-                text = data.get("text", "")
-                emotion_config = data.get("emotion_config", {})
-                params = data.get("params", {})
-
-                logger.info(f"Processing synthesize: pack={pack_id}, request_id={request_id}, text_len={len(text)}")
-
-                audio_data = await self.synthesize(pack_id, text, emotion_config, params)
-
+        audio_data = await self.synthesize(job.pack_id, job.text, job.emotion_config, job.params)
+        self._scheduler.seal(job)
+        for waiter in list(job.waiters):
+            try:
                 if audio_data:
-                    audio_b64 = base64.b64encode(audio_data).decode("utf-8")
-                    await session.websocket.send(json.dumps({
-                        "type": "synthesize_result",
-                        "request_id": request_id,
-                        "status": "success",
-                        "audio_data": audio_b64,
-                        "format": "wav"
-                    }))
-                    logger.info(f"Sent audio to {session.client_id}: {len(audio_data)} bytes")
+                    await self._send_audio(waiter.session, waiter.request_id, audio_data)
+                    logger.info(f"Sent audio to {waiter.session.client_id}: {len(audio_data)} bytes "
+                                f"({waiter.session.audio_transport})")
                 else:
-                    await session.websocket.send(json.dumps({
-                        "type": "synthesize_result",
-                        "request_id": request_id,
-                        "status": "error",
-                        "error": "Synthesis failed"
-                    }))
+                    await self._send_error(waiter.session, waiter.request_id, "Synthesis failed")
+            except websockets.exceptions.ConnectionClosed:
+                logger.info(f"Client {waiter.session.client_id} closed before result {waiter.request_id} was delivered")
+
+    async def _send_error(self, session: ClientSession, request_id: str, error: str):
+        await session.websocket.send(json.dumps({
+            "type": "synthesize_result",
+            "request_id": request_id,
+            "status": "error",
+            "error": error
+        }))
+
+    async def _send_audio(self, session: ClientSession, request_id: str, audio_data: bytes):
+        if session.audio_transport != AUDIO_TRANSPORT_BINARY:
+            audio_b64 = base64.b64encode(audio_data).decode("utf-8")
+            await session.websocket.send(json.dumps({
+                "type": "synthesize_result",
+                "request_id": request_id,
+                "status": "success",
+                "audio_data": audio_b64,
+                "format": "wav"
+            }))
+            return
+
+        await session.websocket.send(json.dumps(audio_start_message(request_id, "wav", len(audio_data))))
+        seq = 0
+        for chunk in iter_chunks(audio_data, session.chunk_size):
+            await session.websocket.send(pack_audio_frame(request_id, seq, chunk))
+            seq += 1
+        await session.websocket.send(json.dumps({
+            "type": "synthesize_result",
+            "request_id": request_id,
+            "status": "success",
+            "transport": AUDIO_TRANSPORT_BINARY,
+            "format": "wav",
+            "chunks": seq,
+            "total_bytes": len(audio_data)
+        }))
+
+    async def _send_to_waiters(self, job: SynthesisJob, build):
+        for waiter in list(job.waiters):
+            try:
+                await waiter.session.websocket.send(build(waiter))
+            except websockets.exceptions.ConnectionClosed:
+                # remove_client may have rebound job.waiters during the await
+                job.waiters = [w for w in job.waiters if w is not waiter]
+
+    async def _stream_job(self, job: SynthesisJob):
+        chunk_size = min(w.session.chunk_size for w in job.waiters) if job.waiters else DEFAULT_CHUNK_SIZE
+        seq = 0
+        total = 0
+        started = False
+        stream = self.synthesize_stream(job.pack_id, job.text, job.emotion_config, job.params, chunk_size)
+        try:
+            async for chunk in stream:
+                if not job.waiters:
+                    logger.info(f"All clients left, abandoning stream for pack {job.pack_id}")
+                    return
+                if not started:
+                    await self._send_to_waiters(job, lambda w: json.dumps(
+                        audio_start_message(w.request_id, "wav", None, streaming=True)))
+                    started = True
+                await self._send_to_waiters(job, lambda w: pack_audio_frame(w.request_id, seq, chunk))
+                seq += 1
+                total += len(chunk)
+        except Exception as e:
+            logger.error(f"Streaming synthesis failed: {e}")
+            await self._send_to_waiters(job, lambda w: json.dumps({
+                "type": "synthesize_result",
+                "request_id": w.request_id,
+                "status": "error",
+                "error": f"Synthesis failed: {e}"
+            }))
+            return
         finally:
-            self._processing = False
+            await stream.aclose()
+
+        if not started:
+            await self._send_to_waiters(job, lambda w: json.dumps({
+                "type": "synthesize_result",
+                "request_id": w.request_id,
+                "status": "error",
+                "error": "Synthesis failed"
+            }))
+            return
+        await self._send_to_waiters(job, lambda w: json.dumps({
+            "type": "synthesize_result",
+            "request_id": w.request_id,
+            "status": "success",
+            "transport": AUDIO_TRANSPORT_BINARY,
+            "format": "wav",
+            "streaming": True,
+            "chunks": seq,
+            "total_bytes": total
+        }))
+        logger.info(f"Streamed audio to {len(job.waiters)} clients: {total} bytes in {seq} chunks")
 
     async def run(self):
-        self.packs_index = self.scan_packs()
+        self.packs_index.update(self.scan_packs())
         logger.info(f"Scanned {len(self.packs_index)} packs, {sum(1 for w in self.packs_index.values() if w.valid)} valid")
 
         temp_dir = self.project_root / "TEMP"
@@ -450,13 +558,13 @@ class SoVITSServer:
                 await asyncio.Future()
         finally:
             self._stop_broadcast()
-            if self.sovits_manager:
-                self.sovits_manager.stop()
+            await self.residency.stop()
 
 
 def run_server(project_root: str = None, port: int = 9876, device: str = "cuda",
                broadcast_enabled: bool = True, sovits_api_port: int = 9880,
-               log_file: Optional[Path] = None, default_pack: str = None):
+               log_file: Optional[Path] = None, default_pack: str = None, pack_concurrency: int = 1,
+               memory_budget_mb: float = 0.0, worker_overhead_mb: float = DEFAULT_WORKER_OVERHEAD_MB):
     setup_logger(log_file)
     
     if project_root is None:
@@ -470,7 +578,10 @@ def run_server(project_root: str = None, port: int = 9876, device: str = "cuda",
         device=device,
         broadcast_enabled=broadcast_enabled,
         sovits_api_port=sovits_api_port,
-        default_pack=default_pack
+        default_pack=default_pack,
+        pack_concurrency=pack_concurrency,
+        memory_budget_mb=memory_budget_mb,
+        worker_overhead_mb=worker_overhead_mb
     )
     asyncio.run(server.run())
 
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from .sovits_manager import SoVITSManager, PROBE_INITIAL_DELAY, PROBE_MAX_DELAY, log_sovits
+
+logger = logging.getLogger("SoVITS-Server")
+
+HEALTH_CHECK_INTERVAL = 2.0
+RESTART_BACKOFF_MAX = 60.0
+STABLE_UPTIME = 300.0
+
+
+class SoVITSSupervisor:
+    def __init__(self, manager: SoVITSManager, startup_timeout: float = 120.0, max_restarts: int = 5):
+        self.manager = manager
+        self.startup_timeout = startup_timeout
+        self.max_restarts = max_restarts
+        self.pack_id: Optional[str] = None
+        self._ready = False
+        self._stopping = False
+        self._start_lock = asyncio.Lock()
+        self._watch_task: Optional[asyncio.Task] = None
+        self._restarts = 0
+        self._ready_since: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready and self.manager.is_alive()
+
+    async def probe(self, timeout: float = 1.0) -> bool:
+        import aiohttp
+        try:
+            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+                async with session.get(f"{self.manager.api_url}/") as response:
+                    return response.status in (200, 404)
+        except Exception:
+            return False
+
+    async def wait_ready(self, timeout: float) -> bool:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delay = PROBE_INITIAL_DELAY
+        attempts = 0
+        while loop.time() < deadline:
+            attempts += 1
+            if await self.probe():
+                logger.info(f"SoVITS API is ready after {attempts} probes")
+                return True
+            exit_code = self.manager.exit_code()
+            if exit_code is not None:
+                logger.error(f"SoVITS process exited during startup with code {exit_code}")
+                return False
+            await asyncio.sleep(min(delay, max(0.0, deadline - loop.time())))
+            delay = min(delay * 2, PROBE_MAX_DELAY)
+        logger.error(f"SoVITS API not ready after {timeout}s")
+        return False
+
+    async def start(self, pack_id: str, kill_existing: bool = True) -> bool:
+        async with self._start_lock:
+            if self.ready:
+                return True
+            self._stopping = False
+            success = await self._launch(pack_id, kill_existing)
+            if success:
+                self._restarts = 0
+                if self._watch_task is None or self._watch_task.done():
+                    self._watch_task = asyncio.create_task(self._watch())
+            return success
+
+    async def _launch(self, pack_id: str, kill_existing: bool) -> bool:
+        self._ready = False
+        launched = await asyncio.to_thread(self.manager.launch, kill_existing, pack_id)
+        if not launched:
+            return False
+        if not await self.wait_ready(self.startup_timeout):
+            await asyncio.to_thread(self.manager.stop)
+            return False
+        self.pack_id = pack_id
+        self._ready = True
+        self._ready_since = time.monotonic()
+        return True
+
+    async def _watch(self):
+        while not self._stopping:
+            await asyncio.sleep(HEALTH_CHECK_INTERVAL)
+            if self._stopping or self._start_lock.locked():
+                continue
+            if self.manager.is_alive():
+                if self._ready_since and time.monotonic() - self._ready_since >= STABLE_UPTIME:
+                    self._restarts = 0
+                continue
+            if self.pack_id is None:
+                continue
+
+            exit_code = self.manager.exit_code()
+            self._ready = False
+            if self._restarts >= self.max_restarts:
+                logger.error(f"SoVITS crashed {self._restarts} times, giving up on automatic restarts")
+                return
+            self._restarts += 1
+            backoff = min(RESTART_BACKOFF_MAX, 2.0 ** self._restarts)
+            log_sovits(f"[SoVITS] Process exited (code={exit_code}), restarting in {backoff:.0f}s "
+                       f"(attempt {self._restarts}/{self.max_restarts})")
+            await asyncio.sleep(backoff)
+            if self._stopping:
+                return
+            async with self._start_lock:
+                if await self._launch(self.pack_id, kill_existing=True):
+                    logger.info(f"SoVITS restarted with pack: {self.pack_id}")
+
+    async def stop(self):
+        self._stopping = True
+        self._ready = False
+        if self._watch_task:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+        await asyncio.to_thread(self.manager.stop)
@@ -1,7 +1,7 @@
 import asyncio
-import os
 import threading
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Callable
 from dataclasses import dataclass
@@ -10,6 +10,9 @@ from ..cleanup_manager import register_cleanup
 
 logger = logging.getLogger("STT")
 
+VAD_WINDOW_SIZE = 512
+VAD_MIN_SPEECH = 0.25
+
 @dataclass
 class STTResult:
     text: str = ""
@@ -29,6 +32,15 @@ class STTBackend:
         self._silence_counter = 0
         self._hotkey_registered = False
         self._loaded_language = None
+        self._vad_config = None
+        self._load_lock = asyncio.Lock()
+        # One warm recognizer shared by the hotkey recorder and web uploads; decodes run on a
+        # small pool and anything beyond workers + queue_size is rejected instead of piling up
+        self._workers = max(1, self.config.stt_workers)
+        self._max_pending = self._workers + max(0, self.config.stt_queue_size)
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._decode_pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="stt-decode")
         register_cleanup(self.cleanup)
         logger.info("STTBackend initialized (Model not loaded yet)")
 
@@ -64,6 +76,10 @@ class STTBackend:
             return None
 
     async def load_model(self) -> bool:
+        async with self._load_lock:
+            return await self._load_model()
+
+    async def _load_model(self) -> bool:
         current_lang = self.config.stt_language
         if current_lang.lower() == "auto":
             current_lang = ""
@@ -101,6 +117,7 @@ class STTBackend:
             logger.info(f"CRITICAL: Model directory {model_dir} does not exist.")
             return False
         try:
+            import numpy as np
             import sherpa_onnx
             model_file, tokens_file = None, None
             for f in model_dir.iterdir():
@@ -121,11 +138,40 @@ class STTBackend:
             self._model_loaded = True
             self._loaded_language = current_lang
             logger.info("SenseVoice model loaded successfully.")
+            await self._load_vad()
+            await asyncio.wrap_future(self.submit(np.zeros(self._sample_rate // 10, dtype=np.float32)))
             return True
         except Exception as e: 
             logger.error(f"Failed to initialize sherpa-onnx: {e}")
             return False
 
+    async def _load_vad(self) -> None:
+        self._vad_config = None
+        if not self.config.stt_vad_enabled:
+            return
+        vad_path = self.project_root / self.config.stt_vad_model
+        if not vad_path.exists() and self.config.stt_vad_download_url:
+            logger.info("Silero VAD model not found, attempting download...")
+            downloaded = await asyncio.to_thread(self._download_model, self.config.stt_vad_download_url, vad_path.parent)
+            if downloaded and downloaded != vad_path:
+                downloaded.replace(vad_path)
+        if not vad_path.exists():
+            logger.warning(f"VAD model {vad_path} unavailable, falling back to volume-gated recording.")
+            return
+        try:
+            import sherpa_onnx
+            vad_config = sherpa_onnx.VadModelConfig()
+            vad_config.silero_vad.model = str(vad_path.absolute())
+            vad_config.silero_vad.threshold = self.config.stt_vad_threshold
+            vad_config.silero_vad.min_silence_duration = self.config.stt_vad_min_silence
+            vad_config.silero_vad.min_speech_duration = VAD_MIN_SPEECH
+            vad_config.silero_vad.window_size = VAD_WINDOW_SIZE
+            vad_config.sample_rate = self._sample_rate
+            self._vad_config = vad_config
+            logger.info(f"Silero VAD enabled: {vad_path.name}")
+        except Exception as e:
+            logger.warning(f"Failed to initialize Silero VAD, falling back to volume-gated recording: {e}")
+
     async def _extract_model(self, archive_path: Path, target_dir: Path) -> None:
         await asyncio.get_event_loop().run_in_executor(None, self._extract_sync, archive_path, target_dir)
 
@@ -159,7 +205,8 @@ class STTBackend:
             self._hotkey_registered = False
         except Exception: pass
 
-    async def start_recording(self, on_complete: Optional[Callable[[STTResult], None]] = None) -> None:
+    async def start_recording(self, on_complete: Optional[Callable[[STTResult], None]] = None,
+                              on_partial: Optional[Callable[[str], None]] = None) -> None:
         if self._is_recording: return
         
         current_lang = self.config.stt_language
@@ -172,93 +219,169 @@ class STTBackend:
                 return
         self._is_recording = True
         self._audio_data, self._silence_counter = [], 0
-        self._record_thread = threading.Thread(target=self._record_audio, args=(on_complete,), daemon=True)
+        self._record_thread = threading.Thread(target=self._record_audio, args=(on_complete, on_partial), daemon=True)
         self._record_thread.start()
 
-    def _record_audio(self, on_complete: Optional[Callable[[STTResult], None]]) -> None:
+    def _record_audio(self, on_complete: Optional[Callable[[STTResult], None]],
+                      on_partial: Optional[Callable[[str], None]] = None) -> None:
         import pyaudio
-        import numpy as np
         try:
             p = pyaudio.PyAudio()
             stream = p.open(format=pyaudio.paInt16, channels=1, rate=self._sample_rate, input=True, frames_per_buffer=1024)
-            max_duration = self.config.stt_max_duration
-            silence_timeout = self.config.stt_silence_threshold
-            max_frames = int(max_duration * self._sample_rate / 1024)
-            silence_threshold_frames = int(silence_timeout * self._sample_rate / 1024)
-            logger.info(f"Recording started (Max: {max_duration}s, Silence Timeout: {silence_timeout}s)")
-            frames_recorded, silence_frames = 0, 0
-            VOL_THRESHOLD = 20
-            MIN_DURATION = 2.0
-            while self._is_recording and frames_recorded < max_frames:
-                data = stream.read(1024, exception_on_overflow=False)
-                self._audio_data.append(data)
-                frames_recorded += 1
-                volume = np.abs(np.frombuffer(data, dtype=np.int16)).mean()
-                if volume < VOL_THRESHOLD:
-                    silence_frames += 1
-                    if silence_frames >= silence_threshold_frames:
-                        if frames_recorded * 1024 / self._sample_rate > MIN_DURATION:
-                            logger.info("Silence detected, stopping recording.")
-                            break
+            try:
+                if self._vad_config is not None:
+                    result = self._capture_with_vad(stream, on_partial)
                 else:
-                    silence_frames = 0
-            
-            stream.stop_stream()
-            stream.close()
-            p.terminate()
-            self._is_recording = False
-            logger.info("Recording finished. Recognizing...")
-            result = self._recognize_audio()
+                    self._capture_with_volume_gate(stream)
+                    logger.info("Recording finished. Recognizing...")
+                    result = self._recognize_audio()
+            finally:
+                stream.stop_stream()
+                stream.close()
+                p.terminate()
+                self._is_recording = False
             if on_complete: on_complete(result)
         except Exception as e:
             self._is_recording = False
             logger.error(f"Recording error: {e}")
             if on_complete: on_complete(STTResult(error=str(e)))
 
-    def recognize_file(self, file_path: str) -> STTResult:
+    def _capture_with_volume_gate(self, stream) -> None:
         import numpy as np
-        import wave
-        logger.info(f"recognize_file start path={file_path}")
-        
-        if not self._model_loaded:
-             try:
-                 loop = asyncio.get_event_loop()
-                 if loop.is_running():
-                     new_loop = asyncio.new_event_loop()
-                     try:
-                         if not new_loop.run_until_complete(self.load_model()):
-                             return STTResult(error="Model load failed")
-                     finally:
-                         new_loop.close()
-                 else:
-                     if not loop.run_until_complete(self.load_model()):
-                         return STTResult(error="Model load failed")
-             except Exception:
-                 if not asyncio.run(self.load_model()):
-                     return STTResult(error="Model load failed")
+        max_duration = self.config.stt_max_duration
+        silence_timeout = self.config.stt_silence_threshold
+        max_frames = int(max_duration * self._sample_rate / 1024)
+        silence_threshold_frames = int(silence_timeout * self._sample_rate / 1024)
+        logger.info(f"Recording started (Max: {max_duration}s, Silence Timeout: {silence_timeout}s)")
+        frames_recorded, silence_frames = 0, 0
+        VOL_THRESHOLD = 20
+        MIN_DURATION = 2.0
+        while self._is_recording and frames_recorded < max_frames:
+            data = stream.read(1024, exception_on_overflow=False)
+            self._audio_data.append(data)
+            frames_recorded += 1
+            volume = np.abs(np.frombuffer(data, dtype=np.int16)).mean()
+            if volume < VOL_THRESHOLD:
+                silence_frames += 1
+                if silence_frames >= silence_threshold_frames:
+                    if frames_recorded * 1024 / self._sample_rate > MIN_DURATION:
+                        logger.info("Silence detected, stopping recording.")
+                        break
+            else:
+                silence_frames = 0
 
-        try:
-            if not os.path.exists(file_path):
-                return STTResult(error="File not found")
-            
-            with wave.open(file_path, "rb") as wf:
-                if wf.getnchannels() != 1 or wf.getsampwidth() != 2 or wf.getframerate() != 16000:
-                    pass
-                
-                frames = wf.readframes(wf.getnframes())
-                samples = np.frombuffer(frames, dtype=np.int16)
-                samples = samples.astype(np.float32) / 32768.0
-
-            stream = self._recognizer.create_stream()
-            stream.accept_waveform(16000, samples)
-            self._recognizer.decode_stream(stream)
-            text = stream.result.text.strip()
-            logger.info(f"recognize_file done text_len={len(text)}")
-            return STTResult(text=text)
+    def _capture_with_vad(self, stream, on_partial: Optional[Callable[[str], None]]) -> STTResult:
+        # Segments go to the shared decode pool as soon as the VAD closes them, so by the time the
+        # trailing silence ends the recording only the last segment is still pending.
+        import numpy as np
+        import sherpa_onnx
+        max_duration = self.config.stt_max_duration
+        silence_timeout = self.config.stt_silence_threshold
+        max_frames = int(max_duration * self._sample_rate / 1024)
+        silence_threshold_frames = int(silence_timeout * self._sample_rate / 1024)
+        MIN_DURATION = 2.0
+        logger.info(f"Recording started with VAD (Max: {max_duration}s, Silence Timeout: {silence_timeout}s)")
+        vad = sherpa_onnx.VoiceActivityDetector(self._vad_config, buffer_size_in_seconds=max_duration + 5)
+        segments = []
+        texts = {}
+        texts_lock = threading.Lock()
 
+        def _on_segment(index, future):
+            result = future.result()
+            if result.error:
+                logger.error(f"Segment recognition error: {result.error}")
+            with texts_lock:
+                texts[index] = result.text
+                # Decodes may finish out of order; only report the contiguous prefix
+                ready = []
+                for i in range(len(segments)):
+                    if i not in texts:
+                        break
+                    if texts[i]:
+                        ready.append(texts[i])
+            if on_partial and result.text and ready:
+                on_partial(self._join_segments(ready))
+
+        def _drain():
+            while not vad.empty():
+                segment = np.array(vad.front.samples, dtype=np.float32)
+                vad.pop()
+                logger.info(f"Speech segment closed: {len(segment) / self._sample_rate:.2f}s")
+                with texts_lock:
+                    index = len(segments)
+                    future = self.submit(segment)
+                    segments.append(future)
+                future.add_done_callback(lambda f, i=index: _on_segment(i, f))
+
+        frames_recorded, silence_frames = 0, 0
+        while self._is_recording and frames_recorded < max_frames:
+            data = stream.read(1024, exception_on_overflow=False)
+            frames_recorded += 1
+            vad.accept_waveform(np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0)
+            if vad.is_speech_detected():
+                silence_frames = 0
+            else:
+                silence_frames += 1
+                if silence_frames >= silence_threshold_frames and frames_recorded * 1024 / self._sample_rate > MIN_DURATION:
+                    logger.info("End of speech detected, stopping recording.")
+                    break
+            _drain()
+        vad.flush()
+        _drain()
+
+        results = [future.result() for future in segments]
+        errors = [r.error for r in results if r.error]
+        text = self._join_segments([r.text for r in results if r.text])
+        if errors and not text:
+            return STTResult(error=errors[0])
+        duration = frames_recorded * 1024 / self._sample_rate
+        return STTResult(text=text, duration=duration)
+
+    @staticmethod
+    def _join_segments(texts) -> str:
+        joined = ""
+        for text in texts:
+            if joined and (joined[-1].isascii() and text[0].isascii()):
+                joined += " "
+            joined += text
+        return joined
+
+    def _decode_samples(self, samples) -> str:
+        stream = self._recognizer.create_stream()
+        stream.accept_waveform(self._sample_rate, samples)
+        self._recognizer.decode_stream(stream)
+        return stream.result.text.strip()
+
+    def _decode_job(self, samples) -> STTResult:
+        try:
+            return STTResult(text=self._decode_samples(samples), duration=len(samples) / self._sample_rate)
         except Exception as e:
-            logger.error(f"File recognition error: {e}")
+            logger.error(f"Recognition error: {e}")
             return STTResult(error=str(e))
+        finally:
+            with self._pending_lock:
+                self._pending -= 1
+
+    # Takes 16 kHz mono float32 samples; the future resolves to an STTResult
+    def submit(self, samples) -> Future:
+        with self._pending_lock:
+            accepted = self._recognizer is not None and self._pending < self._max_pending
+            if accepted:
+                self._pending += 1
+        if not accepted:
+            future = Future()
+            future.set_result(STTResult(error="STT queue full" if self._recognizer else "Model not loaded"))
+            return future
+        return self._decode_pool.submit(self._decode_job, samples)
+
+    async def recognize(self, samples) -> STTResult:
+        if not await self.load_model():
+            return STTResult(error="Model load failed")
+        return await asyncio.wrap_future(self.submit(samples))
+
+    def stats(self) -> dict:
+        with self._pending_lock:
+            return {"workers": self._workers, "pending": self._pending, "max_pending": self._max_pending}
 
     def _recognize_audio(self) -> STTResult:
         if not self._recognizer or not self._audio_data: return STTResult(error="No audio")
@@ -273,19 +396,17 @@ class STTBackend:
             max_vol = np.max(np.abs(audio_float))
             logger.info(f"Recognizing audio: {len(audio_float)/self._sample_rate:.2f}s, Max Vol: {max_vol:.4f}")
 
-            stream = self._recognizer.create_stream()
-            stream.accept_waveform(self._sample_rate, audio_float)
-            self._recognizer.decode_stream(stream)
-            
-            text = stream.result.text.strip()
-            return STTResult(text=text, duration=len(audio_float) / self._sample_rate)
+            return self.submit(audio_float).result()
         except Exception as e:
             logger.error(f"Recognition error: {e}")
             return STTResult(error=str(e))
 
     def stop_recording(self) -> None: self._is_recording = False
     def is_recording(self) -> bool: return self._is_recording
-    def cleanup(self) -> None: self.stop_recording(); self.unregister_hotkey()
+    def cleanup(self) -> None:
+        self.stop_recording()
+        self.unregister_hotkey()
+        self._decode_pool.shutdown(wait=False, cancel_futures=True)
     
     def refresh_audio_device(self) -> bool:
         try:
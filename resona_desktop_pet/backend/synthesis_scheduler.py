@@ -0,0 +1,265 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+logger = logging.getLogger("SoVITS-Server")
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_PRESYNTH = 1
+PRIORITY_BACKGROUND = 2
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_PRESYNTH: "presynth",
+    PRIORITY_BACKGROUND: "background",
+}
+
+_PRIORITY_ALIASES = {
+    "interactive": PRIORITY_INTERACTIVE,
+    "presynth": PRIORITY_PRESYNTH,
+    "pre_synthesis": PRIORITY_PRESYNTH,
+    "timer": PRIORITY_PRESYNTH,
+    "background": PRIORITY_BACKGROUND,
+}
+
+# Params that change how a result is delivered rather than what is synthesized
+_DELIVERY_PARAMS = ("timeout", "priority")
+WAIT_SAMPLE_WINDOW = 200
+# How many times the head of a class may be passed over for a job whose pack is already loaded
+MAX_AFFINITY_SKIPS = 4
+
+
+def parse_priority(value) -> int:
+    if isinstance(value, int) and value in PRIORITY_NAMES:
+        return value
+    if isinstance(value, str):
+        return _PRIORITY_ALIASES.get(value.strip().lower(), PRIORITY_INTERACTIVE)
+    return PRIORITY_INTERACTIVE
+
+
+def make_job_key(pack_id: str, text: str, emotion_config: dict, params: dict) -> str:
+    clean_params = {k: v for k, v in (params or {}).items() if k not in _DELIVERY_PARAMS}
+    raw = json.dumps([pack_id, text, emotion_config or {}, clean_params], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class JobWaiter:
+    session: Any
+    request_id: str
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class SynthesisJob:
+    key: str
+    pack_id: str
+    client_id: str
+    priority: int
+    text: str
+    emotion_config: dict
+    params: dict
+    streaming: bool = False
+    waiters: List[JobWaiter] = field(default_factory=list)
+    enqueued_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+
+
+class SynthesisScheduler:
+    def __init__(self, runner: Callable[[SynthesisJob], Awaitable[None]], pack_concurrency: int = 1,
+                 pack_gate: Optional[Callable[[str, Dict[str, int]], bool]] = None,
+                 is_resident: Optional[Callable[[str], bool]] = None,
+                 on_backlog: Optional[Callable[[Set[str]], None]] = None):
+        self._runner = runner
+        self.pack_concurrency = max(1, int(pack_concurrency))
+        self._pack_gate = pack_gate or self._single_pack_gate
+        self._is_resident = is_resident
+        self._on_backlog = on_backlog
+        self._affinity_skips = 0
+        # priority -> client_id -> pending jobs, plus a round-robin order of clients per priority
+        self._pending: Dict[int, Dict[str, Deque[SynthesisJob]]] = {p: {} for p in PRIORITY_NAMES}
+        self._rotation: Dict[int, Deque[str]] = {p: deque() for p in PRIORITY_NAMES}
+        self._by_key: Dict[str, SynthesisJob] = {}
+        self._running: Dict[int, SynthesisJob] = {}
+        self._running_packs: Dict[str, int] = {}
+        self._tasks = set()
+        self._wait_samples: Dict[int, Deque[float]] = {p: deque(maxlen=WAIT_SAMPLE_WINDOW) for p in PRIORITY_NAMES}
+        self._completed = 0
+        self._coalesced = 0
+
+    def submit(self, session, request_id: str, pack_id: str, text: str, emotion_config: dict,
+               params: dict, priority: int, streaming: bool = False) -> bool:
+        key = make_job_key(pack_id, text, emotion_config, dict(params or {}, stream=streaming))
+        waiter = JobWaiter(session=session, request_id=request_id)
+
+        existing = self._by_key.get(key)
+        if existing and not (existing.streaming and existing.started_at is not None):
+            existing.waiters.append(waiter)
+            self._coalesced += 1
+            if priority < existing.priority and existing.started_at is None:
+                self._requeue(existing, priority)
+            logger.info(f"Coalesced request {request_id} into pending job for pack {pack_id} "
+                        f"({len(existing.waiters)} waiters)")
+            return True
+
+        job = SynthesisJob(
+            key=key, pack_id=pack_id, client_id=session.client_id, priority=priority,
+            text=text, emotion_config=emotion_config, params=params, streaming=streaming,
+            waiters=[waiter]
+        )
+        self._by_key[key] = job
+        self._enqueue(job)
+        self._pump()
+        return False
+
+    def seal(self, job: SynthesisJob):
+        # Called once a job's result is being delivered; later identical requests start a new job
+        # instead of joining a waiter list that has already been read
+        if self._by_key.get(job.key) is job:
+            del self._by_key[job.key]
+
+    def remove_client(self, client_id: str):
+        for priority, clients in self._pending.items():
+            for jobs in clients.values():
+                for job in list(jobs):
+                    job.waiters = [w for w in job.waiters if w.session.client_id != client_id]
+                    if not job.waiters:
+                        jobs.remove(job)
+                        self._by_key.pop(job.key, None)
+            for cid in [c for c, jobs in clients.items() if not jobs]:
+                del clients[cid]
+                try:
+                    self._rotation[priority].remove(cid)
+                except ValueError:
+                    pass
+        for job in self._running.values():
+            job.waiters = [w for w in job.waiters if w.session.client_id != client_id]
+
+    def _enqueue(self, job: SynthesisJob):
+        clients = self._pending[job.priority]
+        if job.client_id not in clients:
+            clients[job.client_id] = deque()
+            self._rotation[job.priority].append(job.client_id)
+        clients[job.client_id].append(job)
+
+    def _requeue(self, job: SynthesisJob, priority: int):
+        clients = self._pending[job.priority]
+        jobs = clients.get(job.client_id)
+        if jobs is not None and job in jobs:
+            jobs.remove(job)
+            if not jobs:
+                del clients[job.client_id]
+                self._rotation[job.priority].remove(job.client_id)
+        job.priority = priority
+        self._enqueue(job)
+
+    def _peek_next(self) -> Optional[SynthesisJob]:
+        for priority in sorted(self._pending):
+            rotation = self._rotation[priority]
+            if not rotation:
+                continue
+            head = self._pending[priority][rotation[0]][0]
+            if self._is_resident is None or self._is_resident(head.pack_id) \
+                    or self._affinity_skips >= MAX_AFFINITY_SKIPS:
+                return head
+            # Batch work for packs whose weights are already loaded ahead of a weight swap
+            for client_id in rotation:
+                job = self._pending[priority][client_id][0]
+                if self._is_resident(job.pack_id):
+                    return job
+            return head
+        return None
+
+    def _pop(self, job: SynthesisJob):
+        rotation = self._rotation[job.priority]
+        clients = self._pending[job.priority]
+        if rotation[0] == job.client_id:
+            self._affinity_skips = 0
+        else:
+            self._affinity_skips += 1
+        rotation.remove(job.client_id)
+        clients[job.client_id].popleft()
+        if clients[job.client_id]:
+            rotation.append(job.client_id)
+        else:
+            del clients[job.client_id]
+
+    @staticmethod
+    def _single_pack_gate(pack_id: str, running_packs: Dict[str, int]) -> bool:
+        # One SoVITS process serves every pack, so weights may only switch once in-flight work drains
+        return all(p == pack_id for p in running_packs)
+
+    def _can_start(self, job: SynthesisJob) -> bool:
+        if self._running_packs.get(job.pack_id, 0) >= self.pack_concurrency:
+            return False
+        if not self._running:
+            return True
+        return self._pack_gate(job.pack_id, self._running_packs)
+
+    def pending_packs(self) -> Set[str]:
+        return {job.pack_id for clients in self._pending.values() for jobs in clients.values() for job in jobs}
+
+    def _pump(self):
+        while True:
+            job = self._peek_next()
+            if job is None or not self._can_start(job):
+                break
+            self._pop(job)
+            job.started_at = time.monotonic()
+            self._running_packs[job.pack_id] = self._running_packs.get(job.pack_id, 0) + 1
+            self._running[id(job)] = job
+            for waiter in job.waiters:
+                self._wait_samples[job.priority].append(job.started_at - waiter.enqueued_at)
+            task = asyncio.create_task(self._run(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        if self._on_backlog:
+            backlog = self.pending_packs()
+            if backlog:
+                self._on_backlog(backlog)
+
+    async def _run(self, job: SynthesisJob):
+        try:
+            await self._runner(job)
+        except Exception as e:
+            logger.error(f"Synthesis job for pack {job.pack_id} failed: {e}")
+        finally:
+            self._running.pop(id(job), None)
+            self.seal(job)
+            self._completed += 1
+            remaining = self._running_packs.get(job.pack_id, 1) - 1
+            if remaining > 0:
+                self._running_packs[job.pack_id] = remaining
+            else:
+                self._running_packs.pop(job.pack_id, None)
+            self._pump()
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        depth = {}
+        oldest_wait = {}
+        wait_avg = {}
+        wait_max = {}
+        for priority, name in PRIORITY_NAMES.items():
+            jobs = [job for jobs in self._pending[priority].values() for job in jobs]
+            depth[name] = len(jobs)
+            oldest_wait[name] = round(max((now - j.enqueued_at for j in jobs), default=0.0), 3)
+            samples = self._wait_samples[priority]
+            wait_avg[name] = round(sum(samples) / len(samples), 3) if samples else 0.0
+            wait_max[name] = round(max(samples), 3) if samples else 0.0
+        return {
+            "queue_depth": depth,
+            "oldest_wait_sec": oldest_wait,
+            "wait_avg_sec": wait_avg,
+            "wait_max_sec": wait_max,
+            "in_flight": len(self._running),
+            "running_packs": dict(self._running_packs),
+            "pack_concurrency": self.pack_concurrency,
+            "completed": self._completed,
+            "coalesced": self._coalesced,
+        }
@@ -137,15 +137,15 @@ Parameters: {json.dumps(payload, ensure_ascii=False, indent=2)}
         if not self._remote_handler: return False
         target_pack = pack_id or self.config.pack_manager.get_pack_json_id()
         return await self._remote_handler.ensure_connected(target_pack)
-    async def synthesize(self, text: str, emotion: str = "<E:smile>", language: Optional[str] = None, pack_id: Optional[str] = None) -> TTSResult:
+    async def synthesize(self, text: str, emotion: str = "<E:smile>", language: Optional[str] = None, pack_id: Optional[str] = None, priority: str = "interactive") -> TTSResult:
         if not self.config.sovits_enabled: return TTSResult(error="TTS is disabled")
         text = text.replace("\u30fb", " ")
         logger.info(f"[TTS] Synthesizing: {text[:30]}... ({emotion}) pack={pack_id}")
         if self._mode == "server":
-            return await self._synthesize_remote(text, emotion, language, pack_id)
+            return await self._synthesize_remote(text, emotion, language, pack_id, priority)
         return await self._synthesize_local(text, emotion, language, pack_id)
 
-    async def _synthesize_remote(self, text: str, emotion: str, language: Optional[str], pack_id: Optional[str]) -> TTSResult:
+    async def _synthesize_remote(self, text: str, emotion: str, language: Optional[str], pack_id: Optional[str], priority: str = "interactive") -> TTSResult:
         logger.info(f"[_synthesize_remote] Called with pack_id={pack_id}")
         if not self._remote_handler:
             logger.error("[_synthesize_remote] Error: Remote handler not initialized")
@@ -188,10 +188,11 @@ Parameters: {json.dumps(payload, ensure_ascii=False, indent=2)}
             "speed": float(self.config.sovits_speed),
             "text_split_method": self.config.sovits_text_split_method,
             "fragment_interval": float(self.config.sovits_fragment_interval),
-            "timeout": self.config.sovits_timeout
+            "timeout": self.config.sovits_timeout,
+            "stream": self.config.sovits_server_stream_audio
         }
 
-        result = await self._remote_handler.synthesize(text, remote_emotion_config, params, target_pack)
+        result = await self._remote_handler.synthesize(text, remote_emotion_config, params, target_pack, priority=priority)
         return result
 
     async def _synthesize_local(self, text: str, emotion: str, language: Optional[str], pack_id: Optional[str]) -> TTSResult:
@@ -7,7 +7,7 @@ import threading
 import subprocess
 import logging
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, BinaryIO
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -17,6 +17,10 @@ except ImportError:
     websockets = None
 
 from ..config import ConfigManager
+from .audio_framing import (
+    AUDIO_TRANSPORT_BASE64, AUDIO_TRANSPORT_BINARY, DEFAULT_CHUNK_SIZE, SUPPORTED_AUDIO_TRANSPORTS,
+    fix_wav_header, unpack_audio_frame
+)
 
 BROADCAST_PORT = 19876
 BROADCAST_MAGIC = "SOVITS_SERVER_ANNOUNCE"
@@ -32,6 +36,23 @@ class TTSResult:
     duration: float = 0.0
 
 
+@dataclass
+class _AudioStream:
+    path: Path
+    handle: Optional[BinaryIO] = None
+    received: int = 0
+    next_seq: int = 0
+    streaming: bool = False
+
+    def close(self):
+        if self.handle:
+            try:
+                self.handle.close()
+            except Exception:
+                pass
+            self.handle = None
+
+
 class RemoteTTSHandler:
     def __init__(self, config: ConfigManager, temp_dir: Path):
         self.config = config
@@ -51,6 +72,9 @@ class RemoteTTSHandler:
         self._discovered_server: Optional[Dict] = None
         self._discovery_socket: Optional[socket.socket] = None
         self._discovery_running = False
+        self._binary_audio = config.sovits_server_binary_audio
+        self._audio_transport = AUDIO_TRANSPORT_BASE64
+        self._audio_streams: Dict[str, _AudioStream] = {}
 
     def _start_discovery_listener(self):
         try:
@@ -144,7 +168,11 @@ class RemoteTTSHandler:
             )
             logger.info(f"Connected to server: {self.ws_url}")
 
-            await self._ws.send(json.dumps({"type": "handshake", "pack_id": pack_id}))
+            handshake = {"type": "handshake", "pack_id": pack_id}
+            if self._binary_audio:
+                handshake["audio_transports"] = SUPPORTED_AUDIO_TRANSPORTS
+                handshake["chunk_size"] = DEFAULT_CHUNK_SIZE
+            await self._ws.send(json.dumps(handshake))
 
             logger.info("Waiting for handshake_ack...")
             response = await asyncio.wait_for(self._ws.recv(), timeout=10)
@@ -155,8 +183,10 @@ class RemoteTTSHandler:
                 self._connected = True
                 self._available_packs = data.get("available_packs", [])
                 self._pack_valid = data.get("requested_pack_valid", False)
+                self._audio_transport = data.get("audio_transport", AUDIO_TRANSPORT_BASE64)
                 logger.info(
-                    f"Handshake complete. Pack valid: {self._pack_valid}, Available: {self._available_packs}"
+                    f"Handshake complete. Pack valid: {self._pack_valid}, Available: {self._available_packs}, "
+                    f"Transport: {self._audio_transport}"
                 )
 
                 self._stop_discovery_listener()
@@ -183,10 +213,16 @@ class RemoteTTSHandler:
         try:
             async for message in self._ws:
                 try:
+                    if isinstance(message, bytes):
+                        self._handle_audio_frame(message)
+                        continue
+
                     data = json.loads(message)
                     msg_type = data.get("type")
 
-                    if msg_type == "synthesize_result":
+                    if msg_type == "audio_start":
+                        self._handle_audio_start(data)
+                    elif msg_type == "synthesize_result":
                         request_id = data.get("request_id")
                         if request_id and request_id in self._pending_results:
                             future = self._pending_results.pop(request_id)
@@ -203,6 +239,30 @@ class RemoteTTSHandler:
         except Exception as e:
             logger.warning(f"Receive loop error: {e}")
             self._connected = False
+        finally:
+            for stream in self._audio_streams.values():
+                stream.close()
+
+    def _handle_audio_start(self, data: dict):
+        stream = self._audio_streams.get(data.get("request_id"))
+        if not stream:
+            return
+        stream.streaming = bool(data.get("streaming"))
+        if stream.handle is None:
+            stream.handle = open(stream.path, "wb")
+
+    def _handle_audio_frame(self, frame: bytes):
+        request_id, seq, payload = unpack_audio_frame(frame)
+        stream = self._audio_streams.get(request_id)
+        if not stream:
+            return
+        if seq != stream.next_seq:
+            logger.warning(f"Audio frame out of order for {request_id}: expected {stream.next_seq}, got {seq}")
+        stream.next_seq = seq + 1
+        if stream.handle is None:
+            stream.handle = open(stream.path, "wb")
+        stream.handle.write(payload)
+        stream.received += len(payload)
 
     async def ensure_connected(self, pack_id: str) -> bool:
         logger.info(
@@ -241,7 +301,8 @@ class RemoteTTSHandler:
         return result
 
     async def synthesize(
-        self, text: str, emotion_config: dict, params: dict, pack_id: str
+        self, text: str, emotion_config: dict, params: dict, pack_id: str,
+        priority: str = "interactive"
     ) -> TTSResult:
         logger.info(f"Synthesize called: pack_id={pack_id}, text_len={len(text)}")
         if not await self.ensure_connected(pack_id):
@@ -255,6 +316,10 @@ class RemoteTTSHandler:
         request_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
         future: asyncio.Future = asyncio.Future()
         self._pending_results[request_id] = future
+        output_path = self.temp_dir / f"remote_{request_id}.wav"
+        binary = self._audio_transport == AUDIO_TRANSPORT_BINARY
+        if binary:
+            self._audio_streams[request_id] = _AudioStream(path=output_path)
 
         payload = {
             "type": "synthesize",
@@ -263,6 +328,7 @@ class RemoteTTSHandler:
             "text": text,
             "emotion_config": emotion_config,
             "params": params,
+            "priority": priority,
         }
 
         try:
@@ -271,74 +337,31 @@ class RemoteTTSHandler:
 
             result = await asyncio.wait_for(future, timeout=params.get("timeout", 120))
 
-            if result.get("status") == "success":
-                audio_b64 = result.get("audio_data")
-                if audio_b64:
-                    audio_data = base64.b64decode(audio_b64)
-                    output_path = self.temp_dir / f"remote_{request_id}.wav"
-                    with open(output_path, "wb") as f:
-                        f.write(audio_data)
-
-                    duration = 0.0
-                    try:
-                        import soundfile as sf
-
-                        info = sf.info(str(output_path))
-                        data, sr = sf.read(str(output_path), dtype="float32")
-                        duration = len(data) / sr
-                        logger.info(
-                            f"Received audio: {len(audio_data)} bytes, duration: {duration:.2f}s, sr={sr}Hz, subtype={info.subtype}"
-                        )
-
-                        TARGET_SR = 44100
-                        if info.subtype != "PCM_16" or sr != TARGET_SR:
-                            pcm_path = str(output_path).replace(".wav", "_pcm16.wav")
-                            ffmpeg_exe = (
-                                "ffmpeg.exe" if sys.platform == "win32" else "ffmpeg"
-                            )
-                            ffmpeg_local = (
-                                self.temp_dir.parent / "ffmpeg" / "bin" / ffmpeg_exe
-                            )
-                            ffmpeg_cmd = (
-                                str(ffmpeg_local) if ffmpeg_local.exists() else "ffmpeg"
-                            )
-                            result_ffmpeg = subprocess.run(
-                                [
-                                    ffmpeg_cmd,
-                                    "-y",
-                                    "-i",
-                                    str(output_path),
-                                    "-ar",
-                                    str(TARGET_SR),
-                                    "-ac",
-                                    "1",
-                                    "-sample_fmt",
-                                    "s16",
-                                    pcm_path,
-                                ],
-                                stdout=subprocess.PIPE,
-                                stderr=subprocess.PIPE,
-                            )
-                            logger.info(
-                                f"FFmpeg resample exit={result_ffmpeg.returncode}, {sr}Hz -> {TARGET_SR}Hz PCM_16 (cmd={ffmpeg_cmd})"
-                            )
-                            if result_ffmpeg.returncode == 0:
-                                output_path = Path(pcm_path)
-                            else:
-                                logger.error(
-                                    f"FFmpeg failed: {result_ffmpeg.stderr.decode('utf-8', errors='ignore')[-200:]}"
-                                )
-                    except Exception as e:
-                        logger.error(f"Failed to process audio: {e}")
-
-                    return TTSResult(audio_path=str(output_path), duration=duration)
-                else:
-                    return TTSResult(error="No audio data in response")
-            else:
+            if result.get("status") != "success":
                 error = result.get("error", "Unknown error")
                 logger.error(f"Synthesis failed: {error}")
                 return TTSResult(error=error)
 
+            if result.get("transport") == AUDIO_TRANSPORT_BINARY:
+                stream = self._audio_streams.get(request_id)
+                if not stream or stream.received == 0:
+                    return TTSResult(error="No audio data in response")
+                stream.close()
+                if stream.streaming:
+                    fix_wav_header(output_path)
+                received = stream.received
+            else:
+                audio_b64 = result.get("audio_data")
+                if not audio_b64:
+                    return TTSResult(error="No audio data in response")
+                audio_data = base64.b64decode(audio_b64)
+                with open(output_path, "wb") as f:
+                    f.write(audio_data)
+                received = len(audio_data)
+
+            output_path, duration = await asyncio.to_thread(self._prepare_audio, output_path, received)
+            return TTSResult(audio_path=str(output_path), duration=duration)
+
         except asyncio.TimeoutError:
             self._pending_results.pop(request_id, None)
             return TTSResult(error="Request timeout")
@@ -346,6 +369,64 @@ class RemoteTTSHandler:
             self._pending_results.pop(request_id, None)
             logger.error(f"Synthesize error: {e}")
             return TTSResult(error=str(e))
+        finally:
+            stream = self._audio_streams.pop(request_id, None)
+            if stream:
+                stream.close()
+
+    def _prepare_audio(self, output_path: Path, received: int):
+        duration = 0.0
+        try:
+            import soundfile as sf
+
+            info = sf.info(str(output_path))
+            sr = info.samplerate
+            duration = info.frames / sr if sr else 0.0
+            logger.info(
+                f"Received audio: {received} bytes, duration: {duration:.2f}s, sr={sr}Hz, subtype={info.subtype}"
+            )
+
+            TARGET_SR = 44100
+            if info.subtype != "PCM_16" or sr != TARGET_SR:
+                pcm_path = str(output_path).replace(".wav", "_pcm16.wav")
+                ffmpeg_exe = (
+                    "ffmpeg.exe" if sys.platform == "win32" else "ffmpeg"
+                )
+                ffmpeg_local = (
+                    self.temp_dir.parent / "ffmpeg" / "bin" / ffmpeg_exe
+                )
+                ffmpeg_cmd = (
+                    str(ffmpeg_local) if ffmpeg_local.exists() else "ffmpeg"
+                )
+                result_ffmpeg = subprocess.run(
+                    [
+                        ffmpeg_cmd,
+                        "-y",
+                        "-i",
+                        str(output_path),
+                        "-ar",
+                        str(TARGET_SR),
+                        "-ac",
+                        "1",
+                        "-sample_fmt",
+                        "s16",
+                        pcm_path,
+                    ],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                )
+                logger.info(
+                    f"FFmpeg resample exit={result_ffmpeg.returncode}, {sr}Hz -> {TARGET_SR}Hz PCM_16 (cmd={ffmpeg_cmd})"
+                )
+                if result_ffmpeg.returncode == 0:
+                    output_path = Path(pcm_path)
+                else:
+                    logger.error(
+                        f"FFmpeg failed: {result_ffmpeg.stderr.decode('utf-8', errors='ignore')[-200:]}"
+                    )
+        except Exception as e:
+            logger.error(f"Failed to process audio: {e}")
+        return output_path, duration
 
     async def get_available_packs(self) -> List[str]:
         if not await self.ensure_connected(""):
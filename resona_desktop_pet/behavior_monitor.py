@@ -4,17 +4,113 @@ import random
 import ctypes
 import psutil
 import logging
+import threading
 import ctypes.wintypes
 from pathlib import Path
 from typing import Optional
-from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from PySide6.QtCore import QThread, Signal
+from .trigger_engine import TriggerEngine, TriggerContext
 
 logger = logging.getLogger("Behavior")
+
+# Sampling period of each probe in multiples of behavior_interval, and the trigger sensors it feeds.
+# Probes that no loaded trigger reads are skipped entirely.
+PROBE_PERIODS = {"window": 1, "url": 2, "process": 2, "hw": 3, "clipboard": 1, "music": 2, "plugins": 1}
+PROBE_SENSORS = {"window": {"window"}, "url": {"url"}, "process": {"process", "uptime"}, "hw": {"hw"},
+                 "clipboard": {"clipboard"}, "music": {"music"}}
+IDLE_BACKOFF_SEC = 60.0
+BACKOFF_FACTOR = 4
+BURST_DURATION = 5.0
+BURST_INTERVAL = 0.25
+# Only the cheap probes follow a focus change at the burst rate, and only when a trigger reads them;
+# hardware, clipboard and the UIAutomation URL lookup keep their periods
+BURST_PROBES = {"window", "process"}
+# Plugin check_status calls run off the sampling thread; a plugin may override the timeout via INFO["poll_timeout"]
+PLUGIN_WORKERS = 4
+PLUGIN_TIMEOUT = 2.0
+MUSIC_PROCESS = "cloudmusic.exe"
+MUSIC_RESCAN_TTL = 5.0
 class WindowInfo:
     def __init__(self, hwnd, pid, title, process_name, rect, url=None):
         self.hwnd = hwnd; self.pid = pid; self.title = title
         self.process_name = process_name.lower(); self.rect = rect; self.url = url
+class ProcessTracker:
+    # Diffs the PID set between cycles so only processes that appeared since the last refresh are
+    # queried; exited processes keep their start/stop times for `retention` seconds.
+    def __init__(self, retention: float = 1800.0):
+        self.retention = retention
+        self.records = {}
+        self.by_name = {}
+        self.alive = set()
+        self._stopped = deque()
+        self.last_started = 0
+        self.last_stopped = 0
+        self.version = 0
+
+    def refresh(self, now: Optional[float] = None):
+        now = now if now is not None else time.time()
+        current = set(psutil.pids())
+        started = current - self.alive
+        stopped = self.alive - current
+        for pid in stopped:
+            record = self.records.get(pid)
+            if record is None:
+                continue
+            record["stop_time"] = now
+            self._unindex(pid, record["name"])
+            self._stopped.append((now, pid))
+        for pid in started:
+            try:
+                proc = psutil.Process(pid)
+                with proc.oneshot():
+                    name = proc.name().lower()
+                    start_time = proc.create_time()
+            except (psutil.Error, OSError, OverflowError):
+                # Left in the alive set so inaccessible processes are not re-queried every cycle
+                continue
+            old = self.records.get(pid)
+            if old is not None and old["stop_time"] is None:
+                self._unindex(pid, old["name"])
+            self.records[pid] = {"name": name, "start_time": start_time, "stop_time": None}
+            self.by_name.setdefault(name, set()).add(pid)
+        self.alive = current
+        self.last_started, self.last_stopped = len(started), len(stopped)
+        if started or stopped:
+            self.version += 1
+        self._purge(now)
+
+    def _unindex(self, pid: int, name: str):
+        pids = self.by_name.get(name)
+        if pids is None:
+            return
+        pids.discard(pid)
+        if not pids:
+            del self.by_name[name]
+
+    def _purge(self, now: float):
+        cutoff = now - self.retention
+        while self._stopped and self._stopped[0][0] < cutoff:
+            _, pid = self._stopped.popleft()
+            record = self.records.get(pid)
+            if record is not None and record["stop_time"] is not None and record["stop_time"] < cutoff:
+                del self.records[pid]
+
+    def names(self) -> set:
+        return set(self.by_name)
+
+    def pids_named(self, names) -> list:
+        return [pid for name in names for pid in self.by_name.get(name, ())]
+
+    def start_time(self, pid: int) -> Optional[float]:
+        record = self.records.get(pid)
+        return record["start_time"] if record else None
+
+    def oldest_start(self, name: str) -> Optional[float]:
+        starts = [self.records[pid]["start_time"] for pid in self.by_name.get(name, ())]
+        return min(starts) if starts else None
+
 class BehaviorMonitor(QThread):
     fullscreen_status_changed = Signal(bool)
     trigger_matched = Signal(list)
@@ -28,7 +124,7 @@ class BehaviorMonitor(QThread):
         self.app_start_time = time.time()
         self.global_history = {}
         self.trigger_counts = {}
-        self.pid_history = {}
+        self.processes = ProcessTracker()
         self.triggered_pids = set()
         self.rule_hit_states = {}
         self.last_cycle_idle = 0.0
@@ -38,24 +134,42 @@ class BehaviorMonitor(QThread):
         self.last_music_title = ""
         self._last_mock_data = {}
         self.plugin_status_cache = {}
+        self._plugin_pool = ThreadPoolExecutor(max_workers=PLUGIN_WORKERS, thread_name_prefix="plugin-poll")
+        self._plugin_inflight = {}
+        self._plugin_stats = {}
+        self._plugin_lock = threading.Lock()
         self.dropped_file_cache = None
         self._pynvml_handle = None
         self._pynvml_available = None
+        self.engine = TriggerEngine()
+        self._needed_probes = set(PROBE_PERIODS)
+        self._burst_probes = set(BURST_PROBES)
+        self._last_win_info = None
+        self._last_url = (None, None)
+        self._probe_last = {}
+        self._backoff = False
+        self._burst_until = 0.0
+        # Set from the GUI thread through on_window_visibility; widgets are not touched from this thread
+        self.window_visible = True
+        self._last_hwnd = None
+        self._last_hw_stats = {"cpu_temp": 0.0, "gpu_temp": 0.0, "cpu_usage": 0.0, "gpu_usage": 0.0}
+        self._music_hwnd = None
+        self._music_scan_at = 0.0
         self.load_triggers()
 
+    def on_window_visibility(self, visible: bool):
+        self.window_visible = visible
+
     def on_file_dropped(self, file_info: dict):
         self.dropped_file_cache = file_info
         logger.info(f"[Behavior] File dropped: name={file_info.get('name')}, ext={file_info.get('ext')}")
 
-    def _cleanup_pid_history(self, current_pids: dict):
-        now_time = time.time()
-        cutoff_time = now_time - 1800
-        dead_pids = [
-            pid for pid, info in self.pid_history.items()
-            if pid not in current_pids and info.get("last_seen", 0) < cutoff_time
-        ]
-        for pid in dead_pids:
-            del self.pid_history[pid]
+    def _refresh_processes(self):
+        self.processes.refresh()
+        self.active_processes = self.processes.names()
+        if self.processes.last_started or self.processes.last_stopped:
+            logger.debug(f"[Behavior] Process churn: +{self.processes.last_started} -{self.processes.last_stopped} "
+                         f"(tracking {len(self.processes.alive)})")
 
     def _poll_plugins(self):
         pm = self.config.pack_manager
@@ -66,25 +180,76 @@ class BehaviorMonitor(QThread):
         if not hasattr(pm, 'loaded_plugins'):
             return
 
+        # Rules read the last result each plugin delivered; a slow plugin only delays its own status
+        now = time.time()
+        for pid, module in pm.loaded_plugins.items():
+            if not hasattr(module, "check_status"):
+                continue
+            timeout = float(getattr(module, "INFO", {}).get("poll_timeout", PLUGIN_TIMEOUT))
+            with self._plugin_lock:
+                stats = self._plugin_stats.setdefault(pid, {
+                    "calls": 0, "last_ms": 0.0, "avg_ms": 0.0, "max_ms": 0.0,
+                    "timeouts": 0, "errors": 0, "overdue": False
+                })
+                started = self._plugin_inflight.get(pid)
+                if started is not None:
+                    if now - started > timeout and not stats["overdue"]:
+                        stats["overdue"] = True
+                        stats["timeouts"] += 1
+                        logger.warning(f"[Behavior] Plugin {pid} check_status exceeded {timeout:.1f}s, keeping last status")
+                        self.plugin_status_cache.setdefault(pid, (False, "timeout", 0.0))
+                    continue
+                self._plugin_inflight[pid] = now
+            try:
+                future = self._plugin_pool.submit(module.check_status)
+            except RuntimeError:
+                return
+            future.add_done_callback(lambda f, pid=pid, started=now: self._on_plugin_result(pid, started, f))
+
+    def _on_plugin_result(self, pid: str, started: float, future):
+        elapsed_ms = (time.time() - started) * 1000
+        error = None
+        try:
+            result = future.result()
+        except Exception as e:
+            error = e
+            result = (False, "error", 0.0)
+
+        with self._plugin_lock:
+            self._plugin_inflight.pop(pid, None)
+            stats = self._plugin_stats.get(pid)
+            if stats is not None:
+                stats["calls"] += 1
+                stats["last_ms"] = elapsed_ms
+                stats["avg_ms"] += (elapsed_ms - stats["avg_ms"]) / min(stats["calls"], 20)
+                stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+                stats["overdue"] = False
+                if error is not None:
+                    stats["errors"] += 1
+
+        if error is not None:
+            logger.error(f"[Behavior] Plugin {pid} check failed: {error}")
+        with self._plugin_lock:
+            self.plugin_status_cache[pid] = result
+
         current_time = time.time()
         if not hasattr(self, '_last_plugin_log_time'):
             self._last_plugin_log_time = 0
+        prev_status = getattr(self, '_prev_plugin_status', {}).get(pid)
+        if prev_status != result or (current_time - self._last_plugin_log_time) > 60:
+            if result[0]:
+                logger.info(f"[Behavior] Plugin status: {pid} = {result[1]}")
+            self._prev_plugin_status = {**getattr(self, '_prev_plugin_status', {}), pid: result}
+            self._last_plugin_log_time = current_time
 
-        for pid, module in pm.loaded_plugins.items():
-            try:
-                if hasattr(module, "check_status"):
-                    result = module.check_status()
-                    self.plugin_status_cache[pid] = result
-
-                    prev_status = getattr(self, '_prev_plugin_status', {}).get(pid)
-                    if prev_status != result or (current_time - self._last_plugin_log_time) > 60:
-                        if result[0]:
-                            logger.info(f"[Behavior] Plugin status: {pid} = {result[1]}")
-                        self._prev_plugin_status = {**getattr(self, '_prev_plugin_status', {}), pid: result}
-                        self._last_plugin_log_time = current_time
-            except Exception as e:
-                logger.error(f"[Behavior] Plugin {pid} check failed: {e}")
-                self.plugin_status_cache[pid] = (False, "error", 0.0)
+    def plugin_statuses(self) -> dict:
+        # Results land from pool threads; readers iterate this copy rather than the live dict
+        with self._plugin_lock:
+            return dict(self.plugin_status_cache)
+
+    def plugin_metrics(self) -> dict:
+        with self._plugin_lock:
+            return {pid: dict(stats, inflight=pid in self._plugin_inflight) for pid, stats in self._plugin_stats.items()}
 
     def load_triggers(self):
         resolved_triggers = self.config.pack_manager.get_resolved_triggers()
@@ -92,6 +257,7 @@ class BehaviorMonitor(QThread):
             self.triggers = resolved_triggers
             resolved_count = sum(1 for t in self.triggers for a in t.get("actions", []) if "_resolved_abs_path" in a)
             logger.info(f"[Behavior] Loaded {len(self.triggers)} triggers from pack (with {resolved_count} resolved voice files).")
+            self._compile_triggers()
             return
         
         trigger_path = self.config.pack_manager.get_path("logic", "triggers")
@@ -105,8 +271,54 @@ class BehaviorMonitor(QThread):
                 logger.error(f"[Behavior] Load failed: {e}")
         else:
             logger.error(f"[Behavior] Trigger path missing or not found: {trigger_path}")
+        self._compile_triggers()
+
+    def _compile_triggers(self):
+        plugin_map = getattr(self.config.pack_manager, 'plugin_trigger_map', {})
+        self.engine.load(self.triggers, plugin_map, self.app_start_time)
+        sensors = self.engine.sensors()
+        self._needed_probes = {probe for probe, feeds in PROBE_SENSORS.items() if sensors & feeds}
+        if any(sensor.startswith("plugin:") for sensor in sensors):
+            self._needed_probes.add("plugins")
+        if "music" in self._needed_probes:
+            # The player lookup uses the tracker's name index instead of querying each window's process
+            self._needed_probes.add("process")
+        self._burst_probes = BURST_PROBES & self._needed_probes
+        if "url" in self._needed_probes and not self.config.use_ui_automation:
+            self._needed_probes.discard("url")
+        # Fullscreen hiding reads the foreground window even when no trigger does, at the normal period
+        self._needed_probes.add("window")
+        self._probe_last = {}
+        logger.info(f"[Behavior] Compiled {len(self.engine.rules)} triggers over sensors: {sorted(sensors)}; "
+                    f"active probes: {sorted(self._needed_probes)}")
+
+    def _probe_due(self, probe: str, now: float) -> bool:
+        if probe not in self._needed_probes:
+            return False
+        if now < self._burst_until and probe in self._burst_probes:
+            period = 0.0
+        else:
+            period = PROBE_PERIODS[probe] * self.config.behavior_interval * (BACKOFF_FACTOR if self._backoff else 1)
+        # Half an interval of slack so loop jitter does not push a probe back a whole cycle
+        if now - self._probe_last.get(probe, 0.0) < period - self.config.behavior_interval / 2:
+            return False
+        self._probe_last[probe] = now
+        return True
+
+    def _update_backoff(self, idle_time: float):
+        hidden = self.is_fullscreen or not self.window_visible
+        backoff = idle_time > IDLE_BACKOFF_SEC or hidden
+        if backoff != self._backoff:
+            logger.debug(f"[Behavior] Sampling {'backed off' if backoff else 'resumed'} (idle={idle_time:.0f}s, hidden={hidden})")
+            self._backoff = backoff
+
+    def _next_sleep(self) -> float:
+        if time.time() < self._burst_until and self._burst_probes:
+            return min(self.config.behavior_interval, BURST_INTERVAL)
+        return self.config.behavior_interval
     def stop(self):
         self.running = False
+        self._plugin_pool.shutdown(wait=False, cancel_futures=True)
         self._cleanup_pynvml()
 
     def _cleanup_pynvml(self):
@@ -126,10 +338,11 @@ class BehaviorMonitor(QThread):
                     self.is_first_run = False
             except Exception as e:
                 logger.error(f"[Behavior] Loop error: {e}")
-            time.sleep(self.config.behavior_interval)
+            time.sleep(self._next_sleep())
     def _perform_checks(self, is_startup=False):
         now = time.time()
-        self._poll_plugins()
+        if self.config.debug_trigger or self._probe_due("plugins", now):
+            self._poll_plugins()
 
         if self.config.debug_trigger:
             mock_path = self.project_root / "TEMP" / "mock_data.json"
@@ -147,20 +360,7 @@ class BehaviorMonitor(QThread):
                         self.is_fullscreen = is_fs
                         self.fullscreen_status_changed.emit(is_fs)
 
-                    current_pids = {}
-                    now_time = time.time()
-                    for p in psutil.process_iter(['name', 'pid', 'create_time']):
-                        try:
-                            pid = p.info['pid']; pn = p.info['name'].lower()
-                            current_pids[pid] = pn
-                            if pid not in self.pid_history:
-                                self.pid_history[pid] = {"name": pn, "start_time": p.info['create_time'], "last_seen": now_time}
-                            else:
-                                self.pid_history[pid]["last_seen"] = now_time
-                        except Exception:
-                            continue
-                    self.active_processes = set(current_pids.values())
-                    self._cleanup_pid_history(current_pids)
+                    self._refresh_processes()
 
                     clip_text = m.get("clip_text", "")
                     clip_changed_text = clip_text if clip_text != self._last_mock_data.get("clip_text") else ""
@@ -186,34 +386,33 @@ class BehaviorMonitor(QThread):
 
                     if "plugins" in m:
                         for pid, vals in m["plugins"].items():
-                            self.plugin_status_cache[pid] = tuple(vals)
+                            with self._plugin_lock:
+                                self.plugin_status_cache[pid] = tuple(vals)
                             logger.debug(f"[Behavior] Mock plugin status: {pid} = {vals}")
                     return
                 except Exception as e:
                     logger.error(f"[Behavior] Mock data read failed: {e}")
 
         try:
-            current_pids = {}
-            now_time = time.time()
-            for p in psutil.process_iter(['name', 'pid', 'create_time']):
-                try:
-                    pid = p.info['pid']; pn = p.info['name'].lower()
-                    current_pids[pid] = pn
-                    if pid not in self.pid_history:
-                        self.pid_history[pid] = {"name": pn, "start_time": p.info['create_time'], "last_seen": now_time}
-                    else:
-                        self.pid_history[pid]["last_seen"] = now_time
-                except Exception:
-                    continue
-            self.active_processes = set(current_pids.values())
-            self._cleanup_pid_history(current_pids)
             hwnd = ctypes.windll.user32.GetForegroundWindow()
-            win_info = self._get_window_info(hwnd)
+            if hwnd != self._last_hwnd:
+                if self._last_hwnd is not None:
+                    self._burst_until = now + BURST_DURATION
+                self._last_hwnd = hwnd
             idle_time = self._get_idle_time()
-            hw_stats = self._get_hardware_stats()
-            curr_clip = self._get_clipboard()
+            self._update_backoff(idle_time)
+            if self._probe_due("process", now):
+                self._refresh_processes()
+            if self._probe_due("window", now) or self._last_win_info is None:
+                self._last_win_info = self._get_window_info(hwnd)
+                self._fill_url(self._last_win_info, now)
+            win_info = self._last_win_info
+            if self._probe_due("hw", now):
+                self._last_hw_stats = self._get_hardware_stats()
+            hw_stats = self._last_hw_stats
+            curr_clip = self._get_clipboard() if self._probe_due("clipboard", now) else self.last_clip_text
             clip_changed_text = curr_clip if curr_clip != self.last_clip_text else ""
-            curr_music = self._get_cloudmusic_title()
+            curr_music = self._get_cloudmusic_title() if self._probe_due("music", now) else self.last_music_title
             music_changed_text = curr_music if curr_music != self.last_music_title else ""
             weather = getattr(self.controller, "current_weather", {})
             if win_info:
@@ -232,233 +431,28 @@ class BehaviorMonitor(QThread):
         is_debug = self.config.debug_trigger
         is_recovering = (idle < 1.0 and self.last_cycle_idle > 1.0)
         recovery_duration = self.last_cycle_idle if is_recovering else 0.0
-        for rule in self.triggers:
-            if not rule.get("enabled", True): continue
-            if rule.get("startup_only") and not is_startup: continue
-            rule_id = str(rule.get("id", "default"))
-            gid = rule.get("trigger_group_id", rule_id)
+        ui = getattr(self.controller.main_window, "stats", {})
+        ctx = TriggerContext(self, win, idle, recovery_duration, hw, ui, clip, weather, m_date, m_time,
+                             clip_changed, music_title, music_changed, mock_uptime=mock_uptime,
+                             mock_battery=mock_battery, mock_file_drop=mock_file_drop)
+        self.engine.begin_cycle(ctx.frame())
+        for rule in self.engine.rules:
+            if not rule.enabled: continue
+            if rule.startup_only and not is_startup: continue
+            gid = rule.gid
             if not is_debug:
-                if now - self.global_history.get(gid, 0) < rule.get("cooldown", 5): continue
-                if self.trigger_counts.get(gid, 0) >= rule.get("max_triggers", 9999): continue
+                if now - self.global_history.get(gid, 0) < rule.cooldown: continue
+                if self.trigger_counts.get(gid, 0) >= rule.max_triggers: continue
                 if now - getattr(self, "_last_any_trigger_time", 0) < self.config.trigger_cooldown: continue
-            ui = getattr(self.controller.main_window, "stats", {})
-            matched = self._check_recursive_logic(rule, win, idle, recovery_duration, hw, ui, clip, weather, rule_id, m_date, m_time, clip_changed, music_title, music_changed, mock_uptime=mock_uptime, mock_battery=mock_battery, mock_file_drop=mock_file_drop)
-            if matched:
-                if not is_debug and random.random() > rule.get("probability", 1.0): continue
-                logger.info(f"[Behavior] Trigger Matched: {rule_id}")
+            if self.engine.matches(rule, ctx, self.rule_hit_states):
+                if not is_debug and random.random() > rule.probability: continue
+                logger.info(f"[Behavior] Trigger Matched: {rule.id}")
                 self.global_history[gid] = now
                 self._last_any_trigger_time = now
                 self.trigger_counts[gid] = self.trigger_counts.get(gid, 0) + 1
                 if not self.config.disable_actions:
-                    self.trigger_matched.emit(rule.get("actions", []))
+                    self.trigger_matched.emit(rule.actions)
                 break
-    def _check_recursive_logic(self, node, win, idle, recovery, hw, ui, clip, weather, rid, m_date, m_time, clip_changed, music_title, music_changed, mock_uptime=None, mock_battery=None, mock_file_drop=None, path="root") -> bool:
-        logic = node.get("logic", "AND").upper()
-        conds = node.get("conditions", [])
-        if not conds: return False
-        results = []
-        for i, c in enumerate(conds):
-            c_path = f"{path}_{i}"
-            if "logic" in c:
-                res = self._check_recursive_logic(c, win, idle, recovery, hw, ui, clip, weather, rid, m_date, m_time, clip_changed, music_title, music_changed, mock_uptime=mock_uptime, mock_battery=mock_battery, mock_file_drop=mock_file_drop, c_path=c_path)
-            else:
-                res, _ = self._evaluate_condition(c, win, idle, recovery, hw, ui, clip, weather, m_date, m_time, clip_changed, music_title, music_changed, mock_uptime=mock_uptime, mock_battery=mock_battery, mock_file_drop=mock_file_drop)
-            if logic == "CUMULATIVE":
-                if res: self.rule_hit_states.setdefault(rid, {})[c_path] = True
-                results.append(self.rule_hit_states.get(rid, {}).get(c_path, False))
-            else:
-                results.append(res)
-        if logic == "AND": return all(results)
-        if logic == "OR": return any(results)
-        if logic == "CUMULATIVE": return all(results)
-        return False
-    def _evaluate_condition(self, c, win, idle, recovery, hw, ui, clip, weather, m_date, m_time, clip_changed, music_title, music_changed, mock_uptime=None, mock_battery=None, mock_file_drop=None):
-        t = c.get("type")
-        res, pids = False, []
-        is_debug = mock_uptime is not None
-        if t == "cpu_temp": res = hw["cpu_temp"] > c.get("gt", 0)
-        elif t == "gpu_temp": res = hw["gpu_temp"] > c.get("gt", 0)
-        elif t == "cpu_usage": res = hw["cpu_usage"] > c.get("gt", 0)
-        elif t == "gpu_usage": res = hw["gpu_usage"] > c.get("gt", 0)
-        elif t in ["process_active", "process_background"]:
-            wl = [p.lower() for p in c.get("pnames", [c.get("pname", "")]) if p]
-            in_mock = m_date is not None
-            if t == "process_active":
-                targets = [win.pid] if (win and win.process_name in wl) else []
-            else:
-                targets = [pid for pid, info in self.pid_history.items() if info["name"] in wl]
-                if in_mock and win and win.process_name in wl:
-                    if win.pid not in targets:
-                        targets.append(win.pid)
-            if c.get("only_new") and not in_mock:
-                targets = [p for p in targets if self.pid_history[p]["start_time"] > self.app_start_time]
-            if targets: res, pids = True, targets
-        elif t == "clip_match":
-            in_mock = m_date is not None
-            target_text = clip_changed if not in_mock else clip
-            res = any(kw.lower() in target_text.lower() for kw in c.get("keywords", [])) if target_text else False
-        elif t == "music_match":
-            in_mock = m_date is not None
-            target_text = music_changed if (c.get("only_on_change", True) and not in_mock) else music_title
-            res = any(kw.lower() in target_text.lower() for kw in c.get("keywords", [])) if target_text else False
-        elif t == "url_match": res = any(kw.lower() in (win.url or "").lower() for kw in c.get("keywords", [])) if win else False
-        elif t == "title_match": res = any(kw.lower() in win.title.lower() for kw in c.get("keywords", [])) if win else False
-        elif t == "weather_match": res = any(kw in (weather.get("condition", "") if weather else "") for kw in c.get("keywords", []))
-        elif t == "hover_duration": res = ui.get("is_hovering") and (time.time() - ui.get("hover_start_time", 0)) > c.get("sec", 0)
-        elif t == "leave_duration": res = not ui.get("is_hovering") and (time.time() - ui.get("hover_leave_time", 0)) > c.get("sec", 0)
-        elif t == "long_press": res = ui.get("is_pressing") and (time.time() - ui.get("press_start_time", 0)) > c.get("sec", 0)
-        elif t == "click_count":
-            recent = [x for x in ui.get("last_click_times", []) if (time.time() - x) < c.get("duration", 5)]
-            res = len(recent) >= c.get("count", 1)
-        elif t == "physics_acceleration_threshold":
-            res = ui.get("physics_acceleration", 0.0) > c.get("gt", 0.0)
-        elif t == "physics_bounce_count":
-            res = ui.get("physics_bounce_count", 0) >= c.get("count", 0)
-        elif t == "physics_fall_distance":
-            res = ui.get("physics_fall_distance", 0.0) > c.get("gt", 0.0)
-        elif t == "physics_window_collision_count":
-            res = ui.get("physics_window_collision_count", 0) >= c.get("count", 0)
-        elif t == "idle_recovery": res = recovery > c.get("sec", 0)
-        elif t == "idle_duration": res = idle > c.get("sec", 0)
-        elif t == "fullscreen": res = self.is_fullscreen
-        elif t == "plugin_check" or (hasattr(self.config.pack_manager, 'plugin_trigger_map') and t in self.config.pack_manager.plugin_trigger_map):
-
-            plugin_map = getattr(self.config.pack_manager, 'plugin_trigger_map', {})
-            pid = c.get("plugin_id") or plugin_map.get(t)
-            if pid in self.plugin_status_cache:
-                status = self.plugin_status_cache[pid]
-                res = True
-                if t == "plugin_check":
-                    if "expect_bool" in c:
-                        res = res and (status[0] == c["expect_bool"])
-                    if "match_text" in c:
-                        res = res and (c["match_text"].lower() in status[1].lower())
-                    if "gt_value" in c:
-                        res = res and (status[2] > c["gt_value"])
-                    if "lt_value" in c:
-                        res = res and (status[2] < c["lt_value"])
-                else:
-
-                    res = status[0]
-                if res:
-                    logger.info(f"[Behavior] Plugin triggered: {t} -> {pid}, status={status}")
-            else:
-                res = False
-        elif t == "date_match":
-            d = m_date if m_date else datetime.now().strftime("%m-%d")
-            res = d == c.get("date", "")
-        elif t == "time_range":
-            try:
-                curr_t = m_time if m_time else datetime.now().strftime("%H:%M")
-                now_t = datetime.strptime(curr_t, "%H:%M").time()
-                s, e = c.get("range", "").split("-")
-                res = datetime.strptime(s, "%H:%M").time() <= now_t <= datetime.strptime(e, "%H:%M").time()
-            except: res = False
-        elif t == "process_uptime":
-            pname = c.get("pname", "")
-            if not pname.endswith(".exe"):
-                pname = pname + ".exe"
-            if is_debug and mock_uptime is not None:
-                uptime = mock_uptime
-                gt = c.get("gt", 0)
-                lt = c.get("lt")
-                if lt is not None:
-                    res = gt < uptime < lt
-                else:
-                    res = uptime > gt
-                if res and c.get("log", False):
-                    logger.info(f"[Behavior] Mock process uptime: {pname} running for {uptime}s")
-            else:
-                targets = [pid for pid, info in self.pid_history.items() if info["name"].lower() == pname.lower()]
-                if targets:
-                    uptime = time.time() - self.pid_history[targets[0]]["start_time"]
-                    gt = c.get("gt", 0)
-                    lt = c.get("lt")
-                    if lt is not None:
-                        res = gt < uptime < lt
-                    else:
-                        res = uptime > gt
-                    if res and c.get("log", False):
-                        logger.info(f"[Behavior] Process uptime: {pname} running for {uptime:.1f}s")
-                else:
-                    res = False
-        elif t == "battery_level":
-            if is_debug and mock_battery:
-                percent = mock_battery.get("level", 0)
-                charging = mock_battery.get("charging", False)
-                gt = c.get("gt")
-                lt = c.get("lt")
-                expect_charging = c.get("charging")
-                if expect_charging is not None:
-                    res = (charging == expect_charging) and (
-                        (gt is not None and percent > gt) if gt is not None else True
-                    ) and (
-                        (lt is not None and percent < lt) if lt is not None else True
-                    )
-                else:
-                    if gt is not None and lt is not None:
-                        res = gt < percent < lt
-                    elif gt is not None:
-                        res = percent > gt
-                    elif lt is not None:
-                        res = percent < lt
-                    else:
-                        res = True
-                if res and c.get("log", False):
-                    logger.info(f"[Behavior] Mock battery: {percent}%, charging={charging}")
-            else:
-                try:
-                    import psutil
-                    battery = psutil.sensors_battery()
-                    if battery is not None:
-                        percent = battery.percent
-                        gt = c.get("gt")
-                        lt = c.get("lt")
-                        charging = battery.power_plugged
-                        if c.get("charging") is not None:
-                            res = (charging == c["charging"]) and (
-                                (gt is not None and percent > gt) if gt is not None else True
-                            ) and (
-                                (lt is not None and percent < lt) if lt is not None else True
-                            )
-                        else:
-                            if gt is not None and lt is not None:
-                                res = gt < percent < lt
-                            elif gt is not None:
-                                res = percent > gt
-                            elif lt is not None:
-                                res = percent < lt
-                            else:
-                                res = True
-                        if res and c.get("log", False):
-                            logger.info(f"[Behavior] Battery: {percent}%, charging={charging}")
-                    else:
-                        res = False
-                except: res = False
-        elif t == "file_drop":
-            if is_debug and mock_file_drop:
-                file_ext = mock_file_drop.get("ext", "")
-                file_name = mock_file_drop.get("name", "")
-                exts = [e.lower() for e in c.get("exts", [])]
-                name_keywords = [k.lower() for k in c.get("name_keywords", [])]
-                ext_match = not exts or file_ext in exts
-                name_match = not name_keywords or any(kw in file_name.lower() for kw in name_keywords)
-                res = ext_match and name_match
-                if res and c.get("log", False):
-                    logger.info(f"[Behavior] Mock file drop matched: {file_name}")
-            elif self.dropped_file_cache:
-                file_ext = self.dropped_file_cache.get("ext", "")
-                file_name = self.dropped_file_cache.get("name", "")
-                exts = [e.lower() for e in c.get("exts", [])]
-                name_keywords = [k.lower() for k in c.get("name_keywords", [])]
-                ext_match = not exts or file_ext in exts
-                name_match = not name_keywords or any(kw in file_name.lower() for kw in name_keywords)
-                res = ext_match and name_match
-                if res and c.get("log", False):
-                    logger.info(f"[Behavior] File drop matched: {file_name}")
-            else:
-                res = False
-        return res, pids
     def _get_idle_time(self):
         class LASTINPUTINFO(ctypes.Structure):
             _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]
@@ -483,27 +477,39 @@ class BehaviorMonitor(QThread):
             buff = ctypes.create_unicode_buffer(length + 1)
             ctypes.windll.user32.GetWindowTextW(hwnd, buff, length + 1)
             rect = ctypes.wintypes.RECT(); ctypes.windll.user32.GetWindowRect(hwnd, ctypes.byref(rect))
-            url = None
-            if self.config.use_ui_automation and pname in ["chrome.exe", "msedge.exe"]:
-                try:
-                    import uiautomation as auto
-                    
-                    auto.Logger.LogToConsole = False
-                    auto.Logger.LogToFile = False
-                    
-                    if not getattr(auto.Logger, "_redirected", False):
-                        def _log_redirect(msg, color=None, writeToFile=False):
-                            if msg:
-                                logger.info(f"[UIAutomation] {msg.strip()}")
-                        auto.Logger.Write = _log_redirect
-                        auto.Logger._redirected = True
-
-                    ctrl = auto.ControlFromHandle(hwnd)
-                    edit = ctrl.EditControl(Name="地址和搜索栏") or ctrl.EditControl(Name="Address and search bar")
-                    if edit: url = edit.GetValuePattern().Value
-                except: pass
-            return WindowInfo(hwnd, pid.value, buff.value, pname, (rect.left, rect.top, rect.right, rect.bottom), url)
+            return WindowInfo(hwnd, pid.value, buff.value, pname, (rect.left, rect.top, rect.right, rect.bottom))
         except: return None
+    def _fill_url(self, info: Optional[WindowInfo], now: float):
+        # The UIAutomation lookup is the costliest probe: only url_match triggers ask for it, and it is
+        # re-read on its own period (never the burst rate) while the same browser window stays in front
+        if info is None or "url" not in self._needed_probes or info.process_name not in ["chrome.exe", "msedge.exe"]:
+            return
+        last_hwnd, last_url = self._last_url
+        if info.hwnd == last_hwnd and not self._probe_due("url", now):
+            info.url = last_url
+            return
+        self._probe_last["url"] = now
+        info.url = self._get_browser_url(info.hwnd)
+        self._last_url = (info.hwnd, info.url)
+    def _get_browser_url(self, hwnd) -> Optional[str]:
+        try:
+            import uiautomation as auto
+            
+            auto.Logger.LogToConsole = False
+            auto.Logger.LogToFile = False
+            
+            if not getattr(auto.Logger, "_redirected", False):
+                def _log_redirect(msg, color=None, writeToFile=False):
+                    if msg:
+                        logger.info(f"[UIAutomation] {msg.strip()}")
+                auto.Logger.Write = _log_redirect
+                auto.Logger._redirected = True
+
+            ctrl = auto.ControlFromHandle(hwnd)
+            edit = ctrl.EditControl(Name="地址和搜索栏") or ctrl.EditControl(Name="Address and search bar")
+            if edit: return edit.GetValuePattern().Value
+        except: pass
+        return None
     def _get_hardware_stats(self):
         stats = {"cpu_temp": 0.0, "gpu_temp": 0.0, "cpu_usage": 0.0, "gpu_usage": 0.0}
         try:
@@ -601,29 +607,59 @@ class BehaviorMonitor(QThread):
             return False
         except (OverflowError, ValueError, AttributeError):
             return False
+    @staticmethod
+    def _window_pid(hwnd) -> int:
+        pid = ctypes.c_ulong()
+        try:
+            ctypes.windll.user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+        except (OverflowError, ValueError):
+            return 0
+        return pid.value
+
+    @staticmethod
+    def _window_title(hwnd) -> str:
+        length = ctypes.windll.user32.GetWindowTextLengthW(hwnd)
+        if length <= 0:
+            return ""
+        buff = ctypes.create_unicode_buffer(length + 1)
+        ctypes.windll.user32.GetWindowTextW(hwnd, buff, length + 1)
+        return buff.value
+
     def _get_cloudmusic_title(self) -> str:
         if not self.config.monitor_music: return ""
-        title = ""
+        player_pids = self.processes.by_name.get(MUSIC_PROCESS)
+        if not player_pids:
+            self._music_hwnd = None
+            return ""
+
+        # Steady state: the pinned player window is read directly until it goes away
+        hwnd = self._music_hwnd
+        if hwnd and ctypes.windll.user32.IsWindow(hwnd) and self._window_pid(hwnd) in player_pids:
+            t = self._window_title(hwnd)
+            return t if " - " in t else ""
+        self._music_hwnd = None
+
+        now = time.time()
+        if now - self._music_scan_at < MUSIC_RESCAN_TTL:
+            return ""
+        self._music_scan_at = now
+        found = None
         def callback(hwnd, _):
-            nonlocal title
-            pid = ctypes.c_ulong()
-            try:
-                ctypes.windll.user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
-            except (OverflowError, ValueError):
+            nonlocal found
+            if self._window_pid(hwnd) not in player_pids:
                 return True
             try:
-                p = psutil.Process(pid.value)
-                if p.name().lower() == "cloudmusic.exe":
-                    length = ctypes.windll.user32.GetWindowTextLengthW(hwnd)
-                    if length > 0:
-                        buff = ctypes.create_unicode_buffer(length + 1)
-                        ctypes.windll.user32.GetWindowTextW(hwnd, buff, length + 1)
-                        t = buff.value
-                        if t and " - " in t:
-                            title = t
-                            return False
-            except: pass
+                t = self._window_title(hwnd)
+            except Exception:
+                return True
+            if t and " - " in t:
+                found = (hwnd, t)
+                return False
             return True
         EnumWindows = ctypes.WINFUNCTYPE(ctypes.c_bool, ctypes.c_int, ctypes.c_int)
         ctypes.windll.user32.EnumWindows(EnumWindows(callback), 0)
-        return title
+        if not found:
+            return ""
+        self._music_hwnd = found[0]
+        logger.debug(f"[Behavior] Pinned music player window hwnd={found[0]}")
+        return found[1]
@@ -1,3 +1,4 @@
 from .config_manager import ConfigManager
+from .config_snapshot import ConfigSnapshot, get_config_snapshot
 
-__all__ = ["ConfigManager"]
+__all__ = ["ConfigManager", "ConfigSnapshot", "get_config_snapshot"]
@@ -447,6 +447,10 @@ class ConfigManager:
     def post_busy_delay(self) -> float:
         return self.getfloat("Behavior", "post_busy_delay", 5.0)
 
+    @property
+    def sprite_cache_mb(self) -> float:
+        return max(16.0, self.getfloat("General", "sprite_cache_mb", 256.0))
+
     @property
     def idle_opacity(self) -> float:
         return self.getfloat("General", "idle_opacity", 0.8)
@@ -540,6 +544,34 @@ class ConfigManager:
     def stt_language(self) -> str:
         return self.get("STT", "language", "auto")
 
+    @property
+    def stt_workers(self) -> int:
+        return self.getint("STT", "workers", 2)
+
+    @property
+    def stt_queue_size(self) -> int:
+        return self.getint("STT", "queue_size", 8)
+
+    @property
+    def stt_vad_enabled(self) -> bool:
+        return self.getboolean("STT", "vad_enabled", True)
+
+    @property
+    def stt_vad_model(self) -> str:
+        return self.get("STT", "vad_model", "./models/stt/silero_vad.onnx")
+
+    @property
+    def stt_vad_download_url(self) -> str:
+        return self.get("STT", "vad_download_url", "https://github.com/k2-fsa/sherpa-onnx/releases/download/asr-models/silero_vad.onnx")
+
+    @property
+    def stt_vad_threshold(self) -> float:
+        return self.getfloat("STT", "vad_threshold", 0.5)
+
+    @property
+    def stt_vad_min_silence(self) -> float:
+        return self.getfloat("STT", "vad_min_silence", 0.25)
+
     @property
     def ocr_enabled(self) -> bool:
         return self.getboolean("OCR", "enabled", False)
@@ -693,6 +725,22 @@ class ConfigManager:
     def physics_refresh_rate(self) -> float:
         return self.getfloat("Physics", "refresh_rate", 0.0)
 
+    @property
+    def physics_fixed_timestep_hz(self) -> float:
+        return max(10.0, self.getfloat("Physics", "fixed_timestep_hz", 120.0))
+
+    @property
+    def physics_move_threshold(self) -> int:
+        return max(1, self.getint("Physics", "move_threshold", 1))
+
+    @property
+    def physics_window_tracking(self) -> str:
+        return self.get("Physics", "window_tracking", "events").strip().lower()
+
+    @property
+    def physics_window_refresh_interval(self) -> float:
+        return max(0.1, self.getfloat("Physics", "window_refresh_interval", 2.0))
+
     @property
     def sovits_enabled(self) -> bool:
         return self.getboolean("SoVITS", "enabled", True)
@@ -765,6 +813,14 @@ class ConfigManager:
     def sovits_server_port(self) -> int:
         return self.getint("SoVITS", "server_port", 9876)
 
+    @property
+    def sovits_server_binary_audio(self) -> bool:
+        return self.getboolean("SoVITS", "server_binary_audio", True)
+
+    @property
+    def sovits_server_stream_audio(self) -> bool:
+        return self.getboolean("SoVITS", "server_stream_audio", False)
+
     @property
     def mcp_enabled(self) -> bool:
         return self.getboolean("MCP", "enabled", False)
@@ -838,12 +894,8 @@ class ConfigManager:
         return self.getfloat("Timer", "poll_interval", 0.5)
 
     @property
-    def timer_inbox_file(self) -> str:
-        return self.get("Timer", "inbox_file", "TEMP/timer_inbox.json")
-
-    @property
-    def timer_tasks_file(self) -> str:
-        return self.get("Timer", "tasks_file", "TEMP/timer_tasks.json")
+    def timer_store_file(self) -> str:
+        return self.get("Timer", "store_file", "TEMP/timer_tasks.db")
 
     @property
     def timer_pre_synthesize(self) -> bool:
@@ -857,6 +909,18 @@ class ConfigManager:
     def timer_trigger_delay(self) -> float:
         return self.getfloat("Timer", "trigger_delay", 2.0)
 
+    @property
+    def timer_presynth_concurrency(self) -> int:
+        return self.getint("Timer", "presynth_concurrency", 2)
+
+    @property
+    def timer_presynth_lead_sec(self) -> float:
+        return self.getfloat("Timer", "presynth_lead_sec", 15.0)
+
+    @property
+    def timer_presynth_max_retries(self) -> int:
+        return self.getint("Timer", "presynth_max_retries", 3)
+
 
     @property
     def html_enabled(self) -> bool:
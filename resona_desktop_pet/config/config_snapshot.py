@@ -0,0 +1,79 @@
+import configparser
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+_snapshots: Dict[Path, "ConfigSnapshot"] = {}
+_snapshots_lock = threading.Lock()
+
+
+# Read-only view of config.cfg for helper processes such as MCP servers. Unlike ConfigManager it
+# never touches the PackManager (no pack scan, no pack overrides) and only re-parses the file
+# when its mtime changes, so it is cheap to consult on every tool call.
+class ConfigSnapshot:
+    def __init__(self, config_path: str = "config.cfg"):
+        self.config_path = Path(config_path).absolute()
+        self.config = configparser.ConfigParser(interpolation=None)
+        self._mtime_ns: Optional[int] = None
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self) -> bool:
+        try:
+            mtime_ns = os.stat(self.config_path).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        with self._lock:
+            if mtime_ns == self._mtime_ns:
+                return False
+            config = configparser.ConfigParser(interpolation=None)
+            if mtime_ns is not None:
+                config.read(self.config_path, encoding="utf-8")
+            self.config = config
+            self._mtime_ns = mtime_ns
+            return True
+
+    def get(self, section: str, key: str, fallback: Any = None) -> str:
+        val = self.config.get(section, key, fallback=None)
+        if val is None:
+            return str(fallback)
+        return val
+
+    def getint(self, section: str, key: str, fallback: int = 0) -> int:
+        try:
+            return self.config.getint(section, key, fallback=fallback)
+        except ValueError:
+            return fallback
+
+    def getfloat(self, section: str, key: str, fallback: float = 0.0) -> float:
+        try:
+            return self.config.getfloat(section, key, fallback=fallback)
+        except ValueError:
+            return fallback
+
+    def getboolean(self, section: str, key: str, fallback: bool = False) -> bool:
+        value = self.config.get(section, key, fallback=str(fallback))
+        return value.lower() in ("true", "1", "yes", "on")
+
+    def resolve_path(self, value: str) -> Path:
+        path = Path(value)
+        if not path.is_absolute():
+            path = self.config_path.parent / path
+        return path
+
+    @property
+    def timer_store_file(self) -> str:
+        return self.get("Timer", "store_file", "TEMP/timer_tasks.db")
+
+
+def get_config_snapshot(config_path: str = "config.cfg") -> ConfigSnapshot:
+    path = Path(config_path).absolute()
+    with _snapshots_lock:
+        snapshot = _snapshots.get(path)
+        if snapshot is None:
+            snapshot = ConfigSnapshot(str(path))
+            _snapshots[path] = snapshot
+            return snapshot
+    snapshot.refresh()
+    return snapshot
@@ -0,0 +1,158 @@
+import json
+import os
+import time
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("PackManager")
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+# Staleness is judged from a handful of stat() calls; between checks the catalog is trusted as is
+CATALOG_CHECK_INTERVAL = 2.0
+
+
+def mtime_ns(path: Path) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+@dataclass
+class OutfitEntry:
+    id: str
+    name: str
+    rel_path: str
+    path: Path
+    is_default: bool = False
+    declared: bool = True
+    emotions: Dict[str, Any] = field(default_factory=dict)
+    # normcased file stem -> {extension: file name}
+    files: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    available: bool = False
+
+    def sprite_file(self, sprite_name: str, extensions=IMAGE_EXTENSIONS) -> Optional[Path]:
+        found = self.files.get(os.path.normcase(sprite_name))
+        if found:
+            for ext in extensions:
+                if ext in found:
+                    return self.path / found[ext]
+        return None
+
+    def sprite_candidates(self, sprite_names, extensions=IMAGE_EXTENSIONS) -> List[Tuple[str, str]]:
+        if not isinstance(sprite_names, list):
+            sprite_names = [sprite_names]
+        valid = []
+        for name in sprite_names:
+            found = self.files.get(os.path.normcase(name))
+            ext = next((e for e in extensions if found and e in found), None)
+            if ext:
+                # Report the extension as spelled on disk so URLs built from it resolve on case-sensitive systems
+                valid.append((name, os.path.splitext(found[ext])[1]))
+        return valid
+
+
+class OutfitCatalog:
+    """Outfits of one pack with their sum.json emotion maps and sprite file listings.
+
+    Built from pack.json and the outfit directories in one pass, so answering "which outfits",
+    "which sprites for this emotion" and "where is this sprite" needs no further disk access.
+    is_stale() compares the recorded mtimes of pack.json, the sprites folder, every outfit
+    folder and its sum.json, which covers edited maps as well as added or removed images.
+    """
+
+    def __init__(self, pack_root: Path, pack_data: Dict[str, Any]):
+        self.pack_root = pack_root
+        self.outfits: Dict[str, OutfitEntry] = {}
+        self.discovered: Dict[str, OutfitEntry] = {}
+        self._mtimes: Dict[Path, Optional[int]] = {}
+        # (outfit_id, emotion) -> resolved sprite paths, filled by PackManager.resolve_sprite_path
+        self.sprite_index: Dict[Tuple[str, str], tuple] = {}
+        self._checked_at = time.monotonic()
+        self._build(pack_data)
+
+    def _watch(self, path: Path):
+        self._mtimes[path] = mtime_ns(path)
+
+    def _build(self, pack_data: Dict[str, Any]):
+        self._watch(self.pack_root / "pack.json")
+        for outfit in pack_data.get("character", {}).get("outfits", []):
+            outfit_id = outfit.get("id")
+            rel_path = outfit.get("path") or ""
+            if not outfit_id:
+                continue
+            candidate = Path(rel_path)
+            path = candidate if candidate.is_absolute() else self.pack_root / rel_path
+            entry = OutfitEntry(outfit_id, outfit.get("name", outfit_id), rel_path, path,
+                                is_default=bool(outfit.get("is_default", False)))
+            if rel_path:
+                self._load_entry(entry)
+            self.outfits[outfit_id] = entry
+
+        sprites_root = self.pack_root / "assets" / "sprites"
+        self._watch(sprites_root)
+        try:
+            folders = sorted(item for item in sprites_root.iterdir() if item.is_dir())
+        except OSError:
+            folders = []
+        for folder in folders:
+            if not (folder / "sum.json").exists():
+                continue
+            entry = OutfitEntry(folder.name, folder.name, f"assets/sprites/{folder.name}", folder, declared=False)
+            self._load_entry(entry)
+            self.discovered[folder.name] = entry
+
+    def _load_entry(self, entry: OutfitEntry):
+        self._watch(entry.path)
+        sum_path = entry.path / "sum.json"
+        self._watch(sum_path)
+        try:
+            with open(sum_path, "r", encoding="utf-8") as f:
+                entry.emotions = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.error(f"Outfit '{entry.id}': failed to read {sum_path}: {e}")
+            return
+        try:
+            with os.scandir(entry.path) as it:
+                for item in it:
+                    stem, ext = os.path.splitext(item.name)
+                    ext = ext.lower()
+                    if ext in IMAGE_EXTENSIONS and item.is_file():
+                        entry.files.setdefault(os.path.normcase(stem), {})[ext] = item.name
+        except OSError as e:
+            logger.error(f"Outfit '{entry.id}': failed to list {entry.path}: {e}")
+        entry.available = True
+
+    def is_stale(self, force: bool = False) -> bool:
+        now = time.monotonic()
+        if not force and now - self._checked_at < CATALOG_CHECK_INTERVAL:
+            return False
+        self._checked_at = now
+        return any(mtime_ns(path) != mtime for path, mtime in self._mtimes.items())
+
+    def get(self, outfit_id: str) -> Optional[OutfitEntry]:
+        return self.outfits.get(outfit_id)
+
+    def find(self, outfit_id: str) -> Optional[OutfitEntry]:
+        # A declared outfit with a usable folder wins; otherwise any assets/sprites/<id> folder with a sum.json
+        entry = self.outfits.get(outfit_id)
+        if entry and entry.available:
+            return entry
+        return self.discovered.get(outfit_id)
+
+    def for_path(self, path: Path) -> Optional[OutfitEntry]:
+        for entry in list(self.outfits.values()) + list(self.discovered.values()):
+            if entry.available and entry.path == path:
+                return entry
+        return None
+
+    def default(self) -> Optional[OutfitEntry]:
+        return next((o for o in self.outfits.values() if o.is_default), None)
+
+    def available_ids(self) -> List[str]:
+        declared = [o.id for o in self.outfits.values() if o.available]
+        return declared or list(self.discovered)
@@ -0,0 +1,65 @@
+import os
+import time
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from .outfit_catalog import CATALOG_CHECK_INTERVAL, mtime_ns
+
+logger = logging.getLogger("PackManager")
+
+
+class PackFileIndex:
+    """Every file and folder under one pack, indexed by relative path and by file name.
+
+    Replaces exists() probes and rglob() searches when resolving pack resources. A file
+    being added, removed or renamed changes its folder's mtime, so is_stale() only needs
+    to stat the folders seen during the walk.
+    """
+
+    def __init__(self, pack_root: Path):
+        self.pack_root = pack_root
+        self.paths: Dict[str, Path] = {}
+        self.by_name: Dict[str, List[Tuple[Path, float]]] = {}
+        self._dir_mtimes: Dict[str, Optional[int]] = {}
+        self._checked_at = time.monotonic()
+        self._build()
+
+    @staticmethod
+    def _key(rel_path: str) -> str:
+        return os.path.normcase(os.path.normpath(rel_path))
+
+    def _build(self):
+        root = str(self.pack_root)
+        self._dir_mtimes[root] = mtime_ns(root)
+        if self._dir_mtimes[root] is not None:
+            self.paths[self._key(".")] = self.pack_root
+        for dirpath, dirnames, filenames in os.walk(root, onerror=lambda e: logger.debug(f"Pack index: {e}")):
+            for name in dirnames:
+                full = os.path.join(dirpath, name)
+                self._dir_mtimes[full] = mtime_ns(full)
+                self.paths[self._key(os.path.relpath(full, root))] = Path(full)
+            for name in filenames:
+                full = os.path.join(dirpath, name)
+                try:
+                    mtime = os.stat(full).st_mtime
+                except OSError:
+                    mtime = 0
+                self.paths[self._key(os.path.relpath(full, root))] = Path(full)
+                self.by_name.setdefault(os.path.normcase(name), []).append((Path(full), mtime))
+        for entries in self.by_name.values():
+            entries.sort(key=lambda x: x[1], reverse=True)
+
+    def is_stale(self, force: bool = False) -> bool:
+        now = time.monotonic()
+        if not force and now - self._checked_at < CATALOG_CHECK_INTERVAL:
+            return False
+        self._checked_at = now
+        return any(mtime_ns(path) != mtime for path, mtime in self._dir_mtimes.items())
+
+    def lookup(self, rel_path: str) -> Optional[Path]:
+        return self.paths.get(self._key(rel_path))
+
+    def find(self, filename: str) -> Optional[Path]:
+        # Most recently modified match, as find_file_in_pack's rglob search picks
+        entries = self.by_name.get(os.path.normcase(filename))
+        return entries[0][0] if entries else None
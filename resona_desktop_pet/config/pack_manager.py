@@ -5,8 +5,11 @@ import importlib.util
 import random
 import configparser
 import logging
+import threading
 from pathlib import Path
 from typing import Optional, Dict, Any
+from .outfit_catalog import OutfitCatalog
+from .pack_file_index import PackFileIndex
 
 logger = logging.getLogger("PackManager")
 
@@ -25,6 +28,9 @@ class PackManager:
         self.override_config_path: Optional[Path] = None
         self._previous_pack_override: Optional[configparser.ConfigParser] = None
         self._resolved_json_cache: Dict[str, Dict[str, Any]] = {}
+        self._outfit_catalogs: Dict[str, OutfitCatalog] = {}
+        self._file_indexes: Dict[str, PackFileIndex] = {}
+        self._catalog_lock = threading.Lock()
         self._scan_packs()
 
     def _get_pack_data(self, pack_id: str) -> Dict[str, Any]:
@@ -80,7 +86,9 @@ class PackManager:
 
         self._load_override_config()
         
+        self.get_file_index(folder_name, refresh=True)
         self._preload_resolved_jsons(folder_name)
+        self.get_outfit_catalog(folder_name, refresh=True)
 
     def _preload_resolved_jsons(self, pack_id: str):
         logger.info(f"Preloading resolved JSONs for pack: {pack_id}")
@@ -507,83 +515,76 @@ class PackManager:
             except: pass
         return []
 
+    def get_outfit_catalog(self, pack_id: Optional[str] = None, refresh: bool = False) -> OutfitCatalog:
+        # Shared by the desktop UI and the web server thread
+        pack_id = pack_id or self.active_pack_id
+        with self._catalog_lock:
+            catalog = self._outfit_catalogs.get(pack_id)
+            if catalog is None or refresh or catalog.is_stale():
+                if catalog is not None:
+                    self.pack_cache.pop(pack_id, None)
+                catalog = OutfitCatalog(self.packs_dir / pack_id, self._get_pack_data(pack_id))
+                self._outfit_catalogs[pack_id] = catalog
+            return catalog
+
+    def get_file_index(self, pack_id: Optional[str] = None, refresh: bool = False) -> PackFileIndex:
+        pack_id = pack_id or self.active_pack_id
+        with self._catalog_lock:
+            index = self._file_indexes.get(pack_id)
+            if index is None or refresh or index.is_stale():
+                index = PackFileIndex(self.packs_dir / pack_id)
+                self._file_indexes[pack_id] = index
+            return index
+
     def get_character_name(self) -> str:
         return self.pack_data.get("character", {}).get("name", "Unknown")
 
     def resolve_sprite_path(self, pack_id: str, outfit_id: str, emotion: str) -> Optional[str]:
         try:
-            pack_data = self._get_pack_data(pack_id)
-            if not pack_data: return None
-            
-            outfits = pack_data.get("character", {}).get("outfits", [])
-            target_outfit = next((o for o in outfits if o.get("id") == outfit_id), None)
-            if not target_outfit:
-                target_outfit = next((o for o in outfits if o.get("is_default")), None)
-            
-            if not target_outfit: return None
-            
-            outfit_rel_path = target_outfit.get("path")
-            full_outfit_path = self.packs_dir / pack_id / outfit_rel_path
-            sum_path = full_outfit_path / "sum.json"
-            
-            if not sum_path.exists(): return None
-            
-            with open(sum_path, "r", encoding="utf-8") as f:
-                sum_data = json.load(f)
-            
-            candidates = sum_data.get(emotion, [])
-            if not candidates:
-                for k in ["<E:normal>", "<E:default>"]:
-                    if k in sum_data and sum_data[k]:
-                        candidates = sum_data[k]
-                        break
-                if not candidates and sum_data:
-                    first_key = list(sum_data.keys())[0]
-                    candidates = sum_data[first_key]
-            
-            if candidates:
-                valid_images = []
-                for image_name in candidates:
-                    for ext in [".png", ".jpg", ".jpeg"]:
-                        if (full_outfit_path / (image_name + ext)).exists():
-                            valid_images.append((image_name, ext))
-                            break
-                if valid_images:
-                    image_name, ext = random.choice(valid_images)
-                    rel_path = f"{pack_id}/{outfit_rel_path}/{image_name}{ext}"
-                    return rel_path.replace("\\", "/")
-                        
+            catalog = self.get_outfit_catalog(pack_id)
+            key = (outfit_id, emotion)
+            choices = catalog.sprite_index.get(key)
+            if choices is None:
+                choices = self._sprite_choices(pack_id, catalog, outfit_id, emotion)
+                catalog.sprite_index[key] = choices
+            if choices:
+                return random.choice(choices)
         except Exception as e:
             logger.error(f"Error resolving sprite: {e}")
         return None
 
+    def _sprite_choices(self, pack_id: str, catalog: OutfitCatalog, outfit_id: str, emotion: str) -> tuple:
+        target_outfit = catalog.get(outfit_id) or catalog.default()
+        if not target_outfit or not target_outfit.available: return ()
+        
+        outfit_rel_path = target_outfit.rel_path
+        sum_data = target_outfit.emotions
+        
+        candidates = sum_data.get(emotion, [])
+        if not candidates:
+            for k in ["<E:normal>", "<E:default>"]:
+                if k in sum_data and sum_data[k]:
+                    candidates = sum_data[k]
+                    break
+            if not candidates and sum_data:
+                first_key = list(sum_data.keys())[0]
+                candidates = sum_data[first_key]
+        
+        if not candidates: return ()
+        valid_images = target_outfit.sprite_candidates(candidates, (".png", ".jpg", ".jpeg"))
+        return tuple(f"{pack_id}/{outfit_rel_path}/{image_name}{ext}".replace("\\", "/")
+                     for image_name, ext in valid_images)
+
     def get_available_packs(self) -> list:
         if not self.packs_dir.exists(): return []
         return [d.name for d in self.packs_dir.iterdir() if d.is_dir() and (d / "pack.json").exists()]
 
     def find_file_in_pack(self, pack_id: str, filename: str) -> Optional[Path]:
-        pack_root = self.packs_dir / pack_id
-        if not pack_root.exists():
-            return None
-        
-        candidates = []
         try:
-            for file_path in pack_root.rglob(filename):
-                if file_path.is_file():
-                    try:
-                        mtime = file_path.stat().st_mtime
-                        candidates.append((file_path, mtime))
-                    except Exception:
-                        candidates.append((file_path, 0))
+            return self.get_file_index(pack_id).find(filename)
         except Exception as e:
             logger.error(f"Search error in pack '{pack_id}': {e}")
             return None
-        
-        if not candidates:
-            return None
-        
-        candidates.sort(key=lambda x: x[1], reverse=True)
-        return candidates[0][0]
 
     def resolve_model_path(self, pack_id: str, model_type: str) -> Optional[Path]:
         defined_path = self.get_path("model", model_type, pack_id)
@@ -603,18 +604,22 @@ class PackManager:
         return None
 
     def resolve_resource_path(self, pack_id: str, rel_path: str, search_extensions: list = None) -> Optional[Path]:
+        index = self.get_file_index(pack_id)
         pack_root = self.packs_dir / pack_id
-        if not pack_root.exists():
+        # Paths outside the pack are not indexed and are still checked on disk
+        inside = not os.path.isabs(rel_path) and not os.path.normpath(rel_path).startswith("..")
+        if not inside and not pack_root.exists():
             return None
+        exists = (lambda p: index.lookup(p) is not None) if inside else (lambda p: (pack_root / p).exists())
         
         standard_path = pack_root / rel_path
-        if standard_path.exists():
+        if exists(rel_path):
             return standard_path
         
         if search_extensions:
             for ext in search_extensions:
                 path_with_ext = pack_root / (rel_path + ext)
-                if path_with_ext.exists():
+                if exists(rel_path + ext):
                     return path_with_ext
         
         filename = Path(rel_path).name
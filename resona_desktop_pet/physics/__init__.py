@@ -2,5 +2,21 @@
 from .bridge import PhysicsBridge
 from .engine import PhysicsEngine
 from .env_scanner import EnvironmentScanner
+from .window_cache import (
+    WindowRectProvider,
+    PollingWindowProvider,
+    WinEventWindowProvider,
+    SyntheticWindowProvider,
+    create_window_provider,
+)
 
-__all__ = ["PhysicsBridge", "PhysicsEngine", "EnvironmentScanner"]
+__all__ = [
+    "PhysicsBridge",
+    "PhysicsEngine",
+    "EnvironmentScanner",
+    "WindowRectProvider",
+    "PollingWindowProvider",
+    "WinEventWindowProvider",
+    "SyntheticWindowProvider",
+    "create_window_provider",
+]
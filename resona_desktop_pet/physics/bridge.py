@@ -1,14 +1,21 @@
 # resona_desktop_pet/physics/bridge.py
 import time
 import sys
-import ctypes
-from PySide6.QtCore import QObject, QTimer, QPoint, QRect, Qt
+from PySide6.QtCore import QObject, QTimer, QPoint, QRect, Qt, QEvent
+from PySide6.QtGui import QGuiApplication
 from .engine import PhysicsEngine
 from .env_scanner import EnvironmentScanner
+from .window_cache import create_window_provider
+from .frame_commit import FrameCommitter
 import logging
 
 logger = logging.getLogger("Physics")
 
+# Upper bound on fixed steps per frame so a stalled event loop cannot snowball
+MAX_SUBSTEPS = 8
+# Moving or resizing the pet window from outside wakes a sleeping body
+WAKE_EVENTS = (QEvent.Type.Move, QEvent.Type.Resize, QEvent.Type.Show)
+
 class PhysicsBridge(QObject):
     def __init__(self, target_window, config):
         super().__init__(target_window)
@@ -40,11 +47,24 @@ class PhysicsBridge(QObject):
         self.fall_distance = 0.0
         self.last_window_pos = self.target.pos()
         self.still_ticks = 0
+        self._last_target = None
+        self.committer = FrameCommitter(self.target, self.config)
+        self.window_provider = create_window_provider(self.config, self)
+        self.window_provider.changed.connect(self.wake)
+
+        self.fixed_dt = 1.0 / self.config.physics_fixed_timestep_hz
+        self._accumulator = 0.0
+        self.asleep = False
 
         self.timer = QTimer(self)
         self.timer.timeout.connect(self._on_tick)
         self._start_timer()
 
+        self.target.installEventFilter(self)
+        screen = QGuiApplication.primaryScreen()
+        if screen:
+            screen.availableGeometryChanged.connect(self.wake)
+
     def _start_timer(self):
         refresh_rate = self.config.physics_refresh_rate
         if refresh_rate <= 0:
@@ -54,6 +74,27 @@ class PhysicsBridge(QObject):
         interval = max(1, interval)
         self.timer.start(interval)
 
+    def eventFilter(self, obj, event):
+        if obj is self.target and self.asleep and event.type() in WAKE_EVENTS:
+            self.wake()
+        return False
+
+    def wake(self, *args):
+        if not self.enabled or not self.asleep:
+            return
+        self.asleep = False
+        self.still_ticks = 0
+        self._accumulator = 0.0
+        self.last_time = time.time()
+        if not self.timer.isActive():
+            self._start_timer()
+
+    def _sleep(self):
+        # Nothing moves a resting body until a drag, an action, or the geometry around it changes
+        self.asleep = True
+        self._accumulator = 0.0
+        self.timer.stop()
+
     def _ensure_topmost(self):
         if not self.config.always_on_top or sys.platform != "win32":
             return
@@ -63,13 +104,16 @@ class PhysicsBridge(QObject):
                     self.target.setWindowFlag(Qt.WindowType.WindowStaysOnTopHint, True)
                     self.target.show()
                     self.target.raise_()
-            hwnd = self.target.winId()
-            if not isinstance(hwnd, int):
-                hwnd = int(hwnd)
-            ctypes.windll.user32.SetWindowPos(hwnd, -1, 0, 0, 0, 0, 0x0001 | 0x0002 | 0x0010 | 0x0040)
+            self.committer.request_topmost()
         except:
             pass
 
+    def frame_stats(self) -> dict:
+        stats = self.committer.stats()
+        stats["asleep"] = self.asleep
+        stats["collision_checks"] = self.engine.collision_checks
+        return stats
+
     def _get_sprite_rect(self):
         if hasattr(self.target, "get_sprite_collision_rect"):
             rect = self.target.get_sprite_collision_rect()
@@ -119,6 +163,7 @@ class PhysicsBridge(QObject):
                 self.last_pos = QPoint(sprite_rect.left(), sprite_rect.top())
         
         self.last_window_pos = actual_window_pos
+        self.committer.sync(actual_window_pos)
         is_dragging = getattr(self.target, "dragging", False)
         
         if is_dragging:
@@ -139,6 +184,8 @@ class PhysicsBridge(QObject):
             self.last_time = current_time
             self.last_window_pos = actual_window_pos
             self.last_dragging = True
+            self._accumulator = 0.0
+            self._last_target = None
             self._sync_stats(reset=True)
             return
 
@@ -151,15 +198,6 @@ class PhysicsBridge(QObject):
             
         self.last_dragging = False
 
-        self.engine.step(dt)
-
-        sleep_speed = max(0.0, float(self.config.physics_sleep_speed_threshold))
-        sleep_frames = max(1, int(self.config.physics_sleep_still_frames))
-        moving = abs(self.engine.vx) > sleep_speed or abs(self.engine.vy) > sleep_speed
-        if self.was_moving and not moving:
-            self._reset_motion_stats()
-        self.was_moving = moving
-
         screen_rect = EnvironmentScanner.get_screen_geometry(self.target)
         padding = self.config.physics_screen_padding
         if padding:
@@ -185,65 +223,77 @@ class PhysicsBridge(QObject):
         bounds_w = max(1, bounds_right_limit - bounds_left)
         bounds_h = max(1, bounds_bottom_limit - bounds_top)
         bounds_rect = QRect(bounds_left, bounds_top, bounds_w, bounds_h)
-        self.engine.resolve_bounds(bounds_rect, pet_w, pet_h)
 
+        rects = None
         if self.config.physics_collide_windows:
             ignore_hwnds = [self.target.winId()]
             controller = getattr(self.target, "controller", None)
             settings_dialog = getattr(controller, "_settings_dialog", None) if controller else None
             if settings_dialog and settings_dialog.isVisible():
                 ignore_hwnds.append(settings_dialog.winId())
-            rects = EnvironmentScanner.get_window_rects(
-                ignore_hwnds=ignore_hwnds,
+            self.window_provider.set_filters(
                 ignore_maximized=self.config.physics_ignore_maximized_windows,
                 ignore_fullscreen=self.config.physics_ignore_fullscreen_windows,
                 ignore_borderless_fullscreen=self.config.physics_ignore_borderless_fullscreen
             )
+            self.window_provider.start()
+            rects = self.window_provider.snapshot(ignore_hwnds)
+        else:
+            self.window_provider.stop()
+
+        self._accumulator += dt
+        steps = 0
+        while self._accumulator >= self.fixed_dt and steps < MAX_SUBSTEPS:
+            self.engine.step(self.fixed_dt)
+            self.engine.resolve_bounds(bounds_rect, pet_w, pet_h)
             if rects:
                 self.engine.resolve_rect_collisions(rects, pet_w, pet_h)
+            self._accumulator -= self.fixed_dt
+            steps += 1
+        if steps == MAX_SUBSTEPS:
+            self._accumulator = min(self._accumulator, self.fixed_dt)
+
+        sleep_speed = max(0.0, float(self.config.physics_sleep_speed_threshold))
+        sleep_frames = max(1, int(self.config.physics_sleep_still_frames))
+        moving = abs(self.engine.vx) > sleep_speed or abs(self.engine.vy) > sleep_speed
+        if self.was_moving and not moving:
+            self._reset_motion_stats()
+        self.was_moving = moving
 
-        new_sprite_x = int(self.engine.x)
-        new_sprite_y = int(self.engine.y)
+        # Draw between the last two fixed steps so motion stays smooth at any refresh rate
+        alpha = self._accumulator / self.fixed_dt
+        new_sprite_x = int(self.engine.prev_x + (self.engine.x - self.engine.prev_x) * alpha)
+        new_sprite_y = int(self.engine.prev_y + (self.engine.y - self.engine.prev_y) * alpha)
         
         target_x = new_sprite_x - sprite_offset.x()
         target_y = new_sprite_y - sprite_offset.y()
         new_window_pos = QPoint(target_x, target_y)
-        move_delta = new_window_pos - window_pos
+        # Compared with the previous frame's target rather than the window, which may lag it by
+        # up to the move threshold
+        move_delta = new_window_pos - (self._last_target if self._last_target is not None else window_pos)
+        self._last_target = new_window_pos
         if move_delta.manhattanLength() == 0:
             self.still_ticks += 1
         else:
             self.still_ticks = 0
 
+        at_rest = False
         if self.still_ticks >= sleep_frames and not is_dragging and not self.last_dragging:
             if abs(self.engine.vx) < sleep_speed and abs(self.engine.vy) < sleep_speed:
                 self.engine.set_velocity(0.0, 0.0)
                 self.engine.set_position(new_sprite_x, new_sprite_y)
                 self.was_moving = False
                 self._reset_motion_stats()
+                at_rest = True
 
         dy = new_sprite_y - self.last_pos.y()
         if dy > 0:
             self.fall_distance += dy
 
         if target_x != window_pos.x() or target_y != window_pos.y():
-            moved = False
-            if self.config.always_on_top and sys.platform == "win32":
-                hwnd = int(self.target.winId())
-                SWP_NOSIZE = 0x0001
-                SWP_NOACTIVATE = 0x0010
-                SWP_SHOWWINDOW = 0x0040
-                res = ctypes.windll.user32.SetWindowPos(hwnd, -1, target_x, target_y, 0, 0, SWP_NOSIZE | SWP_NOACTIVATE | SWP_SHOWWINDOW)
-                moved = bool(res)
-            if not moved:
-                self.target.move(new_window_pos)
-            
-            self.last_window_pos = new_window_pos
-            
-            if self.config.always_on_top and hasattr(self.target, "_reinforce_topmost"):
-                self.target._reinforce_topmost()
+            self.committer.move(new_window_pos)
 
         if self.config.always_on_top and hasattr(self.target, "_reinforce_topmost"):
-            self.target._reinforce_topmost()
             if hasattr(self.target, "topmost_timer") and not self.target.topmost_timer.isActive():
                 self.target.topmost_timer.start()
 
@@ -251,13 +301,21 @@ class PhysicsBridge(QObject):
         self.last_time = current_time
         self._sync_stats()
         self._ensure_topmost()
+        # One window-manager call per frame at most; a body coming to rest snaps to its exact spot
+        self.last_window_pos = self.committer.commit(force=at_rest)
+        if at_rest:
+            self._sleep()
 
     def set_enabled(self, enabled):
         self.enabled = enabled
+        self.asleep = False
+        self._accumulator = 0.0
         if enabled:
             self._reset_motion_stats()
+            self.last_time = time.time()
             if not self.timer.isActive():
                 self._start_timer()
         else:
             self.timer.stop()
+            self.window_provider.stop()
             self._reset_motion_stats()
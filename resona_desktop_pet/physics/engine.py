@@ -1,4 +1,8 @@
 # resona_desktop_pet/physics/engine.py
+from .spatial import RectGrid
+
+# Below this many rects a straight scan is cheaper than maintaining the grid
+GRID_MIN_RECTS = 8
 
 class PhysicsEngine:
     def __init__(
@@ -29,6 +33,8 @@ class PhysicsEngine:
 
         self.x = 0.0
         self.y = 0.0
+        self.prev_x = 0.0
+        self.prev_y = 0.0
         self.vx = 0.0
         self.vy = 0.0
 
@@ -38,10 +44,15 @@ class PhysicsEngine:
         self.last_accel = 0.0
         self.bounce_count = 0
         self.window_collision_count = 0
+        self.collision_checks = 0
+        self._grid = None
+        self._grid_source = None
 
     def set_position(self, x, y):
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
 
     def set_velocity(self, vx, vy):
         self.vx = vx
@@ -72,6 +83,9 @@ class PhysicsEngine:
         self.last_ay = ay
         self.last_accel = (ax * ax + ay * ay) ** 0.5
 
+        self.prev_x = self.x
+        self.prev_y = self.y
+
         self.vx += ax * dt
         self.vy += ay * dt
 
@@ -130,50 +144,87 @@ class PhysicsEngine:
             else:
                 self.vx = 0.0
 
+    def _index_for(self, rects):
+        # Window snapshots are shared lists that are only replaced when geometry changes,
+        # so identity is enough to know the grid is still valid
+        if self._grid is None or self._grid_source is not rects or len(self._grid) != len(rects):
+            self._grid = RectGrid(rects)
+            self._grid_source = rects
+        return self._grid
+
+    def _swept_box(self, pet_width, pet_height):
+        return (min(self.x, self.prev_x), min(self.y, self.prev_y),
+                max(self.x, self.prev_x) + pet_width, max(self.y, self.prev_y) + pet_height)
+
     def resolve_rect_collisions(self, rects, pet_width, pet_height):
-        for rect in rects:
-            left = rect.left()
-            top = rect.top()
-            right = rect.right() + 1
-            bottom = rect.bottom() + 1
+        self.collision_checks = 0
+        if len(rects) < GRID_MIN_RECTS:
+            for rect in rects:
+                self.collision_checks += 1
+                self._collide_box((rect.left(), rect.top(), rect.right() + 1, rect.bottom() + 1),
+                                  pet_width, pet_height)
+            return
 
-            if self.x >= right or self.x + pet_width <= left:
-                continue
-            if self.y >= bottom or self.y + pet_height <= top:
+        grid = self._index_for(rects)
+        boxes = grid.boxes
+        pending = grid.query(*self._swept_box(pet_width, pet_height))
+        seen = set(pending)
+        i = 0
+        # Same order and semantics as a straight scan: after a push, rects later in the list
+        # that the body now touches are merged into the remaining candidates
+        while i < len(pending):
+            index = pending[i]
+            i += 1
+            self.collision_checks += 1
+            if not self._collide_box(boxes[index], pet_width, pet_height):
                 continue
-
-            overlap_left = (self.x + pet_width) - left
-            overlap_right = right - self.x
-            overlap_top = (self.y + pet_height) - top
-            overlap_bottom = bottom - self.y
-
-            min_overlap = min(overlap_left, overlap_right, overlap_top, overlap_bottom)
-            if min_overlap == overlap_left:
-                self.x = left - pet_width
-                if self.bounce_enabled:
-                    self.vx = -abs(self.vx) * self.elasticity
-                    self.bounce_count += 1
-                else:
-                    self.vx = 0.0
-            elif min_overlap == overlap_right:
-                self.x = right
-                if self.bounce_enabled:
-                    self.vx = abs(self.vx) * self.elasticity
-                    self.bounce_count += 1
-                else:
-                    self.vx = 0.0
-            elif min_overlap == overlap_top:
-                self.y = top - pet_height
-                if self.bounce_enabled:
-                    self.vy = -abs(self.vy) * self.elasticity
-                    self.bounce_count += 1
-                else:
-                    self.vy = 0.0
+            extra = [j for j in grid.query(self.x, self.y, self.x + pet_width, self.y + pet_height)
+                     if j > index and j not in seen]
+            if extra:
+                seen.update(extra)
+                pending = pending[:i] + sorted(pending[i:] + extra)
+
+    def _collide_box(self, box, pet_width, pet_height):
+        left, top, right, bottom = box
+
+        if self.x >= right or self.x + pet_width <= left:
+            return False
+        if self.y >= bottom or self.y + pet_height <= top:
+            return False
+
+        overlap_left = (self.x + pet_width) - left
+        overlap_right = right - self.x
+        overlap_top = (self.y + pet_height) - top
+        overlap_bottom = bottom - self.y
+
+        min_overlap = min(overlap_left, overlap_right, overlap_top, overlap_bottom)
+        if min_overlap == overlap_left:
+            self.x = left - pet_width
+            if self.bounce_enabled:
+                self.vx = -abs(self.vx) * self.elasticity
+                self.bounce_count += 1
+            else:
+                self.vx = 0.0
+        elif min_overlap == overlap_right:
+            self.x = right
+            if self.bounce_enabled:
+                self.vx = abs(self.vx) * self.elasticity
+                self.bounce_count += 1
+            else:
+                self.vx = 0.0
+        elif min_overlap == overlap_top:
+            self.y = top - pet_height
+            if self.bounce_enabled:
+                self.vy = -abs(self.vy) * self.elasticity
+                self.bounce_count += 1
             else:
-                self.y = bottom
-                if self.bounce_enabled:
-                    self.vy = abs(self.vy) * self.elasticity
-                    self.bounce_count += 1
-                else:
-                    self.vy = 0.0
-            self.window_collision_count += 1
+                self.vy = 0.0
+        else:
+            self.y = bottom
+            if self.bounce_enabled:
+                self.vy = abs(self.vy) * self.elasticity
+                self.bounce_count += 1
+            else:
+                self.vy = 0.0
+        self.window_collision_count += 1
+        return True
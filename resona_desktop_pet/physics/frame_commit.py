@@ -0,0 +1,129 @@
+# resona_desktop_pet/physics/frame_commit.py
+import sys
+import time
+import ctypes
+from PySide6.QtCore import QPoint
+
+HWND_TOPMOST = -1
+SWP_NOSIZE = 0x0001
+SWP_NOMOVE = 0x0002
+SWP_NOACTIVATE = 0x0010
+SWP_SHOWWINDOW = 0x0040
+# A moving window is re-asserted as topmost by its own SetWindowPos; a still one at most this often
+TOPMOST_MIN_INTERVAL = 0.5
+
+
+class FrameCommitter:
+    """Collects a frame's window position and z-order requests and applies them with one call.
+
+    Requests made during a frame only record intent; commit() turns them into at most one
+    SetWindowPos (or QWidget.move off Windows). Moves smaller than the threshold are dropped
+    so sub-pixel drift does not reach the window manager.
+    """
+
+    def __init__(self, target, config):
+        self.target = target
+        self.config = config
+        self.position = QPoint(target.pos())
+        self._pending_pos = None
+        self._pending_topmost = False
+        self._last_topmost = 0.0
+        self._rate_start = time.time()
+        self._rate_calls = 0
+        self.calls_per_sec = 0.0
+        self.calls = 0
+        self.moves = 0
+        self.skipped_moves = 0
+        self.topmost_calls = 0
+
+    def _use_win32(self) -> bool:
+        return self.config.always_on_top and sys.platform == "win32"
+
+    def _count(self):
+        self.calls += 1
+        self._rate_calls += 1
+
+    def sync(self, pos: QPoint):
+        # The window was moved by someone else (drag, resize anchor); adopt its position
+        self.position = QPoint(pos)
+        self._pending_pos = None
+
+    def move(self, pos: QPoint):
+        self._pending_pos = QPoint(pos)
+
+    def request_topmost(self):
+        self._pending_topmost = True
+
+    def reinforce_topmost(self, force=False) -> bool:
+        if not self._use_win32():
+            return False
+        now = time.time()
+        if not force and now - self._last_topmost < TOPMOST_MIN_INTERVAL:
+            return False
+        try:
+            hwnd = int(self.target.winId())
+            ctypes.windll.user32.SetWindowPos(
+                hwnd, HWND_TOPMOST, 0, 0, 0, 0, SWP_NOSIZE | SWP_NOMOVE | SWP_NOACTIVATE | SWP_SHOWWINDOW
+            )
+        except Exception:
+            return False
+        self._count()
+        self.topmost_calls += 1
+        self._last_topmost = now
+        return True
+
+    def commit(self, force=False) -> QPoint:
+        pos = self._pending_pos
+        self._pending_pos = None
+        if pos is not None and pos != self.position:
+            threshold = max(1, self.config.physics_move_threshold)
+            delta = pos - self.position
+            if force or max(abs(delta.x()), abs(delta.y())) >= threshold:
+                self._apply_move(pos)
+            else:
+                self.skipped_moves += 1
+
+        if self._pending_topmost:
+            self._pending_topmost = False
+            self.reinforce_topmost()
+        self._roll_rate()
+        return self.position
+
+    def _apply_move(self, pos: QPoint):
+        moved = False
+        if self._use_win32():
+            try:
+                hwnd = int(self.target.winId())
+                moved = bool(ctypes.windll.user32.SetWindowPos(
+                    hwnd, HWND_TOPMOST, pos.x(), pos.y(), 0, 0, SWP_NOSIZE | SWP_NOACTIVATE | SWP_SHOWWINDOW
+                ))
+            except Exception:
+                moved = False
+            self._count()
+            if moved:
+                # Inserting after HWND_TOPMOST already re-asserts z-order
+                self._last_topmost = time.time()
+                self._pending_topmost = False
+        if not moved:
+            self.target.move(pos)
+            self._count()
+        self.moves += 1
+        self.position = QPoint(pos)
+
+    def _roll_rate(self):
+        now = time.time()
+        elapsed = now - self._rate_start
+        if elapsed >= 1.0:
+            self.calls_per_sec = self._rate_calls / elapsed
+            self._rate_calls = 0
+            self._rate_start = now
+
+    def stats(self) -> dict:
+        self._roll_rate()
+        return {
+            "calls_per_sec": self.calls_per_sec,
+            "calls": self.calls,
+            "moves": self.moves,
+            "skipped_moves": self.skipped_moves,
+            "topmost_calls": self.topmost_calls,
+        }
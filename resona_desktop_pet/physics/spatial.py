@@ -0,0 +1,44 @@
+# resona_desktop_pet/physics/spatial.py
+
+GRID_CELL_SIZE = 256
+
+
+class RectGrid:
+    """Uniform-grid broad phase over static rects.
+
+    Rects are stored as (left, top, right, bottom) with exclusive right/bottom edges,
+    matching how PhysicsEngine treats QRect. query() returns a superset of the rects
+    overlapping the box, as indices into the original list in ascending order.
+    """
+
+    def __init__(self, rects, cell_size=GRID_CELL_SIZE):
+        self.cell_size = max(1, int(cell_size))
+        self.boxes = []
+        self.cells = {}
+        for index, rect in enumerate(rects):
+            box = (rect.left(), rect.top(), rect.right() + 1, rect.bottom() + 1)
+            self.boxes.append(box)
+            cx0, cy0, cx1, cy1 = self._cell_span(*box)
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    self.cells.setdefault((cx, cy), []).append(index)
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def _cell_span(self, left, top, right, bottom):
+        size = self.cell_size
+        return int(left // size), int(top // size), int((right - 1) // size), int((bottom - 1) // size)
+
+    def query(self, left, top, right, bottom):
+        if right <= left or bottom <= top:
+            return []
+        cx0, cy0, cx1, cy1 = self._cell_span(left, top, right, bottom)
+        cells = self.cells
+        found = set()
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return sorted(found)
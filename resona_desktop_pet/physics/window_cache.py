@@ -0,0 +1,227 @@
+# resona_desktop_pet/physics/window_cache.py
+import sys
+import ctypes
+import logging
+from ctypes import wintypes
+from PySide6.QtCore import QObject, QTimer, QRect, Signal
+from .env_scanner import EnvironmentScanner
+
+logger = logging.getLogger("Physics")
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_SYSTEM_MINIMIZESTART = 0x0016
+EVENT_SYSTEM_MINIMIZEEND = 0x0017
+EVENT_OBJECT_DESTROY = 0x8001
+EVENT_OBJECT_SHOW = 0x8002
+EVENT_OBJECT_HIDE = 0x8003
+EVENT_OBJECT_LOCATIONCHANGE = 0x800B
+EVENT_OBJECT_CLOAKED = 0x8017
+EVENT_OBJECT_UNCLOAKED = 0x8018
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+OBJID_WINDOW = 0
+GA_ROOT = 2
+
+# (min, max) event ranges to hook; each range is one SetWinEventHook call
+HOOK_RANGES = [
+    (EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND),
+    (EVENT_SYSTEM_MINIMIZESTART, EVENT_SYSTEM_MINIMIZEEND),
+    (EVENT_OBJECT_DESTROY, EVENT_OBJECT_HIDE),
+    (EVENT_OBJECT_LOCATIONCHANGE, EVENT_OBJECT_LOCATIONCHANGE),
+    (EVENT_OBJECT_CLOAKED, EVENT_OBJECT_UNCLOAKED),
+]
+# Window events are folded into one update per batch so a window being dragged
+# costs one GetWindowRect per batch rather than one per event
+EVENT_BATCH_MS = 16
+DEFAULT_REFRESH_SEC = 2.0
+
+if sys.platform == "win32":
+    WinEventProc = ctypes.WINFUNCTYPE(
+        None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+        wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+    )
+else:
+    WinEventProc = None
+
+
+class WindowRectProvider(QObject):
+    """Keeps hwnd -> collision rect for the desktop so physics ticks can read it without enumerating."""
+    changed = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._windows = {}
+        self._filters = {}
+        self.version = 0
+        self._snapshot_key = None
+        self._snapshot = []
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def set_filters(self, ignore_maximized=True, ignore_fullscreen=True, ignore_borderless_fullscreen=True):
+        filters = {
+            "ignore_maximized": ignore_maximized,
+            "ignore_fullscreen": ignore_fullscreen,
+            "ignore_borderless_fullscreen": ignore_borderless_fullscreen,
+        }
+        if filters != self._filters:
+            self._filters = filters
+            self.refresh()
+
+    def refresh(self):
+        pass
+
+    def _replace(self, windows: dict):
+        if windows != self._windows:
+            self._windows = windows
+            self.version += 1
+            self.changed.emit()
+
+    def _update(self, hwnd: int, rect) -> bool:
+        if rect is None:
+            if self._windows.pop(hwnd, None) is None:
+                return False
+        elif self._windows.get(hwnd) != rect:
+            self._windows[hwnd] = rect
+        else:
+            return False
+        self.version += 1
+        return True
+
+    def snapshot(self, ignore_hwnds=None) -> list:
+        # Rebuilt only when a window changed or the ignore set did; otherwise the same list is returned
+        ignore = frozenset(int(h) for h in (ignore_hwnds or ()) if h)
+        key = (self.version, ignore)
+        if key != self._snapshot_key:
+            self._snapshot = [rect for hwnd, rect in self._windows.items() if hwnd not in ignore]
+            self._snapshot_key = key
+        return self._snapshot
+
+
+class PollingWindowProvider(WindowRectProvider):
+    """Re-enumerates the desktop on a slow timer instead of every frame."""
+
+    def __init__(self, interval_sec=DEFAULT_REFRESH_SEC, parent=None):
+        super().__init__(parent)
+        self._timer = QTimer(self)
+        self._timer.setInterval(max(50, int(interval_sec * 1000)))
+        self._timer.timeout.connect(self.refresh)
+
+    def start(self):
+        if not self._timer.isActive():
+            self.refresh()
+            self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def refresh(self):
+        try:
+            self._replace(EnvironmentScanner.enumerate_windows(**self._filters))
+        except Exception as e:
+            logger.warning(f"[Physics] Window scan failed: {e}")
+
+
+class WinEventWindowProvider(PollingWindowProvider):
+    """Updates single windows from WinEvent hooks, with a slow full rescan as a safety net.
+
+    Hooks are out-of-context, so callbacks arrive on the thread that installed them
+    (the Qt GUI thread) while it pumps messages; no locking is needed.
+    """
+
+    def __init__(self, interval_sec=DEFAULT_REFRESH_SEC, parent=None):
+        super().__init__(interval_sec, parent)
+        self._hooks = []
+        self._hook_attempted = False
+        self._callback = WinEventProc(self._on_win_event)
+        self._dirty = set()
+        self._batch_timer = QTimer(self)
+        self._batch_timer.setSingleShot(True)
+        self._batch_timer.setInterval(EVENT_BATCH_MS)
+        self._batch_timer.timeout.connect(self._apply_dirty)
+        self.event_count = 0
+
+    def start(self):
+        # start() is called every physics tick; a failed hook install is not retried, polling takes over
+        if not self._hooks and not self._hook_attempted:
+            self._hook_attempted = True
+            user32 = ctypes.windll.user32
+            user32.SetWinEventHook.restype = wintypes.HANDLE
+            user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+            for event_min, event_max in HOOK_RANGES:
+                hook = user32.SetWinEventHook(
+                    event_min, event_max, 0, self._callback, 0, 0,
+                    WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS
+                )
+                if hook:
+                    self._hooks.append(hook)
+            if not self._hooks:
+                logger.warning("[Physics] SetWinEventHook failed, falling back to polling window geometry")
+        super().start()
+
+    def stop(self):
+        super().stop()
+        self._batch_timer.stop()
+        user32 = ctypes.windll.user32
+        for hook in self._hooks:
+            user32.UnhookWinEvent(hook)
+        self._hooks = []
+        self._hook_attempted = False
+        self._dirty.clear()
+
+    def _on_win_event(self, hook, event, hwnd, id_object, id_child, thread_id, timestamp):
+        if not hwnd or id_object != OBJID_WINDOW or id_child != 0:
+            return
+        self.event_count += 1
+        self._dirty.add(int(hwnd))
+        if not self._batch_timer.isActive():
+            self._batch_timer.start()
+
+    def _apply_dirty(self):
+        dirty, self._dirty = self._dirty, set()
+        user32 = ctypes.windll.user32
+        screen_geo = EnvironmentScanner.get_screen_geometry()
+        full_geo = EnvironmentScanner._get_primary_screen_geometry()
+        changed = False
+        for hwnd in dirty:
+            rect = None
+            try:
+                if user32.IsWindow(hwnd) and user32.GetAncestor(hwnd, GA_ROOT) == hwnd:
+                    rect = EnvironmentScanner.describe_window(hwnd, screen_geo, full_geo, **self._filters)
+            except Exception as e:
+                logger.debug(f"[Physics] Window update failed for {hwnd}: {e}")
+            changed = self._update(hwnd, rect) or changed
+        if changed:
+            self.changed.emit()
+
+
+class SyntheticWindowProvider(WindowRectProvider):
+    """Scripted window layout for non-Windows runs and headless simulation."""
+
+    def __init__(self, windows=None, parent=None):
+        super().__init__(parent)
+        self._replace(dict(windows or {}))
+
+    def set_window(self, hwnd: int, rect: QRect):
+        if self._update(int(hwnd), QRect(rect)):
+            self.changed.emit()
+
+    def remove_window(self, hwnd: int):
+        if self._update(int(hwnd), None):
+            self.changed.emit()
+
+    def set_windows(self, windows: dict):
+        self._replace({int(h): QRect(r) for h, r in windows.items()})
+
+
+def create_window_provider(config, parent=None) -> WindowRectProvider:
+    interval = config.physics_window_refresh_interval
+    if sys.platform != "win32":
+        return SyntheticWindowProvider(parent=parent)
+    if config.physics_window_tracking == "poll":
+        return PollingWindowProvider(interval, parent)
+    return WinEventWindowProvider(interval, parent)
@@ -0,0 +1,422 @@
+import time
+import logging
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger("Behavior")
+
+# Sensors whose conditions depend on wall-clock time or on probes read inside the evaluator;
+# rules that use them are re-evaluated every cycle
+VOLATILE_SENSORS = frozenset({"ui", "idle", "uptime", "battery"})
+
+
+class TriggerContext:
+    def __init__(self, monitor, win, idle, recovery, hw, ui, clip, weather, m_date=None, m_time=None,
+                 clip_changed="", music_title="", music_changed="", mock_uptime=None, mock_battery=None,
+                 mock_file_drop=None):
+        self.monitor = monitor
+        self.win = win
+        self.idle = idle
+        self.recovery = recovery
+        self.hw = hw
+        self.ui = ui
+        self.clip = clip
+        self.weather = weather
+        self.m_date = m_date
+        self.m_time = m_time
+        self.clip_changed = clip_changed
+        self.music_title = music_title
+        self.music_changed = music_changed
+        self.mock_uptime = mock_uptime
+        self.mock_battery = mock_battery
+        self.mock_file_drop = mock_file_drop
+        self.in_mock = m_date is not None
+        self.is_debug = mock_uptime is not None
+        self.date = m_date if m_date else datetime.now().strftime("%m-%d")
+        self.time_str = m_time if m_time else datetime.now().strftime("%H:%M")
+        try:
+            self.time_of_day = datetime.strptime(self.time_str, "%H:%M").time()
+        except ValueError:
+            self.time_of_day = None
+        self._battery = None
+        self._battery_read = False
+
+    @property
+    def battery(self):
+        if not self._battery_read:
+            self._battery_read = True
+            try:
+                import psutil
+                self._battery = psutil.sensors_battery()
+            except Exception:
+                self._battery = None
+        return self._battery
+
+    @property
+    def file_drop(self) -> Optional[dict]:
+        if self.is_debug and self.mock_file_drop:
+            return self.mock_file_drop
+        return self.monitor.dropped_file_cache
+
+    def frame(self) -> dict:
+        win = self.win
+        drop = self.file_drop
+        frame = {
+            "hw": tuple(sorted((self.hw or {}).items())),
+            "process": self.monitor.processes.version,
+            "window": (win.pid, win.title, win.url, win.process_name) if win else None,
+            "clipboard": (self.clip, self.clip_changed),
+            "music": (self.music_title, self.music_changed),
+            "weather": (self.weather or {}).get("condition", ""),
+            "fullscreen": self.monitor.is_fullscreen,
+            "clock": (self.date, self.time_str),
+            "file_drop": tuple(sorted(drop.items())) if drop else None,
+        }
+        for pid, status in self.monitor.plugin_statuses().items():
+            frame[f"plugin:{pid}"] = status
+        return frame
+
+
+class CompiledCondition:
+    def __init__(self, ctype: str, evaluate: Callable[[TriggerContext], bool], sensors, path: str):
+        self.type = ctype
+        self.evaluate = evaluate
+        self.sensors = frozenset(sensors)
+        self.path = path
+
+
+class CompiledNode:
+    def __init__(self, logic: str, children: list, path: str):
+        self.logic = logic
+        self.children = children
+        self.path = path
+        self.sensors = frozenset().union(*(c.sensors for c in children)) if children else frozenset()
+
+
+class CompiledRule:
+    def __init__(self, rule: dict, root: CompiledNode):
+        self.rule = rule
+        self.id = str(rule.get("id", "default"))
+        self.gid = rule.get("trigger_group_id", self.id)
+        self.enabled = rule.get("enabled", True)
+        self.startup_only = bool(rule.get("startup_only"))
+        self.cooldown = rule.get("cooldown", 5)
+        self.max_triggers = rule.get("max_triggers", 9999)
+        self.probability = rule.get("probability", 1.0)
+        self.actions = rule.get("actions", [])
+        self.root = root
+        self.sensors = root.sensors
+        self.volatile = bool(self.sensors & VOLATILE_SENSORS)
+        self.evaluated_at = -1
+        self.last_result = False
+
+
+def _keywords(c: dict) -> List[str]:
+    return [str(kw).lower() for kw in c.get("keywords", [])]
+
+
+def _range_check(value, gt, lt) -> bool:
+    if gt is not None and lt is not None:
+        return gt < value < lt
+    if gt is not None:
+        return value > gt
+    if lt is not None:
+        return value < lt
+    return True
+
+
+def _battery_check(percent, charging, c: dict) -> bool:
+    gt, lt = c.get("gt"), c.get("lt")
+    if c.get("charging") is not None:
+        return charging == c["charging"] and (gt is None or percent > gt) and (lt is None or percent < lt)
+    return _range_check(percent, gt, lt)
+
+
+def _compile_condition(c: dict, path: str, plugin_map: dict, app_start_time: float) -> CompiledCondition:
+    t = c.get("type")
+
+    if t in ("cpu_temp", "gpu_temp", "cpu_usage", "gpu_usage"):
+        gt = c.get("gt", 0)
+        return CompiledCondition(t, lambda ctx: ctx.hw[t] > gt, {"hw"}, path)
+
+    if t in ("process_active", "process_background"):
+        wl = frozenset(p.lower() for p in c.get("pnames", [c.get("pname", "")]) if p)
+        only_new = bool(c.get("only_new"))
+
+        def _process(ctx):
+            win = ctx.win
+            if t == "process_active":
+                targets = [win.pid] if (win and win.process_name in wl) else []
+            else:
+                targets = ctx.monitor.processes.pids_named(wl)
+                if ctx.in_mock and win and win.process_name in wl and win.pid not in targets:
+                    targets.append(win.pid)
+            if only_new and not ctx.in_mock:
+                targets = [p for p in targets if (ctx.monitor.processes.start_time(p) or 0) > app_start_time]
+            return bool(targets)
+        sensors = {"window"} if t == "process_active" else {"process", "window"}
+        if only_new:
+            sensors.add("process")
+        return CompiledCondition(t, _process, sensors, path)
+
+    if t == "clip_match":
+        kws = _keywords(c)
+
+        def _clip(ctx):
+            target = (ctx.clip if ctx.in_mock else ctx.clip_changed).lower()
+            return any(kw in target for kw in kws) if target else False
+        return CompiledCondition(t, _clip, {"clipboard"}, path)
+
+    if t == "music_match":
+        kws = _keywords(c)
+        only_on_change = c.get("only_on_change", True)
+
+        def _music(ctx):
+            target = ctx.music_changed if (only_on_change and not ctx.in_mock) else ctx.music_title
+            target = target.lower()
+            return any(kw in target for kw in kws) if target else False
+        return CompiledCondition(t, _music, {"music"}, path)
+
+    if t == "url_match":
+        kws = _keywords(c)
+        return CompiledCondition(t, lambda ctx: any(kw in (ctx.win.url or "").lower() for kw in kws) if ctx.win else False,
+                                 {"window", "url"}, path)
+
+    if t == "title_match":
+        kws = _keywords(c)
+        return CompiledCondition(t, lambda ctx: any(kw in ctx.win.title.lower() for kw in kws) if ctx.win else False,
+                                 {"window"}, path)
+
+    if t == "weather_match":
+        kws = list(c.get("keywords", []))
+
+        def _weather(ctx):
+            condition = ctx.weather.get("condition", "") if ctx.weather else ""
+            return any(kw in condition for kw in kws)
+        return CompiledCondition(t, _weather, {"weather"}, path)
+
+    if t == "hover_duration":
+        sec = c.get("sec", 0)
+        return CompiledCondition(t, lambda ctx: bool(ctx.ui.get("is_hovering")) and (time.time() - ctx.ui.get("hover_start_time", 0)) > sec,
+                                 {"ui"}, path)
+
+    if t == "leave_duration":
+        sec = c.get("sec", 0)
+        return CompiledCondition(t, lambda ctx: not ctx.ui.get("is_hovering") and (time.time() - ctx.ui.get("hover_leave_time", 0)) > sec,
+                                 {"ui"}, path)
+
+    if t == "long_press":
+        sec = c.get("sec", 0)
+        return CompiledCondition(t, lambda ctx: bool(ctx.ui.get("is_pressing")) and (time.time() - ctx.ui.get("press_start_time", 0)) > sec,
+                                 {"ui"}, path)
+
+    if t == "click_count":
+        duration, count = c.get("duration", 5), c.get("count", 1)
+
+        def _clicks(ctx):
+            now = time.time()
+            return len([x for x in ctx.ui.get("last_click_times", []) if (now - x) < duration]) >= count
+        return CompiledCondition(t, _clicks, {"ui"}, path)
+
+    if t in ("physics_acceleration_threshold", "physics_fall_distance"):
+        key = "physics_acceleration" if t == "physics_acceleration_threshold" else "physics_fall_distance"
+        gt = c.get("gt", 0.0)
+        return CompiledCondition(t, lambda ctx: ctx.ui.get(key, 0.0) > gt, {"ui"}, path)
+
+    if t in ("physics_bounce_count", "physics_window_collision_count"):
+        count = c.get("count", 0)
+        return CompiledCondition(t, lambda ctx: ctx.ui.get(t, 0) >= count, {"ui"}, path)
+
+    if t == "idle_recovery":
+        sec = c.get("sec", 0)
+        return CompiledCondition(t, lambda ctx: ctx.recovery > sec, {"idle"}, path)
+
+    if t == "idle_duration":
+        sec = c.get("sec", 0)
+        return CompiledCondition(t, lambda ctx: ctx.idle > sec, {"idle"}, path)
+
+    if t == "fullscreen":
+        return CompiledCondition(t, lambda ctx: ctx.monitor.is_fullscreen, {"fullscreen"}, path)
+
+    if t == "plugin_check" or t in plugin_map:
+        pid = c.get("plugin_id") or plugin_map.get(t)
+        match_text = c["match_text"].lower() if "match_text" in c else None
+
+        def _plugin(ctx):
+            status = ctx.monitor.plugin_status_cache.get(pid)
+            if status is None:
+                return False
+            if t == "plugin_check":
+                res = True
+                if "expect_bool" in c:
+                    res = res and (status[0] == c["expect_bool"])
+                if match_text is not None:
+                    res = res and (match_text in status[1].lower())
+                if "gt_value" in c:
+                    res = res and (status[2] > c["gt_value"])
+                if "lt_value" in c:
+                    res = res and (status[2] < c["lt_value"])
+            else:
+                res = status[0]
+            if res:
+                logger.info(f"[Behavior] Plugin triggered: {t} -> {pid}, status={status}")
+            return res
+        return CompiledCondition(t, _plugin, {f"plugin:{pid}"}, path)
+
+    if t == "date_match":
+        date = c.get("date", "")
+        return CompiledCondition(t, lambda ctx: ctx.date == date, {"clock"}, path)
+
+    if t == "time_range":
+        try:
+            s, e = c.get("range", "").split("-")
+            start = datetime.strptime(s, "%H:%M").time()
+            end = datetime.strptime(e, "%H:%M").time()
+        except ValueError:
+            logger.warning(f"[Behavior] Invalid time_range '{c.get('range')}' at {path}")
+            return CompiledCondition(t, lambda ctx: False, set(), path)
+        return CompiledCondition(t, lambda ctx: ctx.time_of_day is not None and start <= ctx.time_of_day <= end,
+                                 {"clock"}, path)
+
+    if t == "process_uptime":
+        pname = c.get("pname", "")
+        if not pname.endswith(".exe"):
+            pname = pname + ".exe"
+        key = pname.lower()
+        gt, lt, log = c.get("gt", 0), c.get("lt"), c.get("log", False)
+
+        def _uptime(ctx):
+            if ctx.is_debug:
+                uptime = ctx.mock_uptime
+                res = gt < uptime < lt if lt is not None else uptime > gt
+                if res and log:
+                    logger.info(f"[Behavior] Mock process uptime: {pname} running for {uptime}s")
+                return res
+            start_time = ctx.monitor.processes.oldest_start(key)
+            if start_time is None:
+                return False
+            uptime = time.time() - start_time
+            res = gt < uptime < lt if lt is not None else uptime > gt
+            if res and log:
+                logger.info(f"[Behavior] Process uptime: {pname} running for {uptime:.1f}s")
+            return res
+        return CompiledCondition(t, _uptime, {"uptime"}, path)
+
+    if t == "battery_level":
+        log = c.get("log", False)
+
+        def _battery(ctx):
+            if ctx.is_debug and ctx.mock_battery:
+                percent = ctx.mock_battery.get("level", 0)
+                charging = ctx.mock_battery.get("charging", False)
+                res = _battery_check(percent, charging, c)
+                if res and log:
+                    logger.info(f"[Behavior] Mock battery: {percent}%, charging={charging}")
+                return res
+            battery = ctx.battery
+            if battery is None:
+                return False
+            res = _battery_check(battery.percent, battery.power_plugged, c)
+            if res and log:
+                logger.info(f"[Behavior] Battery: {battery.percent}%, charging={battery.power_plugged}")
+            return res
+        return CompiledCondition(t, _battery, {"battery"}, path)
+
+    if t == "file_drop":
+        exts = [e.lower() for e in c.get("exts", [])]
+        name_keywords = [k.lower() for k in c.get("name_keywords", [])]
+        log = c.get("log", False)
+
+        def _file_drop(ctx):
+            drop = ctx.file_drop
+            if not drop:
+                return False
+            file_ext = drop.get("ext", "")
+            file_name = drop.get("name", "")
+            res = (not exts or file_ext in exts) and (not name_keywords or any(kw in file_name.lower() for kw in name_keywords))
+            if res and log:
+                logger.info(f"[Behavior] {'Mock file' if ctx.is_debug and ctx.mock_file_drop else 'File'} drop matched: {file_name}")
+            return res
+        return CompiledCondition(t, _file_drop, {"file_drop"}, path)
+
+    logger.warning(f"[Behavior] Unknown condition type '{t}' at {path}")
+    return CompiledCondition(t, lambda ctx: False, set(), path)
+
+
+def _compile_node(node: dict, path: str, plugin_map: dict, app_start_time: float) -> CompiledNode:
+    children = []
+    for i, c in enumerate(node.get("conditions", [])):
+        c_path = f"{path}_{i}"
+        if "logic" in c:
+            children.append(_compile_node(c, c_path, plugin_map, app_start_time))
+        else:
+            children.append(_compile_condition(c, c_path, plugin_map, app_start_time))
+    return CompiledNode(node.get("logic", "AND").upper(), children, path)
+
+
+class TriggerEngine:
+    # Triggers are compiled once per pack load. Each cycle the monitor hands in a sensor frame;
+    # rules whose sensors did not change since their last evaluation reuse the cached result.
+    def __init__(self):
+        self.rules: List[CompiledRule] = []
+        self.rules_by_sensor: Dict[str, List[CompiledRule]] = {}
+        self._cycle = 0
+        self._frame = {}
+        self._changed_at: Dict[str, int] = {}
+        self.evaluations = 0
+
+    def load(self, triggers: list, plugin_map: Optional[dict] = None, app_start_time: float = 0.0):
+        plugin_map = plugin_map or {}
+        self.rules = [CompiledRule(rule, _compile_node(rule, "root", plugin_map, app_start_time)) for rule in triggers]
+        self.rules_by_sensor = {}
+        for rule in self.rules:
+            for sensor in rule.sensors:
+                self.rules_by_sensor.setdefault(sensor, []).append(rule)
+        self._frame = {}
+        self._changed_at = {}
+
+    def sensors(self) -> set:
+        return set(self.rules_by_sensor)
+
+    def begin_cycle(self, frame: dict) -> set:
+        self._cycle += 1
+        changed = {key for key, value in frame.items() if self._frame.get(key, object()) != value}
+        changed |= set(self._frame) - set(frame)
+        for key in changed:
+            self._changed_at[key] = self._cycle
+        self._frame = frame
+        return changed
+
+    def _is_dirty(self, rule: CompiledRule) -> bool:
+        if rule.evaluated_at < 0 or rule.volatile:
+            return True
+        return any(self._changed_at.get(s, 0) > rule.evaluated_at for s in rule.sensors)
+
+    def matches(self, rule: CompiledRule, ctx: TriggerContext, hit_states: dict) -> bool:
+        if not self._is_dirty(rule):
+            return rule.last_result
+        rule.last_result = self._eval_node(rule.root, ctx, hit_states.setdefault(rule.id, {}))
+        rule.evaluated_at = self._cycle
+        return rule.last_result
+
+    def _eval_node(self, node: CompiledNode, ctx: TriggerContext, hits: dict) -> bool:
+        if not node.children:
+            return False
+        results = []
+        for child in node.children:
+            if isinstance(child, CompiledNode):
+                res = self._eval_node(child, ctx, hits)
+            else:
+                self.evaluations += 1
+                res = bool(child.evaluate(ctx))
+            if node.logic == "CUMULATIVE":
+                if res:
+                    hits[child.path] = True
+                results.append(hits.get(child.path, False))
+            else:
+                results.append(res)
+        if node.logic in ("AND", "CUMULATIVE"):
+            return all(results)
+        if node.logic == "OR":
+            return any(results)
+        return False
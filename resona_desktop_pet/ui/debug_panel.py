@@ -6,7 +6,7 @@ from PySide6.QtWidgets import (
     QPushButton,
     QTextEdit,
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QTimer
 from ..backend.llm_backend import LLMResponse
 
 
@@ -17,12 +17,15 @@ class DebugPanel(QWidget):
         super().__init__()
         self.pack_manager = pack_manager
         self.config = config
+        self._metrics_sources = {}
         self._init_ui()
+        self._metrics_timer = QTimer(self)
+        self._metrics_timer.timeout.connect(self._refresh_metrics)
 
     def _init_ui(self):
         self.setWindowTitle("Resona Dev Control Panel")
         self.setWindowFlags(Qt.WindowType.WindowStaysOnTopHint)
-        self.setFixedSize(400, 500)
+        self.setFixedSize(400, 640)
 
         layout = QVBoxLayout()
 
@@ -82,8 +85,49 @@ class DebugPanel(QWidget):
         self.clear_btn.clicked.connect(self._on_clear)
         layout.addWidget(self.clear_btn)
 
+        layout.addWidget(QLabel("Metrics:"))
+        self.metrics_view = QTextEdit()
+        self.metrics_view.setReadOnly(True)
+        self.metrics_view.setFixedHeight(120)
+        self.metrics_view.setStyleSheet("font-family: Consolas, monospace; font-size: 11px;")
+        layout.addWidget(self.metrics_view)
+
         self.setLayout(layout)
 
+    def add_metrics_source(self, name: str, provider):
+        # provider() returns a dict of key -> value (or key -> dict) and is polled while the panel is visible
+        self._metrics_sources[name] = provider
+        if self.isVisible():
+            self._refresh_metrics()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._refresh_metrics()
+        self._metrics_timer.start(1000)
+
+    def hideEvent(self, event):
+        self._metrics_timer.stop()
+        super().hideEvent(event)
+
+    def _refresh_metrics(self):
+        lines = []
+        for name, provider in self._metrics_sources.items():
+            try:
+                data = provider() or {}
+            except Exception as e:
+                lines.append(f"[{name}] unavailable: {e}")
+                continue
+            lines.append(f"[{name}]")
+            for key, value in data.items():
+                if isinstance(value, dict):
+                    value = ", ".join(
+                        f"{k}={v:.1f}" if isinstance(v, float) else f"{k}={v}" for k, v in value.items()
+                    )
+                elif isinstance(value, float):
+                    value = f"{value:.1f}"
+                lines.append(f"  {key}: {value}")
+        self.metrics_view.setPlainText("\n".join(lines))
+
     def _on_clear(self):
         self.display_edit.clear()
         self.tts_edit.clear()
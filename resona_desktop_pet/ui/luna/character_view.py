@@ -1,17 +1,22 @@
 import json
 import random
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional
 from PySide6.QtCore import Qt, QSize, QRect, Signal
-from PySide6.QtGui import QPainter, QPaintEvent, QMouseEvent, QPixmap
+from PySide6.QtGui import QPainter, QPaintEvent, QMouseEvent, QPixmap, QImage
 from PySide6.QtWidgets import QWidget
+from .sprite_cache import SpriteCache
 import logging
 
 logger = logging.getLogger("UI")
 
+SPRITE_EXTENSIONS = (".png", ".jpg", ".webp")
+
 class CharacterView(QWidget):
     leftClicked = Signal()
     rightClicked = Signal()
+    _sprite_decoded = Signal(object, object, object)
     
     def __init__(self, parent: QWidget = None):
         super().__init__(parent)
@@ -23,14 +28,44 @@ class CharacterView(QWidget):
         self.current_outfit = "risona_outfit_00"
         self.current_emotion = "<E:smile>"
         self.emotion_map: Dict[str, List[str]] = {}
+        self._scaled_pixmap: QPixmap = QPixmap()
+        self._scaled_dpr = 1.0
+        self._sprite_name: Optional[str] = None
+        self._outfit_path: Optional[Path] = None
+        self._sprite_files: Dict[tuple, Optional[Path]] = {}
+        self._legacy_outfits: Optional[List[str]] = None
+        self.sprite_cache = SpriteCache()
+        self._preload_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sprite-preload")
+        self._preload_generation = 0
+        self._sprite_decoded.connect(self._on_sprite_decoded)
         
     def setup(self, project_root: Path, default_outfit: str = "risona_outfit_00"):
         self.project_root = project_root
         self.emotion_map = {}
         self.current_outfit = default_outfit
+        config = getattr(self.parent(), "config", None)
+        if config is not None:
+            budget = config.sprite_cache_mb
+            if self.sprite_cache.budget != int(budget * 1024 * 1024):
+                self.sprite_cache = SpriteCache(budget)
+        pack_id = self._pack_id()
+        self.sprite_cache.discard(lambda key: key[0] != pack_id)
+        self._sprite_files = {}
+        self._legacy_outfits = None
         logger.info(f"[CharacterView] Setup with outfit: {default_outfit}")
         self._load_outfit(self.current_outfit)
 
+    def _pack_id(self) -> str:
+        config = getattr(self.parent(), "config", None)
+        pack_manager = getattr(config, "pack_manager", None) if config else None
+        return getattr(pack_manager, "active_pack_id", "") if pack_manager else ""
+
+    def _outfit_catalog(self):
+        config = getattr(self.parent(), "config", None)
+        if config and hasattr(config, "pack_manager"):
+            return config.pack_manager.get_outfit_catalog()
+        return None
+
     def _resolve_pack_outfit(self, requested: str) -> str:
         try:
             config = getattr(self.parent(), "config", None)
@@ -52,27 +87,11 @@ class CharacterView(QWidget):
     def _get_outfit_path(self, outfit: str, verbose: bool = False) -> Path:
         if not self.project_root: return Path(".")
         try:
-            config = getattr(self.parent(), "config", None)
-            if config and hasattr(config, "pack_manager"):
-                pack_manager = config.pack_manager
-                pack_id = pack_manager.active_pack_id
-                pack_root = pack_manager.packs_dir / pack_id
-                outfits = pack_manager.get_info("character", {}).get("outfits", [])
-                target = next((o for o in outfits if o.get("id") == outfit), None)
-                if target:
-                    rel_path = target.get("path", "")
-                    if rel_path:
-                        candidate = Path(rel_path)
-                        outfit_path = candidate if candidate.is_absolute() else pack_root / rel_path
-                        if verbose: logger.info(f"[CharacterView] Checking pack outfit path: {outfit_path}")
-                        if outfit_path.exists() and (outfit_path / "sum.json").exists():
-                            if verbose: logger.info(f"[CharacterView] Using pack outfit path: {outfit_path}")
-                            return outfit_path
-                pack_outfit_path = pack_root / "assets" / "sprites" / outfit
-                if verbose: logger.info(f"[CharacterView] Checking pack outfit path: {pack_outfit_path}")
-                if pack_outfit_path.exists() and (pack_outfit_path / "sum.json").exists():
-                    if verbose: logger.info(f"[CharacterView] Using pack outfit path: {pack_outfit_path}")
-                    return pack_outfit_path
+            catalog = self._outfit_catalog()
+            entry = catalog.find(outfit) if catalog else None
+            if entry:
+                if verbose: logger.info(f"[CharacterView] Using pack outfit path: {entry.path}")
+                return entry.path
         except Exception as e:
             logger.error(f"[CharacterView] Error resolving outfit path: {e}")
             pass
@@ -82,44 +101,101 @@ class CharacterView(QWidget):
         if not self.project_root: return []
         outfits = set()
         try:
-            config = getattr(self.parent(), "config", None)
-            if config and hasattr(config, "pack_manager"):
-                pack_manager = config.pack_manager
-                pack_id = pack_manager.active_pack_id
-                pack_root = pack_manager.packs_dir / pack_id
-                outfit_defs = pack_manager.get_info("character", {}).get("outfits", [])
-                for outfit in outfit_defs:
-                    outfit_id = outfit.get("id")
-                    rel_path = outfit.get("path")
-                    if outfit_id and rel_path:
-                        candidate = Path(rel_path)
-                        outfit_path = candidate if candidate.is_absolute() else pack_root / rel_path
-                        if outfit_path.exists() and (outfit_path / "sum.json").exists():
-                            outfits.add(outfit_id)
-                if not outfits:
-                    pack_sprites_path = pack_root / "assets" / "sprites"
-                    if pack_sprites_path.exists():
-                        for item in pack_sprites_path.iterdir():
-                            if item.is_dir() and (item / "sum.json").exists(): outfits.add(item.name)
+            catalog = self._outfit_catalog()
+            if catalog: outfits.update(catalog.available_ids())
         except: pass
-        modes_path = self.project_root / "resona_desktop_pet" / "ui" / "assets" / "modes"
-        if modes_path.exists():
-            for item in modes_path.iterdir():
-                if item.is_dir() and (item / "sum.json").exists(): outfits.add(item.name)
+        if self._legacy_outfits is None:
+            self._legacy_outfits = []
+            modes_path = self.project_root / "resona_desktop_pet" / "ui" / "assets" / "modes"
+            if modes_path.exists():
+                for item in modes_path.iterdir():
+                    if item.is_dir() and (item / "sum.json").exists(): self._legacy_outfits.append(item.name)
+        outfits.update(self._legacy_outfits)
         return sorted(list(outfits))
 
     def _load_outfit(self, outfit: str) -> bool:
         resolved = self._resolve_pack_outfit(outfit)
         outfit_path = self._get_outfit_path(resolved, verbose=True)
         logger.info(f"[CharacterView] Loading outfit from: {outfit_path}")
-        sum_json = outfit_path / "sum.json"
-        if not sum_json.exists(): return False
+        entry = self._catalog_entry(outfit_path)
         try:
-            with open(sum_json, "r", encoding="utf-8") as f: self.emotion_map = json.load(f)
+            if entry:
+                self.emotion_map = entry.emotions
+            else:
+                sum_json = outfit_path / "sum.json"
+                if not sum_json.exists(): return False
+                with open(sum_json, "r", encoding="utf-8") as f: self.emotion_map = json.load(f)
             self.current_outfit = resolved
+            self._outfit_path = outfit_path
+            self._preload_outfit()
             return True
         except: return False
 
+    def _sprite_key(self, sprite_name: str, scale: float = 1.0, dpr: float = 1.0) -> tuple:
+        return (self._pack_id(), self.current_outfit, sprite_name, round(scale, 3), round(dpr, 3))
+
+    def _catalog_entry(self, outfit_path: Path):
+        catalog = self._outfit_catalog()
+        if catalog is None:
+            return None
+        return catalog.for_path(outfit_path)
+
+    def _find_sprite_file(self, outfit_path: Path, sprite_name: str) -> Optional[Path]:
+        entry = self._catalog_entry(outfit_path)
+        if entry:
+            return entry.sprite_file(sprite_name, SPRITE_EXTENSIONS)
+        key = (outfit_path, sprite_name)
+        if key not in self._sprite_files:
+            self._sprite_files[key] = next(
+                (p for p in (outfit_path / f"{sprite_name}{ext}" for ext in SPRITE_EXTENSIONS) if p.exists()), None
+            )
+        return self._sprite_files[key]
+
+    def _preload_outfit(self):
+        # Decode the outfit's whole emotion set off the GUI thread so later emotion changes are cache hits
+        self._preload_generation += 1
+        generation = self._preload_generation
+        outfit_path = self._outfit_path
+        names = sorted({name for sprites in self.emotion_map.values() if isinstance(sprites, list) for name in sprites})
+        dpr = self.devicePixelRatioF()
+        if outfit_path is None:
+            return
+        jobs = []
+        for name in names:
+            if self._sprite_key(name) in self.sprite_cache:
+                continue
+            path = self._find_sprite_file(outfit_path, name)
+            if path is not None:
+                jobs.append((self._sprite_key(name), self._sprite_key(name, self._scale, dpr), path))
+        if not jobs:
+            return
+        self._preload_pool.submit(self._decode_outfit, generation, jobs, self._scale, dpr)
+
+    def _decode_outfit(self, generation: int, jobs: list, scale: float, dpr: float):
+        for base_key, scaled_key, path in jobs:
+            if generation != self._preload_generation:
+                return
+            image = QImage(str(path))
+            if image.isNull():
+                continue
+            scaled = None
+            if scale != 1.0 or dpr != 1.0:
+                scaled = image.scaled(round(int(image.width() * scale) * dpr), round(int(image.height() * scale) * dpr),
+                                      Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
+                scaled.setDevicePixelRatio(dpr)
+            self._sprite_decoded.emit((generation, base_key, scaled_key), image, scaled)
+
+    def _on_sprite_decoded(self, keys, image, scaled):
+        generation, base_key, scaled_key = keys
+        if generation != self._preload_generation:
+            return
+        if base_key not in self.sprite_cache:
+            if not self.sprite_cache.put(base_key, QPixmap.fromImage(image), evict=False):
+                self._preload_generation += 1
+                return
+        if scaled is not None and scaled_key not in self.sprite_cache:
+            self.sprite_cache.put(scaled_key, QPixmap.fromImage(scaled), evict=False)
+
     def set_outfit(self, outfit: str) -> bool:
         if self._load_outfit(outfit):
             self.set_emotion(self.current_emotion)
@@ -146,19 +222,44 @@ class CharacterView(QWidget):
         return self._load_sprite(sprite_name)
 
     def _load_sprite(self, sprite_name: str) -> bool:
-        outfit_path = self._get_outfit_path(self.current_outfit)
-        for ext in [".png", ".jpg", ".webp"]:
-            sprite_path = outfit_path / f"{sprite_name}{ext}"
-            if sprite_path.exists():
-                pixmap = QPixmap(str(sprite_path))
-                if not pixmap.isNull():
-                    self._pixmap = pixmap
-                    self.updateGeometry(); self.update()
-                    return True
-        return False
+        key = self._sprite_key(sprite_name)
+        pixmap = self.sprite_cache.get(key)
+        if pixmap is None:
+            outfit_path = self._outfit_path or self._get_outfit_path(self.current_outfit)
+            sprite_path = self._find_sprite_file(outfit_path, sprite_name)
+            if sprite_path is None:
+                return False
+            pixmap = QPixmap(str(sprite_path))
+            if pixmap.isNull():
+                return False
+            self.sprite_cache.put(key, pixmap)
+        self._pixmap = pixmap
+        self._sprite_name = sprite_name
+        self._update_scaled_pixmap()
+        self.updateGeometry(); self.update()
+        return True
+
+    def _update_scaled_pixmap(self):
+        # The sprite is scaled once per (scale, device pixel ratio) so painting is a plain blit
+        dpr = self.devicePixelRatioF()
+        self._scaled_dpr = dpr
+        if self._pixmap.isNull() or self._sprite_name is None or (self._scale == 1.0 and dpr == 1.0):
+            self._scaled_pixmap = self._pixmap
+            return
+        key = self._sprite_key(self._sprite_name, self._scale, dpr)
+        scaled = self.sprite_cache.get(key)
+        if scaled is None:
+            size = self.sizeHint()
+            scaled = self._pixmap.scaled(round(size.width() * dpr), round(size.height() * dpr),
+                                         Qt.AspectRatioMode.IgnoreAspectRatio,
+                                         Qt.TransformationMode.SmoothTransformation)
+            scaled.setDevicePixelRatio(dpr)
+            self.sprite_cache.put(key, scaled)
+        self._scaled_pixmap = scaled
 
     def set_scale(self, scale: float):
         self._scale = max(0.5, min(scale, 1.0))
+        self._update_scaled_pixmap()
         self.updateGeometry(); self.update()
         
     def get_scale(self) -> float: return self._scale
@@ -173,10 +274,15 @@ class CharacterView(QWidget):
         return QRect((self.width() - tgt.width()) // 2, (self.height() - tgt.height()) // 2, tgt.width(), tgt.height())
                      
     def paintEvent(self, event: QPaintEvent):
+        if self._scaled_dpr != self.devicePixelRatioF():
+            self._update_scaled_pixmap()
         painter = QPainter(self)
-        painter.setRenderHints(QPainter.RenderHint.Antialiasing | QPainter.RenderHint.SmoothPixmapTransform, True)
         rect = self.image_rect()
-        if not self._pixmap.isNull(): painter.drawPixmap(rect, self._pixmap)
+        if not self._scaled_pixmap.isNull() and self._scaled_pixmap.deviceIndependentSize().toSize() == rect.size():
+            painter.drawPixmap(rect.topLeft(), self._scaled_pixmap)
+        elif not self._pixmap.isNull():
+            painter.setRenderHints(QPainter.RenderHint.Antialiasing | QPainter.RenderHint.SmoothPixmapTransform, True)
+            painter.drawPixmap(rect, self._pixmap)
             
     def mousePressEvent(self, event: QMouseEvent):
         if event.button() == Qt.MouseButton.LeftButton: self.leftClicked.emit()
@@ -1,13 +1,95 @@
-from PySide6.QtCore import Qt, QRect, Signal, QEvent, QObject, QTimer
-from PySide6.QtGui import QPainter, QColor, QFont, QResizeEvent, QPaintEvent, QFontDatabase, QPixmap
+from PySide6.QtCore import Qt, QRect, QPointF, Signal, QEvent, QObject, QTimer
+from PySide6.QtGui import (QPainter, QColor, QFont, QResizeEvent, QPaintEvent, QFontDatabase, QPixmap,
+                           QTextLayout, QTextOption, QPalette, QRegion)
 from PySide6.QtWidgets import QWidget, QTextEdit, QLabel, QFrame, QGraphicsDropShadowEffect
 from typing import Optional
 import os
+import time
 from pathlib import Path
 import logging
 
 logger = logging.getLogger("UI")
 
+TYPEWRITER_CHAR_SEC = 0.03
+
+
+class TypewriterLabel(QLabel):
+    """Word-wrapped plain-text label that can reveal its text progressively.
+
+    The text is laid out once per (text, font, width); revealing more characters only
+    changes the clip used to draw that layout, so no relayout happens per character.
+    """
+
+    def __init__(self, parent: QWidget = None):
+        super().__init__(parent)
+        self.setTextFormat(Qt.TextFormat.PlainText)
+        self._layout: Optional[QTextLayout] = None
+        self._layout_key = None
+        self._revealed = 0
+
+    def setText(self, text: str):
+        super().setText(text)
+        self._revealed = len(text)
+        self.update()
+
+    def set_revealed(self, count: int):
+        count = max(0, min(count, len(self.text())))
+        if count != self._revealed:
+            self._revealed = count
+            self.update()
+
+    def revealed(self) -> int:
+        return self._revealed
+
+    def _text_layout(self) -> QTextLayout:
+        rect = self.contentsRect()
+        key = (self.text(), self.font().key(), rect.width())
+        if key != self._layout_key:
+            layout = QTextLayout(self.text(), self.font())
+            option = QTextOption(self.alignment())
+            option.setWrapMode(QTextOption.WrapMode.WrapAtWordBoundaryOrAnywhere)
+            layout.setTextOption(option)
+            layout.beginLayout()
+            y = 0.0
+            while True:
+                line = layout.createLine()
+                if not line.isValid():
+                    break
+                line.setLineWidth(rect.width())
+                line.setPosition(QPointF(0, y))
+                y += line.height()
+            layout.endLayout()
+            self._layout = layout
+            self._layout_key = key
+        return self._layout
+
+    def paintEvent(self, event: QPaintEvent):
+        text = self.text()
+        if not text or self._revealed <= 0:
+            return
+        layout = self._text_layout()
+        origin = QPointF(self.contentsRect().topLeft())
+        painter = QPainter(self)
+        painter.setPen(self.palette().color(QPalette.ColorRole.WindowText))
+        if self._revealed >= len(text):
+            layout.draw(painter, origin)
+            return
+
+        clip = QRegion()
+        for i in range(layout.lineCount()):
+            line = layout.lineAt(i)
+            start = line.textStart()
+            if start >= self._revealed:
+                break
+            rect = line.naturalTextRect().translated(origin)
+            if start + line.textLength() > self._revealed:
+                x = line.cursorToX(self._revealed)
+                x = x[0] if isinstance(x, tuple) else x
+                rect.setRight(origin.x() + x)
+            clip = clip.united(rect.toAlignedRect())
+        painter.setClipRegion(clip)
+        layout.draw(painter, origin)
+
 class IOOverlay(QWidget):
 
 
@@ -23,6 +105,9 @@ class IOOverlay(QWidget):
         self._loaded_font_path = None
         self._dialog_bg_pixmap: Optional[QPixmap] = None
         self._dialog_bg_path: Optional[str] = None
+        self._dialog_bg_scaled: Optional[QPixmap] = None
+        self._dialog_bg_scaled_key = None
+        self._paint_state: Optional[dict] = None
         self._cached_offsets: Optional[dict] = None
         self.user_name = "User"
         self.char_name = "Resona"
@@ -33,6 +118,7 @@ class IOOverlay(QWidget):
         self.typing_timer.timeout.connect(self._type_next_char)
         self.full_text = ""
         self.current_char_index = 0
+        self._typing_started = 0.0
 
 
         self.header = QLabel(self)
@@ -53,7 +139,7 @@ class IOOverlay(QWidget):
         self.edit.textChanged.connect(self._on_text_changed)
 
 
-        self.body = QLabel(self)
+        self.body = TypewriterLabel(self)
         self.body.setVisible(False)
         self.body.setWordWrap(True)
         self.body.setStyleSheet("color: white;")
@@ -129,18 +215,29 @@ class IOOverlay(QWidget):
         if animate and text:
             self.full_text = text
             self.current_char_index = 0
-            self.body.setText("")
-            self.typing_timer.start(30)
+            self.body.setText(text)
+            self.body.set_revealed(0)
+            self._typing_started = time.monotonic()
+            self.typing_timer.start(int(TYPEWRITER_CHAR_SEC * 1000))
         else:
             self.body.setText(text)
 
     def _type_next_char(self):
-        if self.current_char_index < len(self.full_text):
-            self.current_char_index += 1
-            self.body.setText(self.full_text[:self.current_char_index])
-        else:
+        # Driven by elapsed time so a late tick catches up instead of slowing the reveal
+        elapsed = time.monotonic() - self._typing_started
+        self.current_char_index = min(len(self.full_text), int(elapsed / TYPEWRITER_CHAR_SEC) + 1)
+        self.body.set_revealed(self.current_char_index)
+        if self.current_char_index >= len(self.full_text):
             self.typing_timer.stop()
 
+    def invalidate_style(self):
+        # Config-derived offsets, colors and background are cached; call after settings change
+        self._cached_offsets = None
+        self._paint_state = None
+        self.layout_children()
+        self.update_fonts()
+        self.update()
+
     def _get_offsets(self, cfg) -> dict:
         if self._cached_offsets is not None:
             return self._cached_offsets
@@ -366,50 +463,60 @@ class IOOverlay(QWidget):
         logger.info(f"[IOOverlay] Loaded dialog background image: {path_str} ({pixmap.width()}x{pixmap.height()})")
         return True
 
-    def paintEvent(self, event: QPaintEvent):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+    def _scaled_dialog_background(self) -> QPixmap:
+        # Rescaled only when the overlay is resized (apply_scale, layout) or moves to a screen with another DPR
+        dpr = self.devicePixelRatioF()
+        key = (self.width(), self.height(), dpr, self._dialog_bg_pixmap.cacheKey())
+        if key != self._dialog_bg_scaled_key:
+            scaled = self._dialog_bg_pixmap.scaled(
+                round(self.width() * dpr),
+                round(self.height() * dpr),
+                Qt.AspectRatioMode.IgnoreAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
+            )
+            scaled.setDevicePixelRatio(dpr)
+            self._dialog_bg_scaled = scaled
+            self._dialog_bg_scaled_key = key
+        return self._dialog_bg_scaled
+
+    def _get_paint_state(self) -> dict:
+        if self._paint_state is not None:
+            return self._paint_state
 
-        use_image_bg = False
+        state = {"use_image_bg": False, "image_opacity": 1.0, "bg_color": QColor(0, 0, 0, 90)}
         try:
             if hasattr(self.parent(), 'config'):
                 cfg = self.parent().config
-                use_image_bg = self._load_dialog_background(cfg)
+                state["use_image_bg"] = self._load_dialog_background(cfg) and self._dialog_bg_pixmap is not None
         except Exception as e:
             logger.error(f"[IOOverlay] Error loading dialog background: {e}")
 
-        if use_image_bg and self._dialog_bg_pixmap is not None:
-            image_opacity = 100
-            try:
-                if hasattr(self.parent(), 'config'):
-                    cfg = self.parent().config
-                    opacity_str = cfg.get("General", "dialog_image_opacity", "100")
-                    image_opacity = int(opacity_str)
-                    image_opacity = max(0, min(100, image_opacity))
-            except: pass
+        try:
+            if hasattr(self.parent(), 'config'):
+                cfg = self.parent().config
+                if state["use_image_bg"]:
+                    image_opacity = int(cfg.get("General", "dialog_image_opacity", "100"))
+                    state["image_opacity"] = max(0, min(100, image_opacity)) / 100.0
+                else:
+                    state["bg_color"] = self._parse_color(cfg.dialog_color, cfg.dialog_opacity)
+        except: pass
 
-            painter.setOpacity(image_opacity / 100.0)
+        self._paint_state = state
+        return state
 
-            scaled_pixmap = self._dialog_bg_pixmap.scaled(
-                self.size(),
-                Qt.AspectRatioMode.IgnoreAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            painter.drawPixmap(self.rect(), scaled_pixmap)
+    def paintEvent(self, event: QPaintEvent):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        state = self._get_paint_state()
 
+        if state["use_image_bg"]:
+            painter.setOpacity(state["image_opacity"])
+            painter.drawPixmap(0, 0, self._scaled_dialog_background())
             painter.setOpacity(1.0)
         else:
             rad = max(8, self.height() // 10)
             painter.setPen(Qt.PenStyle.NoPen)
-
-            bg_color = QColor(0, 0, 0, 90)
-            try:
-                if hasattr(self.parent(), 'config'):
-                    cfg = self.parent().config
-                    bg_color = self._parse_color(cfg.dialog_color, cfg.dialog_opacity)
-            except: pass
-
-            painter.setBrush(bg_color)
+            painter.setBrush(state["bg_color"])
             painter.drawRoundedRect(self.rect(), rad, rad)
 
     def resizeEvent(self, event: QResizeEvent):
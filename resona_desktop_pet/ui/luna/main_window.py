@@ -26,6 +26,7 @@ class MainWindow(QWidget):
     pack_changed = Signal(str)
     settings_requested = Signal()
     file_dropped = Signal(dict)
+    visibility_changed = Signal(bool)
     refresh_audio_requested = Signal()  
     def __init__(self, config: ConfigManager, parent: QWidget = None):
         super().__init__(parent)
@@ -368,10 +369,17 @@ class MainWindow(QWidget):
         if self.config.always_on_top:
             if sys.platform == "win32":
                 try:
+                    flags_restored = False
                     if not (self.windowFlags() & Qt.WindowType.WindowStaysOnTopHint):
                         self.setWindowFlag(Qt.WindowType.WindowStaysOnTopHint, True)
                         self.show()
                         self.raise_()
+                        flags_restored = True
+                    physics_bridge = getattr(self, "physics_bridge", None)
+                    if physics_bridge:
+                        # Shares the physics frame's rate limit so a moving pet is not re-raised twice
+                        physics_bridge.committer.reinforce_topmost(force=flags_restored)
+                        return
                     hwnd = self.winId()
                     if not isinstance(hwnd, int):
                         hwnd = int(hwnd)
@@ -457,6 +465,7 @@ class MainWindow(QWidget):
             self.character.set_emotion("<E:smile>", deterministic=True)
             
             self.io.set_names(self.config.username, self.config.character_name)
+            self.io.invalidate_style()
             
             self.load_thinking_texts()
             self.load_listening_texts()
@@ -625,6 +634,8 @@ class MainWindow(QWidget):
                     if want_drag:
                         self.dragging = True
                         self.dragging_started = False
+                        if self.physics_bridge:
+                            self.physics_bridge.wake()
                         self.drag_offset = me.globalPosition().toPoint() - self.frameGeometry().topLeft()
                         self.physics_pause_after_drag = self._should_pause_physics_for_drag(me.modifiers())
                         self.character.setCursor(Qt.CursorShape.ClosedHandCursor)
@@ -928,6 +939,11 @@ class MainWindow(QWidget):
             self._initial_position_set = True
         self.sync_window_to_sprite()
         self._reinforce_topmost()
+        self.visibility_changed.emit(True)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.visibility_changed.emit(False)
 
     def closeEvent(self, event):
         controller = getattr(self, "controller", None)
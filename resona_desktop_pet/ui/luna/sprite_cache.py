@@ -0,0 +1,72 @@
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+from PySide6.QtGui import QPixmap
+
+
+class SpriteCache:
+    """LRU of decoded sprite pixmaps, bounded by an approximate memory budget.
+
+    Keys are (pack_id, outfit, sprite_name, scale, device_pixel_ratio). Only touched from the GUI thread;
+    background preloading decodes QImages elsewhere and hands them over through a signal.
+    """
+
+    def __init__(self, budget_mb: float = 256.0):
+        self.budget = int(max(0.0, budget_mb) * 1024 * 1024)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def cost(pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * 4
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def get(self, key) -> Optional[QPixmap]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, pixmap: QPixmap, evict: bool = True) -> bool:
+        # evict=False is for speculative preloads: they only fill free space and never push out
+        # sprites that were actually shown
+        cost = self.cost(pixmap)
+        if cost > self.budget:
+            return False
+        old = self._entries.get(key)
+        old_cost = old[1] if old is not None else 0
+        if not evict and self.used - old_cost + cost > self.budget:
+            # A refused preload leaves whatever was cached under this key in place
+            return False
+        if old is not None:
+            del self._entries[key]
+            self.used -= old_cost
+        while self._entries and self.used + cost > self.budget:
+            _, (_, old_cost) = self._entries.popitem(last=False)
+            self.used -= old_cost
+        self._entries[key] = (pixmap, cost)
+        self.used += cost
+        return True
+
+    def discard(self, predicate: Callable[[tuple], bool]):
+        for key in [k for k in self._entries if predicate(k)]:
+            self.used -= self._entries.pop(key)[1]
+
+    def clear(self):
+        self._entries.clear()
+        self.used = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "used_mb": self.used / (1024 * 1024),
+            "budget_mb": self.budget / (1024 * 1024),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -4,35 +4,83 @@ import logging
 
 logger = logging.getLogger("Audio")
 
-def convert_to_wav(input_path: str, output_path: str, target_sr: int = 16000) -> bool:
+def resample_audio(samples, source_sr: int, target_sr: int = 16000):
+    import numpy as np
+    samples = np.asarray(samples, dtype=np.float32)
+    if source_sr == target_sr or len(samples) == 0:
+        return samples
+    if source_sr % target_sr == 0:
+        # Box-filter decimation for the common 48k/32k -> 16k case
+        factor = source_sr // target_sr
+        usable = len(samples) - len(samples) % factor
+        return samples[:usable].reshape(-1, factor).mean(axis=1)
+    duration = len(samples) / source_sr
+    target_len = int(duration * target_sr)
+    positions = np.linspace(0, len(samples) - 1, num=target_len)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+def _decode_with_soundfile(data: bytes, target_sr: int):
+    import io
+    import soundfile as sf
+    samples, sr = sf.read(io.BytesIO(data), dtype="float32", always_2d=True)
+    return resample_audio(samples.mean(axis=1), sr, target_sr)
+
+def _decode_with_av(data: bytes, target_sr: int):
+    import io
+    import numpy as np
+    import av
+    chunks = []
+    with av.open(io.BytesIO(data)) as container:
+        resampler = av.AudioResampler(format="flt", layout="mono", rate=target_sr)
+        for frame in container.decode(audio=0):
+            for out in resampler.resample(frame):
+                chunks.append(out.to_ndarray().reshape(-1))
+        for out in resampler.resample(None):
+            chunks.append(out.to_ndarray().reshape(-1))
+    return np.concatenate(chunks).astype(np.float32) if chunks else np.zeros(0, dtype=np.float32)
+
+def decode_audio_bytes(data: bytes, target_sr: int = 16000):
+    # In-memory decode to mono float32: libsndfile covers WAV/FLAC/OGG, PyAV (optional) covers WebM/MP4
+    for decoder in (_decode_with_soundfile, _decode_with_av):
+        try:
+            samples = decoder(data, target_sr)
+            if len(samples) > 0:
+                return samples
+        except ImportError:
+            continue
+        except Exception as e:
+            logger.debug(f"[AudioUtils] {decoder.__name__} could not decode upload: {e}")
+    return None
+
+def ffmpeg_decode_bytes(data: bytes, target_sr: int = 16000, temp_dir: str = None):
+    import numpy as np
+    import tempfile
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-loglevel", "error",
+        "-i", "pipe:0",
+        "-f", "f32le",
+        "-ac", "1",
+        "-ar", str(target_sr),
+        "pipe:1"
+    ]
     try:
-        cmd = [
-            "ffmpeg", 
-            "-y", 
-            "-i", str(input_path), 
-            "-ar", str(target_sr), 
-            "-ac", "1", 
-            "-f", "wav", 
-            str(output_path)
-        ]
-        
-        result = subprocess.run(
-            cmd, 
-            stdout=subprocess.PIPE, 
-            stderr=subprocess.PIPE,
-            check=False
-        )
-        
-        if result.returncode != 0:
-            logger.error(f"[AudioUtils] FFmpeg conversion failed: {result.stderr.decode('utf-8', errors='ignore')}")
-            return False
-            
-        if not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
-            logger.info(f"[AudioUtils] Output file missing or empty: {output_path}")
-            return False
-            
-        return True
-        
+        result = subprocess.run(cmd, input=data, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)
+        if result.returncode == 0 and result.stdout:
+            return np.frombuffer(result.stdout, dtype=np.float32).copy()
+        # Containers with their index at the end (e.g. MP4 from Safari) need a seekable input
+        with tempfile.NamedTemporaryFile(suffix=".bin", dir=temp_dir, delete=False) as f:
+            f.write(data)
+            temp_path = f.name
+        try:
+            cmd[cmd.index("pipe:0")] = temp_path
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)
+        finally:
+            os.remove(temp_path)
+        if result.returncode == 0 and result.stdout:
+            return np.frombuffer(result.stdout, dtype=np.float32).copy()
+        logger.error(f"[AudioUtils] FFmpeg decode failed: {result.stderr.decode('utf-8', errors='ignore')}")
     except Exception as e:
-        logger.error(f"[AudioUtils] Exception during audio conversion: {e}")
-        return False
+        logger.error(f"[AudioUtils] Exception during ffmpeg decode: {e}")
+    return None
@@ -0,0 +1,124 @@
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional
+
+logger = logging.getLogger("Timer")
+
+ACTIVE_STATUSES = ("pending", "ready")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS timer_tasks (
+    id TEXT PRIMARY KEY,
+    due_at REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    pack_id TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_timer_tasks_due ON timer_tasks(status, due_at);
+"""
+
+_UPSERT = (
+    "INSERT INTO timer_tasks (id, due_at, status, pack_id, data) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT(id) DO UPDATE SET due_at = excluded.due_at, status = excluded.status, "
+    "pack_id = excluded.pack_id, data = excluded.data"
+)
+
+
+# Shared between the main program and the timer MCP process. Every write is its own transaction,
+# and the default rollback journal keeps commits visible as writes to the database file itself,
+# so the scheduler can watch that one path and use PRAGMA data_version to ignore its own commits.
+class TimerStore:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA busy_timeout = 5000")
+        self._conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def _row_to_task(row) -> dict:
+        try:
+            task = json.loads(row[4])
+        except (TypeError, ValueError):
+            task = {}
+        task.update({"id": row[0], "due_at": row[1], "status": row[2], "pack_id": row[3]})
+        return task
+
+    @staticmethod
+    def _task_row(task: dict) -> tuple:
+        data = {k: v for k, v in task.items() if k not in ("id", "due_at", "status", "pack_id")}
+        return (task["id"], float(task.get("due_at", 0.0)), task.get("status", "pending"),
+                task.get("pack_id"), json.dumps(data, ensure_ascii=False))
+
+    def upsert(self, task: dict) -> bool:
+        try:
+            with self._lock:
+                self._conn.execute(_UPSERT, self._task_row(task))
+            return True
+        except Exception as e:
+            logger.warning(f"[Timer] Failed to store task {task.get('id')}: {e}")
+            return False
+
+    def import_json(self, path: Path, normalize: Callable[[dict], dict]) -> int:
+        # One-time migration of the JSON task/inbox files used before the SQLite store. The file is
+        # renamed afterwards so its tasks are not imported again on the next start.
+        path = Path(path)
+        if not path.exists():
+            return 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            tasks = [normalize(entry) for entry in entries if isinstance(entry, dict)] if isinstance(entries, list) else []
+            with self._lock:
+                self._conn.execute("BEGIN")
+                try:
+                    self._conn.executemany(_UPSERT, [self._task_row(task) for task in tasks])
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            path.replace(path.with_name(path.name + ".imported"))
+        except Exception as e:
+            logger.warning(f"[Timer] Failed to import legacy tasks from {path}: {e}")
+            return 0
+        return len(tasks)
+
+    def get(self, task_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, due_at, status, pack_id, data FROM timer_tasks WHERE id = ?", (task_id,)
+            ).fetchone()
+        return self._row_to_task(row) if row else None
+
+    def active(self) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, due_at, status, pack_id, data FROM timer_tasks "
+                "WHERE status IN (?, ?) ORDER BY due_at", ACTIVE_STATUSES
+            ).fetchall()
+        return [self._row_to_task(row) for row in rows]
+
+    def remove(self, task_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM timer_tasks WHERE id = ?", (task_id,))
+
+    def purge_inactive(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM timer_tasks WHERE status NOT IN (?, ?)", ACTIVE_STATUSES)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM timer_tasks")
+
+    def data_version(self) -> int:
+        # Only changes when another connection commits
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
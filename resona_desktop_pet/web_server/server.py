@@ -6,14 +6,13 @@ import uvicorn
 import asyncio
 import threading
 import json
-import shutil
 import time
 import websockets
 import logging
 from pathlib import Path
 from typing import Optional
 from .session_manager import SessionManager
-from resona_desktop_pet.utils.audio_utils import convert_to_wav
+from resona_desktop_pet.utils.audio_utils import decode_audio_bytes, ffmpeg_decode_bytes
 
 logger = logging.getLogger("Web")
 
@@ -61,45 +60,28 @@ def resolve_idle_image(controller, pack_id: str, outfit_id: str) -> Optional[str
     image_url = None
     
     try:
-        pack_data = pm._get_pack_data(pack_id)
-        outfits = pack_data.get("character", {}).get("outfits", [])
+        catalog = pm.get_outfit_catalog(pack_id)
+        target_outfit = catalog.get(outfit_id) or catalog.default()
         
-        target_outfit = next((o for o in outfits if o.get("id") == outfit_id), None)
-        if not target_outfit:
-             target_outfit = next((o for o in outfits if o.get("is_default")), None)
-        
-        if target_outfit:
-            outfit_path = target_outfit.get("path")
-            full_outfit_path = pm.packs_dir / pack_id / outfit_path
-            sum_path = full_outfit_path / "sum.json"
+        if target_outfit and target_outfit.available:
+            outfit_path = target_outfit.rel_path
+            sum_data = target_outfit.emotions
             
-            if sum_path.exists():
-                with open(sum_path, "r", encoding="utf-8") as f:
-                    sum_data = json.load(f)
-                    
-                    candidate_images = []
-                    
-                    for key in ["<E:smile>", "<E:normal>", "<E:default>"]:
-                        if key in sum_data and sum_data[key]:
-                            images = sum_data[key]
-                            if not isinstance(images, list): images = [images]
-                            
-                            valid_images = []
-                            for img_name in images:
-                                for ext in [".png", ".jpg", ".jpeg"]:
-                                    if (full_outfit_path / (img_name + ext)).exists():
-                                        valid_images.append((img_name, ext))
-                                        break
-                            
-                            if valid_images:
-                                candidate_images = valid_images
-                                break 
+            candidate_images = []
+            
+            for key in ["<E:smile>", "<E:normal>", "<E:default>"]:
+                if key in sum_data and sum_data[key]:
+                    valid_images = target_outfit.sprite_candidates(sum_data[key], (".png", ".jpg", ".jpeg"))
                     
-                    if candidate_images:
-                        def get_digit_sum(s):
-                            return sum(int(c) for c in s if c.isdigit())
-                        best_img = min(candidate_images, key=lambda x: (get_digit_sum(x[0]), len(x[0]), x[0]))
-                        image_url = f"/packs/{pack_id}/{outfit_path}/{best_img[0]}{best_img[1]}"
+                    if valid_images:
+                        candidate_images = valid_images
+                        break 
+            
+            if candidate_images:
+                def get_digit_sum(s):
+                    return sum(int(c) for c in s if c.isdigit())
+                best_img = min(candidate_images, key=lambda x: (get_digit_sum(x[0]), len(x[0]), x[0]))
+                image_url = f"/packs/{pack_id}/{outfit_path}/{best_img[0]}{best_img[1]}"
     except Exception as e:
         logger.error(f"Error resolving idle image: {e}")
         
@@ -236,16 +218,15 @@ async def websocket_endpoint(websocket: WebSocket):
                     try:
                         pm = controller_ref.config.pack_manager
                         target_pack = session.pack_id
-                        pack_data = pm._get_pack_data(target_pack)
-                        outfits = pack_data.get("character", {}).get("outfits", [])
+                        catalog = pm.get_outfit_catalog(target_pack)
                         
                         outfit_list = []
-                        for o in outfits:
+                        for o in catalog.outfits.values():
                             outfit_list.append({
-                                "id": o.get("id"),
-                                "name": o.get("name", o.get("id")),
-                                "is_default": o.get("is_default", False),
-                                "path": o.get("path")
+                                "id": o.id,
+                                "name": o.name,
+                                "is_default": o.is_default,
+                                "path": o.rel_path
                             })
                         
                         await websocket.send_json({
@@ -310,45 +291,32 @@ async def upload_audio(
     upload_dir = Path(controller_ref.config.html_upload_dir)
     if not upload_dir.is_absolute():
         upload_dir = Path(controller_ref.project_root) / upload_dir
-        
-    upload_dir.mkdir(parents=True, exist_ok=True)
-    logger.debug(f"[Web] upload_audio upload_dir={upload_dir}")
-    
-    filename = f"web_audio_{session_id}_{int(asyncio.get_event_loop().time())}.wav"
-    file_path = upload_dir / filename
-    
+
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        try:
-            size = file_path.stat().st_size
-        except Exception:
-            size = None
-        logger.debug(f"[Web] upload_audio saved file_path={file_path} size={size}")
-
-        converted_path = file_path.with_name(f"{file_path.stem}_converted.wav")
-        ok = convert_to_wav(file_path, converted_path)
-        logger.debug(f"[Web] upload_audio convert_to_wav ok={ok} src={file_path} dst={converted_path}")
-        if ok:
-            file_path.unlink()
-            file_path = converted_path
-        else:
-            try:
-                file_path.unlink()
-            except Exception:
-                pass
-            return JSONResponse({"error": "Audio conversion failed. Ensure ffmpeg is available in PATH."}, status_code=500)
+        data = await file.read()
+        logger.debug(f"[Web] upload_audio read size={len(data)}")
+        samples = await asyncio.to_thread(_decode_upload, data, upload_dir)
+        if samples is None:
+            return JSONResponse({"error": "Audio decode failed. Ensure ffmpeg is available in PATH."}, status_code=500)
 
-        logger.debug(f"[Web] upload_audio dispatch handle_web_audio path={file_path}")
+        logger.debug(f"[Web] upload_audio dispatch handle_web_audio duration={len(samples) / 16000:.2f}s")
         asyncio.run_coroutine_threadsafe(
-            controller_ref.handle_web_audio(str(file_path), session),
+            controller_ref.handle_web_audio(samples, session),
             main_loop
         )
-        return {"status": "processing", "path": str(file_path)}
+        return {"status": "processing"}
     except Exception as e:
         logger.error(f"[Web] upload_audio exception: {e}")
         return JSONResponse({"error": str(e)}, status_code=500)
 
+def _decode_upload(data: bytes, upload_dir: Path):
+    samples = decode_audio_bytes(data)
+    if samples is not None:
+        return samples
+    logger.debug("[Web] upload_audio in-memory decode unavailable, falling back to ffmpeg")
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    return ffmpeg_decode_bytes(data, temp_dir=str(upload_dir))
+
 @app.get("/")
 async def get_index():
     if controller_ref:
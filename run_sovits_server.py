@@ -49,6 +49,9 @@ def load_config(project_root: Path) -> dict:
         "fragment_interval": get_value("SoVITS", "fragment_interval", 0.25, float),
         "timeout": get_value("SoVITS", "api_timeout", 120, int),
         "default_pack": get_value("SoVITS", "default_pack", None),
+        "pack_concurrency": get_value("SoVITS", "server_pack_concurrency", 1, int),
+        "memory_budget_mb": get_value("SoVITS", "server_model_memory_mb", 0.0, float),
+        "worker_overhead_mb": get_value("SoVITS", "server_worker_overhead_mb", 2048.0, float),
     }
 
 
@@ -100,6 +103,18 @@ Config file (config.cfg) is automatically loaded:
         default=None,
         help="SoVITS API port (default: from config or 9880)"
     )
+    parser.add_argument(
+        "--pack-concurrency",
+        type=int,
+        default=None,
+        help="Concurrent synthesis jobs for the loaded pack (default: from config or 1)"
+    )
+    parser.add_argument(
+        "--memory-budget-mb",
+        type=float,
+        default=None,
+        help="Memory budget for resident SoVITS weight sets, 0 keeps a single worker (default: from config or 0)"
+    )
     parser.add_argument(
         "--default-pack",
         type=str,
@@ -117,6 +132,8 @@ Config file (config.cfg) is automatically loaded:
     sovits_api_port = args.sovits_api_port if args.sovits_api_port is not None else config["api_port"]
     broadcast_enabled = not args.no_broadcast
     default_pack = args.default_pack if args.default_pack is not None else config["default_pack"]
+    pack_concurrency = args.pack_concurrency if args.pack_concurrency is not None else config["pack_concurrency"]
+    memory_budget_mb = args.memory_budget_mb if args.memory_budget_mb is not None else config["memory_budget_mb"]
 
     log_dir = root / "logs"
     log_dir.mkdir(exist_ok=True)
@@ -133,6 +150,8 @@ Config file (config.cfg) is automatically loaded:
     logger.info(f"Device: {device}")
     logger.info(f"Broadcast: {'Enabled' if broadcast_enabled else 'Disabled'}")
     logger.info(f"Default Pack: {default_pack or 'auto-select'}")
+    logger.info(f"Pack Concurrency: {pack_concurrency}")
+    logger.info(f"Model Memory Budget: {memory_budget_mb:.0f} MB" if memory_budget_mb > 0 else "Model Memory Budget: single worker")
     logger.info(f"Log File: {log_file}")
     logger.info("=" * 60)
     logger.info("\nPress Ctrl+C to stop the server.\n")
@@ -145,7 +164,10 @@ Config file (config.cfg) is automatically loaded:
             broadcast_enabled=broadcast_enabled,
             sovits_api_port=sovits_api_port,
             log_file=log_file,
-            default_pack=default_pack
+            default_pack=default_pack,
+            pack_concurrency=pack_concurrency,
+            memory_budget_mb=memory_budget_mb,
+            worker_overhead_mb=config["worker_overhead_mb"]
         )
     except KeyboardInterrupt:
         logger.info("\n[Server] Shutting down...")
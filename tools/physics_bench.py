@@ -0,0 +1,255 @@
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import configparser
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from PySide6.QtCore import QRect
+from resona_desktop_pet.physics.engine import PhysicsEngine
+from resona_desktop_pet.physics.env_scanner import EnvironmentScanner
+from resona_desktop_pet.physics.window_cache import SyntheticWindowProvider
+
+logger = logging.getLogger("Tools")
+
+DEFAULT_SCREEN = (0, 0, 1920, 1040)
+PET_SIZE = (320, 480)
+MAX_SIM_SEC = 30.0
+
+
+def load_physics_config(path: Path) -> dict:
+    config = configparser.ConfigParser(interpolation=None)
+    config.read(path, encoding="utf-8")
+    get = lambda key, fallback: config.getfloat("Physics", key, fallback=fallback)
+    flag = lambda key, fallback: config.getboolean("Physics", key, fallback=fallback)
+    return {
+        "engine": {
+            "gravity": get("gravity", 30.0),
+            "accel_x": get("accel_x", 0.0),
+            "accel_y": get("accel_y", 0.0),
+            "friction": get("friction", 0.98),
+            "elasticity": get("elasticity", 0.6),
+            "max_speed": get("max_speed", 2000.0),
+            "gravity_enabled": flag("gravity_enabled", True),
+            "accel_enabled": flag("accel_enabled", False),
+            "invert_forces": flag("invert_forces", False),
+            "friction_enabled": flag("friction_enabled", True),
+            "bounce_enabled": flag("bounce_enabled", True),
+        },
+        "fixed_hz": max(10.0, get("fixed_timestep_hz", 120.0)),
+        "sleep_speed": max(0.0, get("sleep_speed_threshold", 30)),
+        "sleep_frames": max(1, int(get("sleep_still_frames", 10))),
+    }
+
+
+def synthetic_layout(count: int, screen: QRect, rng: random.Random) -> dict:
+    windows = {}
+    for hwnd in range(1, count + 1):
+        w = rng.randint(200, max(201, screen.width() // 2))
+        h = rng.randint(150, max(151, screen.height() // 2))
+        x = rng.randint(screen.left(), screen.right() - w)
+        y = rng.randint(screen.top(), screen.bottom() - h)
+        windows[hwnd] = QRect(x, y, w, h)
+    return windows
+
+
+def load_layout(path: Path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    screen = QRect(*data.get("screen", DEFAULT_SCREEN))
+    windows = {int(hwnd): QRect(*rect) for hwnd, rect in data.get("windows", {}).items()}
+    return screen, windows
+
+
+def record_layout(path: Path):
+    # Needs a running desktop session; QGuiApplication gives EnvironmentScanner its screen geometry
+    from PySide6.QtGui import QGuiApplication
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv)
+    screen = EnvironmentScanner.get_screen_geometry()
+    windows = EnvironmentScanner.enumerate_windows()
+    data = {
+        "screen": [screen.x(), screen.y(), screen.width(), screen.height()],
+        "windows": {str(hwnd): [r.x(), r.y(), r.width(), r.height()] for hwnd, r in windows.items()},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    logger.info(f"Recorded {len(windows)} windows to {path}")
+
+
+class LinearReference(PhysicsEngine):
+    """The pre-index collision scan, kept to check the broad phase does not change results."""
+
+    def resolve_rect_collisions(self, rects, pet_width, pet_height):
+        self.collision_checks = 0
+        for rect in rects:
+            self.collision_checks += 1
+            self._collide_box((rect.left(), rect.top(), rect.right() + 1, rect.bottom() + 1),
+                              pet_width, pet_height)
+
+
+class Simulator:
+    """Drives PhysicsEngine the way PhysicsBridge does, minus the window: fixed steps,
+    bounds, window collisions and the rest detection that puts the bridge to sleep."""
+
+    def __init__(self, settings: dict, screen: QRect, provider: SyntheticWindowProvider,
+                 pet_size=PET_SIZE, engine_cls=PhysicsEngine):
+        self.settings = settings
+        self.screen = screen
+        self.provider = provider
+        self.pet_w, self.pet_h = pet_size
+        self.engine = engine_cls(**settings["engine"])
+        self.dt = 1.0 / settings["fixed_hz"]
+        self.steps = 0
+        self.checks = 0
+        self.max_checks = 0
+        self.trace = []
+
+    def drop(self, x, y, vx=0.0, vy=0.0):
+        self.engine.set_position(x, y)
+        self.engine.set_velocity(vx, vy)
+        self.engine.reset_counters()
+
+    def step(self):
+        engine = self.engine
+        engine.step(self.dt)
+        engine.resolve_bounds(self.screen, self.pet_w, self.pet_h)
+        rects = self.provider.snapshot()
+        engine.collision_checks = 0
+        if rects:
+            engine.resolve_rect_collisions(rects, self.pet_w, self.pet_h)
+        self.steps += 1
+        self.checks += engine.collision_checks
+        self.max_checks = max(self.max_checks, engine.collision_checks)
+
+    def run_until_rest(self, max_sec=MAX_SIM_SEC, churn=None, record=False):
+        speed = self.settings["sleep_speed"]
+        still = 0
+        last = (int(self.engine.x), int(self.engine.y))
+        for i in range(int(max_sec / self.dt)):
+            if churn:
+                churn(self.steps)
+            self.step()
+            pos = (int(self.engine.x), int(self.engine.y))
+            if record:
+                self.trace.append((self.engine.x, self.engine.y, self.engine.vx, self.engine.vy))
+            if pos == last and abs(self.engine.vx) < speed and abs(self.engine.vy) < speed:
+                still += 1
+                if still >= self.settings["sleep_frames"]:
+                    return (i + 1) * self.dt
+            else:
+                still = 0
+            last = pos
+        return None
+
+
+def make_churn(provider: SyntheticWindowProvider, windows: dict, every: int, rng: random.Random):
+    hwnds = list(windows)
+
+    def churn(step):
+        if every > 0 and step and step % every == 0 and hwnds:
+            hwnd = rng.choice(hwnds)
+            rect = QRect(windows[hwnd])
+            rect.translate(rng.randint(-40, 40), rng.randint(-40, 40))
+            windows[hwnd] = rect
+            provider.set_window(hwnd, rect)
+    return churn
+
+
+def run_benchmark(args) -> dict:
+    settings = load_physics_config(Path(args.config))
+    rng = random.Random(args.seed)
+    if args.layout:
+        screen, windows = load_layout(Path(args.layout))
+    else:
+        screen = QRect(*DEFAULT_SCREEN)
+        windows = synthetic_layout(args.windows, screen, rng)
+
+    drops = [
+        (rng.uniform(screen.left(), screen.right() - PET_SIZE[0]), rng.uniform(screen.top(), screen.center().y()),
+         rng.uniform(-1500, 1500), rng.uniform(-1500, 500))
+        for _ in range(args.drops)
+    ]
+
+    results = {"windows": len(windows), "drops": len(drops), "fixed_hz": settings["fixed_hz"]}
+    rest_times = []
+    unsettled = 0
+    steps = checks = max_checks = 0
+    wall = 0.0
+    mismatches = 0
+    for x, y, vx, vy in drops:
+        layout = dict(windows)
+        provider = SyntheticWindowProvider(layout)
+        sim = Simulator(settings, screen, provider)
+        churn = make_churn(provider, layout, args.churn, random.Random(args.seed)) if args.churn else None
+        sim.drop(x, y, vx, vy)
+        start = time.perf_counter()
+        rest = sim.run_until_rest(churn=churn, record=args.check)
+        wall += time.perf_counter() - start
+        steps += sim.steps
+        checks += sim.checks
+        max_checks = max(max_checks, sim.max_checks)
+        if rest is None:
+            unsettled += 1
+        else:
+            rest_times.append(rest)
+
+        if args.check:
+            ref_layout = dict(windows)
+            ref_provider = SyntheticWindowProvider(ref_layout)
+            ref = Simulator(settings, screen, ref_provider, engine_cls=LinearReference)
+            ref_churn = make_churn(ref_provider, ref_layout, args.churn, random.Random(args.seed)) if args.churn else None
+            ref.drop(x, y, vx, vy)
+            ref.run_until_rest(churn=ref_churn, record=True)
+            if ref.trace != sim.trace:
+                mismatches += 1
+
+    results.update({
+        "steps": steps,
+        "steps_per_sec": round(steps / wall, 1) if wall > 0 else 0.0,
+        "checks_per_step": round(checks / steps, 2) if steps else 0.0,
+        "max_checks_per_step": max_checks,
+        "time_to_rest_avg": round(sum(rest_times) / len(rest_times), 3) if rest_times else None,
+        "time_to_rest_max": round(max(rest_times), 3) if rest_times else None,
+        "unsettled": unsettled,
+    })
+    if args.check:
+        results["mismatches"] = mismatches
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless physics simulation and benchmark")
+    parser.add_argument("--config", default=str(PROJECT_ROOT / "config.cfg"), help="config.cfg to read [Physics] from")
+    parser.add_argument("--layout", help="JSON window layout recorded with --record")
+    parser.add_argument("--record", help="Capture the current desktop's windows to this JSON file (Windows only)")
+    parser.add_argument("--windows", type=int, default=50, help="Synthetic window count when no layout is given")
+    parser.add_argument("--drops", type=int, default=20, help="Number of drops from random positions and velocities")
+    parser.add_argument("--churn", type=int, default=0, help="Move a random window every N steps (0 = static layout)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--check", action="store_true", help="Compare every trajectory with a linear collision scan")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.record:
+        record_layout(Path(args.record))
+        return
+
+    results = run_benchmark(args)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for key, value in results.items():
+            logger.info(f"{key:>20}: {value}")
+    if results.get("mismatches"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()